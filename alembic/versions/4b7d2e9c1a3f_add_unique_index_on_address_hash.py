@@ -0,0 +1,70 @@
+"""add unique index on address hash.
+
+Addresses with the same hash are duplicates. Before the index is created, parties are moved to the oldest
+address of each hash and the other duplicates are deleted. Both tables are locked against writes meanwhile,
+so no new duplicate can be inserted between the merge and the index creation, and no party can be pointed at
+a duplicate between the parties being moved and the duplicates being deleted.
+
+Revision ID: 4b7d2e9c1a3f
+Revises: dae1dfa3fda3
+Create Date: 2026-10-18 10:04:12.518305
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4b7d2e9c1a3f"
+down_revision: Union[str, Sequence[str], None] = "dae1dfa3fda3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        "LOCK TABLE party_service.address, party_service.party IN SHARE ROW EXCLUSIVE MODE"
+    )
+    op.execute(
+        """
+        CREATE TEMPORARY TABLE address_duplicate ON COMMIT DROP AS
+        SELECT id, keep_id
+        FROM (
+            SELECT id, min(id) OVER (PARTITION BY hash) AS keep_id
+            FROM party_service.address
+        ) ranked
+        WHERE id <> keep_id
+        """
+    )
+    op.execute(
+        """
+        UPDATE party_service.party AS p
+        SET address_id = d.keep_id
+        FROM address_duplicate AS d
+        WHERE p.address_id = d.id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM party_service.address AS a
+        USING address_duplicate AS d
+        WHERE a.id = d.id
+        """
+    )
+    op.create_index(
+        "ix_party_service_address_hash",
+        "address",
+        ["hash"],
+        unique=True,
+        schema="party_service",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema. Merged duplicate addresses are not restored."""
+    op.drop_index(
+        "ix_party_service_address_hash", table_name="address", schema="party_service"
+    )
@@ -0,0 +1,64 @@
+"""add party search trigram indexes.
+
+Trigram GIN indexes on the party's first name, last name and email, which serve the substring (ILIKE)
+searches of the party search endpoint. They need the pg_trgm extension, which is created if it doesn't exist yet.
+Creating an extension may need more privileges than the app's database user has.
+
+The indexes are created concurrently, so the party table stays writable while they are built.
+If a build fails, the invalid index is dropped when the migration is run again.
+
+Revision ID: 5f2b8d0c7e14
+Revises: e3a9c4f61b52
+Create Date: 2026-10-18 15:11:06.903284
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5f2b8d0c7e14"
+down_revision: Union[str, Sequence[str], None] = "e3a9c4f61b52"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COLUMNS = ("first_name", "last_name", "email")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # CREATE INDEX CONCURRENTLY can't run in a transaction
+    with op.get_context().autocommit_block():
+        for column in _COLUMNS:
+            name = f"ix_party_service_party_{column}_trgm"
+            op.drop_index(
+                name,
+                table_name="party",
+                schema="party_service",
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
+            op.create_index(
+                name,
+                "party",
+                [column],
+                schema="party_service",
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema. The pg_trgm extension is kept, since other schemas may use it."""
+    with op.get_context().autocommit_block():
+        for column in reversed(_COLUMNS):
+            op.drop_index(
+                f"ix_party_service_party_{column}_trgm",
+                table_name="party",
+                schema="party_service",
+                postgresql_concurrently=True,
+            )
@@ -0,0 +1,44 @@
+"""create import checkpoint table.
+
+Revision ID: 7c1e5a3b9d20
+Revises: 4b7d2e9c1a3f
+Create Date: 2026-10-18 12:20:41.730112
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7c1e5a3b9d20"
+down_revision: Union[str, Sequence[str], None] = "4b7d2e9c1a3f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "import_checkpoint",
+        sa.Column("job", sa.Text(), nullable=False),
+        sa.Column("line", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.Column("created_by", sa.String(length=50), nullable=False),
+        sa.Column("updated_by", sa.String(length=50), nullable=False),
+        sa.PrimaryKeyConstraint("job"),
+        schema="party_service",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("import_checkpoint", schema="party_service")
@@ -0,0 +1,72 @@
+"""add party list indexes.
+
+Indexes for the filters of the party list endpoint. Each party index ends with the page's sort key (ID),
+and the updated_at index is the sort key of pages filtered by update time, so pages are read from one index range.
+Parties filtered by address are found through the address indexes, then by address_id.
+
+The indexes are created concurrently, so the tables stay writable while they are built.
+If a build fails, the invalid index is dropped when the migration is run again.
+
+Revision ID: e3a9c4f61b52
+Revises: 7c1e5a3b9d20
+Create Date: 2026-10-18 14:02:37.284519
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e3a9c4f61b52"
+down_revision: Union[str, Sequence[str], None] = "7c1e5a3b9d20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns)
+_INDEXES = (
+    ("ix_party_service_party_last_name_id", "party", ["last_name", "id"]),
+    ("ix_party_service_party_email_id", "party", ["email", "id"]),
+    ("ix_party_service_party_updated_at_id", "party", ["updated_at", "id"]),
+    ("ix_party_service_party_address_id_id", "party", ["address_id", "id"]),
+    ("ix_party_service_address_postal_code", "address", ["postal_code"]),
+    (
+        "ix_party_service_address_state_postal_code",
+        "address",
+        ["state", "postal_code"],
+    ),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY can't run in a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in _INDEXES:
+            op.drop_index(
+                name,
+                table_name=table,
+                schema="party_service",
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
+            op.create_index(
+                name,
+                table,
+                columns,
+                schema="party_service",
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(_INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                schema="party_service",
+                postgresql_concurrently=True,
+            )
@@ -1,5 +1,6 @@
 from src.config.config import create_app
 
+# Development server. In production, the app is served by gunicorn (see gunicorn.conf.py)
 if __name__ == "__main__":
     app = create_app()
     app.run()
@@ -0,0 +1,7 @@
+from src.config.async_config import create_async_app
+
+# Served by an ASGI server, ex. hypercorn asgi:app
+app = create_async_app()
+
+if __name__ == "__main__":
+    app.run()
@@ -0,0 +1,178 @@
+"""Compare the throughput per core of the sync (WSGI) and async (ASGI) stacks.
+
+Each stack is started as a single-process server: the sync app on Flask's threaded server, and the async app
+(asgi.py) on hypercorn, in its own process. The same workload is sent to each over HTTP by concurrent keep-alive
+clients: GETs of single parties and batch gets of 10 parties, picked at random among parties created beforehand.
+Most reads are served from the cache after the first pass, so the numbers mostly measure the stack itself.
+
+Throughput is reported per wall-clock second, and per CPU second used by the server process (req/s per core),
+which is what limits how many requests a machine serves once it runs a worker per core.
+The CPU time is taken from the server's resource usage when it exits, so it includes its startup.
+
+Needs the async extra (pip install ".[async]"). Run from the project root against scratch Postgres and
+Redis instances with the migrations applied, ex. the ones from docker/docker-compose.yaml:
+    DATABASE_URL=postgresql+psycopg2://... CACHE_URL=redis://localhost:6379 \\
+        python -m benchmarks.async_stack --clients 64 --seconds 20
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.concurrent_requests import make_party
+
+HOST = "127.0.0.1"
+
+# The command starting each stack's server on a port
+SERVERS = {
+    "sync": lambda port: [
+        sys.executable, "-m", "flask", "--app", "src.config.config:create_app", "run",
+        "--host", HOST, "--port", str(port), "--with-threads", "--no-reload", "--no-debugger",
+    ],
+    # no workers runs the app in hypercorn's own process, so its resource usage is the app's
+    "async": lambda port: [
+        sys.executable, "-m", "hypercorn", "asgi:app", "--bind", f"{HOST}:{port}", "--workers", "0",
+    ],
+}  # fmt: skip
+
+
+def wait_until_up(port: int, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            conn = http.client.HTTPConnection(HOST, port, timeout=1)
+            conn.request("GET", "/api/v1/parties/0")
+            conn.getresponse().read()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.2)
+
+
+def create_parties(port: int, count: int) -> list[int]:
+    """Create the parties the workload reads, through the server's API."""
+    conn = http.client.HTTPConnection(HOST, port)
+    client_id = uuid.uuid4().hex[:12]
+    ids = []
+    for i in range(count):
+        conn.request(
+            "POST",
+            "/api/v1/parties",
+            json.dumps(make_party(client_id, i)),
+            {"Content-Type": "application/json"},
+        )
+        response = conn.getresponse()
+        body = json.loads(response.read())
+        if response.status != 201:
+            raise RuntimeError(f"Could not create party: {body}")
+        ids.append(body["id"])
+    return ids
+
+
+def run_client(
+    port: int,
+    ids: list[int],
+    stop_at: float,
+    outcomes: Counter[str],
+    lock: threading.Lock,
+) -> None:
+    """Send requests on one keep-alive connection until stop_at, checking every response."""
+    conn = http.client.HTTPConnection(HOST, port)
+    results: Counter[str] = Counter()
+    while time.monotonic() < stop_at:
+        if random.random() < 0.8:
+            id = random.choice(ids)
+            conn.request("GET", f"/api/v1/parties/{id}")
+            response = conn.getresponse()
+            ok = response.status == 200 and json.loads(response.read())["id"] == id
+        else:
+            batch = random.sample(ids, 10)
+            conn.request(
+                "POST",
+                "/api/v1/parties:batchGet",
+                json.dumps({"ids": batch}),
+                {"Content-Type": "application/json"},
+            )
+            response = conn.getresponse()
+            ok = response.status == 200 and len(
+                json.loads(response.read())["parties"]
+            ) == len(batch)
+        results["requests"] += 1
+        results["ok" if ok else "errors"] += 1
+
+    with lock:
+        outcomes.update(results)
+
+
+def measure(
+    name: str, port: int, clients: int, seconds: float, parties: int
+) -> tuple[Counter[str], float, float]:
+    """Start the server, run the workload against it, and stop it.
+    :return: The outcomes, the wall-clock seconds of the run, and the CPU seconds used by the server.
+    """
+    env = {**os.environ, "PYTHONUNBUFFERED": "1"}
+    server = subprocess.Popen(
+        SERVERS[name](port),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_up(port)
+        ids = create_parties(port, parties)
+        outcomes: Counter[str] = Counter()
+        lock = threading.Lock()
+        started = time.monotonic()
+        with ThreadPoolExecutor(clients) as pool:
+            futures = [
+                pool.submit(run_client, port, ids, started + seconds, outcomes, lock)
+                for _ in range(clients)
+            ]
+            for future in futures:
+                future.result()
+        elapsed = time.monotonic() - started
+    finally:
+        server.send_signal(signal.SIGINT)
+    _, _, usage = os.wait4(server.pid, 0)
+    return outcomes, elapsed, usage.ru_utime + usage.ru_stime
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument(
+        "--parties", type=int, default=200, help="Parties created per stack."
+    )
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    print(f"{args.clients} clients, {args.seconds:.0f}s per stack\n")
+    print(
+        f"{'stack':>8}{'requests':>10}{'req/s':>10}{'cpu s':>8}"
+        f"{'req/s/core':>12}{'errors':>8}"
+    )
+    for name in SERVERS:
+        outcomes, elapsed, cpu = measure(
+            name, args.port, args.clients, args.seconds, args.parties
+        )
+        print(
+            f"{name:>8}{outcomes['requests']:>10}"
+            f"{outcomes['requests'] / elapsed:>10.0f}{cpu:>8.1f}"
+            f"{outcomes['requests'] / cpu:>12.0f}{outcomes['errors']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
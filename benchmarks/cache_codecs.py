@@ -0,0 +1,104 @@
+"""Compare the cache codecs on representative PartyResponse payloads.
+
+Reports the bytes stored per key, and the encode/decode time per value of every codec configuration.
+Decode time is measured with CacheCodec.decode_json, since that is what a cached GET does.
+
+Run from the project root:
+    python -m benchmarks.cache_codecs
+"""
+
+import random
+import statistics
+import timeit
+from datetime import datetime, timedelta
+
+from src.dto.response_dtos import AddressResponse, MetaResponse, PartyResponse
+from src.repository.cache_codecs import CacheCodec
+from src.util import helpers
+
+SAMPLE_SIZE = 1000
+ITERATIONS = 20
+
+CODECS = {
+    "json": CacheCodec("json", compress_threshold=0),
+    "json+zlib": CacheCodec("json", compress_threshold=1),
+    "msgpack": CacheCodec("msgpack", compress_threshold=0),
+    "msgpack+zlib": CacheCodec("msgpack", compress_threshold=1),
+}
+
+FIRST_NAMES = ["John", "Jane", "Maria", "Mohammed", "Wei", "Olivia", "Liam", "Ava"]
+LAST_NAMES = ["Doe", "Smith", "Garcia", "Khan", "Chen", "O'Brien", "Nguyen", "Brown"]
+STREETS = ["Main St", "Oak Avenue", "Maple Drive", "Elm Street", "Sunset Boulevard"]
+CITIES = [
+    ("Springfield", "IL", "62704"),
+    ("Richmond", "VA", "23220"),
+    ("Austin", "TX", "73301"),
+]
+
+
+def make_payload(rng: random.Random, id: int) -> bytes:
+    created_at = datetime(2025, 1, 1) + timedelta(seconds=rng.randint(0, 10**7))
+    meta = MetaResponse(
+        created_by="onboarding.service",
+        updated_by="support.user",
+        created_at=created_at,
+        updated_at=created_at + timedelta(days=rng.randint(0, 90)),
+    )
+    city, state, postal_code = rng.choice(CITIES)
+    first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    party = PartyResponse(
+        id=id,
+        first_name=first_name,
+        middle_name=rng.choice([None, "A.", "Marie"]),
+        last_name=last_name,
+        email=f"{first_name}.{last_name}{id}@example.com".lower(),
+        phone_number=str(rng.randint(2000000000, 9999999999)),
+        address=AddressResponse(
+            id=rng.randint(1, 10**6),
+            street_one=f"{rng.randint(1, 9999)} {rng.choice(STREETS)}",
+            street_two=rng.choice([None, f"Apt {rng.randint(1, 400)}"]),
+            city=city,
+            state=state,
+            postal_code=postal_code,
+            country="USA",
+            meta=meta,
+        ),
+        meta=meta,
+    )
+    return helpers.to_json_bytes(party.to_dict())
+
+
+def main() -> None:
+    rng = random.Random(42)
+    payloads = [make_payload(rng, id) for id in range(1, SAMPLE_SIZE + 1)]
+    print(
+        f"{SAMPLE_SIZE} payloads, mean JSON size {statistics.mean(map(len, payloads)):.0f} bytes\n"
+    )
+    print(f"{'codec':<14}{'bytes/key':>10}{'encode us':>12}{'decode us':>12}")
+
+    for name, codec in CODECS.items():
+        encoded = [codec.encode_json(payload) for payload in payloads]
+        encode_time = min(
+            timeit.repeat(
+                lambda: [codec.encode_json(p) for p in payloads],
+                number=1,
+                repeat=ITERATIONS,
+            )
+        )
+        decode_time = min(
+            timeit.repeat(
+                lambda: [CacheCodec.decode_json(e) for e in encoded],
+                number=1,
+                repeat=ITERATIONS,
+            )
+        )
+        print(
+            f"{name:<14}"
+            f"{statistics.mean(map(len, encoded)):>10.0f}"
+            f"{encode_time / SAMPLE_SIZE * 1e6:>12.2f}"
+            f"{decode_time / SAMPLE_SIZE * 1e6:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
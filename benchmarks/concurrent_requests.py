@@ -0,0 +1,136 @@
+"""Load test the app with concurrent requests, to check that requests don't share a database session.
+
+Every thread acts as a client that creates parties, then reads and updates the ones it created, through the app's
+full stack (create_app, views, service, cache and database). Each response is checked against what the thread sent,
+so a request that saw another request's entities, transaction or error is counted as a mismatch.
+
+Runs the same workload with an increasing number of threads and reports requests per second.
+Requests spend most of their time waiting on Postgres and Redis, so throughput should grow with the thread count
+until the connection pool (5 connections, plus 10 overflow by default) or the database is saturated.
+
+Run from the project root against scratch Postgres and Redis instances with the migrations applied,
+ex. the ones from docker/docker-compose.yaml:
+    DATABASE_URL=postgresql+psycopg2://... CACHE_URL=redis://localhost:6379 \\
+        python -m benchmarks.concurrent_requests --threads 1 2 4 8 16
+"""
+
+import argparse
+import logging
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from flask import Flask
+
+from src.config.config import create_app
+
+META_CREATE = {"createdBy": "benchmark", "createdAt": "2025-01-01T12:00:00"}
+META_UPDATE = {"updatedBy": "benchmark", "updatedAt": "2025-01-02T10:00:00"}
+
+
+def make_party(client_id: str, i: int) -> dict[str, Any]:
+    return {
+        "firstName": "John",
+        "lastName": "Doe",
+        "email": f"load.{client_id}.{i}@example.com",
+        "phoneNumber": "5551234567",
+        "address": {
+            "streetOne": f"{i % 10} Load Test St",
+            "city": "Springfield",
+            "state": "IL",
+            "postalCode": "62704",
+            "country": "USA",
+        },
+        "meta": META_CREATE,
+    }
+
+
+def run_client(
+    app: Flask, parties: int, outcomes: Counter[str], lock: threading.Lock
+) -> None:
+    """Create parties, then read and rename each of them, checking every response."""
+    client = app.test_client()
+    client_id = uuid.uuid4().hex[:12]
+    results: Counter[str] = Counter()
+
+    def check(ok: bool) -> None:
+        results["requests"] += 1
+        results["ok" if ok else "mismatches"] += 1
+
+    created: dict[int, str] = {}
+    for i in range(parties):
+        payload = make_party(client_id, i)
+        response = client.post("/api/v1/parties", json=payload)
+        check(
+            response.status_code == 201 and response.json["email"] == payload["email"]
+        )
+        if response.status_code == 201:
+            created[response.json["id"]] = payload["email"]
+
+    for id, email in created.items():
+        response = client.get(f"/api/v1/parties/{id}")
+        check(response.status_code == 200 and response.json["email"] == email)
+
+        name = f"Load{client_id}"
+        response = client.patch(
+            f"/api/v1/parties/{id}", json={"firstName": name[:100], "meta": META_UPDATE}
+        )
+        check(
+            response.status_code == 200
+            and response.json["id"] == id
+            and response.json["firstName"] == name
+        )
+
+    with lock:
+        outcomes.update(results)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument(
+        "--parties", type=int, default=50, help="Parties created per thread."
+    )
+    args = parser.parse_args()
+
+    app = create_app()
+    # report failed requests as 500s, like in production, instead of raising them in the client's thread
+    app.config["PROPAGATE_EXCEPTIONS"] = False
+    # the app logs every request at DEBUG, which would dominate the measurements
+    logging.getLogger().setLevel(logging.WARNING)
+    engine = app.session.session_factory.kw["bind"]
+
+    print(f"{args.parties} parties per thread, 3 requests per party\n")
+    print(
+        f"{'threads':>8}{'requests':>10}{'req/s':>10}{'speedup':>10}{'mismatches':>12}"
+    )
+    baseline = None
+    for threads in args.threads:
+        outcomes: Counter[str] = Counter()
+        lock = threading.Lock()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(threads) as pool:
+            futures = [
+                pool.submit(run_client, app, args.parties, outcomes, lock)
+                for _ in range(threads)
+            ]
+            for future in futures:
+                future.result()
+        elapsed = time.perf_counter() - started
+
+        rate = outcomes["requests"] / elapsed
+        baseline = baseline or rate
+        print(
+            f"{threads:>8}{outcomes['requests']:>10}{rate:>10.0f}"
+            f"{rate / baseline:>9.1f}x{outcomes['mismatches']:>12}"
+        )
+
+    # a pool that ran out of connections shows up as overflow here
+    print(f"\nPool after the run: {engine.pool.status()}")
+
+
+if __name__ == "__main__":
+    main()
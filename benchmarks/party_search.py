@@ -0,0 +1,167 @@
+"""Measure the latency of party searches on a generated dataset.
+
+Parties are generated with names and emails drawn from small pools, so common and rare words both occur,
+and inserted with one INSERT ... SELECT from generate_series. The dataset is generated once per --rows
+and reused by later runs, since it is tagged with the benchmark's user.
+
+Every search goes through PartyRepository.search with the app's statement timeout, so the numbers include
+the timeout being set. The cache is left out, only the database is measured. For each query, the plan
+is printed once, to check that the trigram indexes are used.
+Plans are taken with ten times the timeout, so a search that timed out still shows where its time went.
+
+Run from the project root against a scratch Postgres database with the migrations applied,
+ex. the one from docker/docker-compose.yaml:
+    DATABASE_URL=postgresql+psycopg2://... python -m benchmarks.party_search --rows 1000000
+"""
+
+import argparse
+import os
+import statistics
+import time
+from typing import Any
+
+from sqlalchemy import Connection, create_engine, event, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from src.repository.party_repository import PartyRepository
+
+SEARCHES = 200
+USER = "benchmark.search"
+
+FIRST_NAMES = [
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "William", "Elizabeth",
+    "David", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Charles", "Karen",
+]  # fmt: skip
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+]  # fmt: skip
+
+# (label, query): typeahead prefixes, a full name, an email, a rare substring and a word that matches nothing
+QUERIES = [
+    ("prefix", "joh"),
+    ("prefix", "mart"),
+    ("full name", "john smith"),
+    ("email", "james.smith.4000"),
+    ("rare", "zz123456"),
+    ("no match", "qqqq"),
+]
+
+
+def generate(session: Session, rows: int) -> None:
+    """Insert generated parties until the benchmark's dataset has the requested number of rows."""
+    existing = session.scalar(
+        text("SELECT count(*) FROM party_service.party WHERE created_by = :user"),
+        {"user": USER},
+    )
+    if existing >= rows:
+        return
+    print(f"Generating {rows - existing} parties...")
+    address_id = session.scalar(
+        text(
+            """
+            INSERT INTO party_service.address
+                (street_one, city, state, postal_code, country, hash, created_by, updated_by)
+            VALUES ('1 Benchmark St', 'Springfield', 'IL', '62704', 'USA', :user, :user, :user)
+            ON CONFLICT (hash) DO UPDATE SET updated_by = excluded.updated_by
+            RETURNING id
+            """
+        ),
+        {"user": USER},
+    )
+    session.execute(
+        text(
+            """
+            INSERT INTO party_service.party
+                (first_name, last_name, email, phone_number, address_id, created_by, updated_by)
+            SELECT
+                (:first_names)[1 + i % cardinality(:first_names)],
+                (:last_names)[1 + (i / cardinality(:first_names)) % cardinality(:last_names)],
+                lower((:first_names)[1 + i % cardinality(:first_names)]
+                    || '.' || (:last_names)[1 + (i / cardinality(:first_names)) % cardinality(:last_names)])
+                    || '.' || i || '@example.com',
+                '5551234567', :address_id, :user, :user
+            FROM generate_series(:start, :stop) AS i
+            """
+        ),
+        {
+            "first_names": FIRST_NAMES,
+            "last_names": LAST_NAMES,
+            "address_id": address_id,
+            "user": USER,
+            "start": existing,
+            "stop": rows - 1,
+        },
+    )
+    session.execute(text("ANALYZE party_service.party"))
+    session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=20)
+    # the default of SEARCH_STATEMENT_TIMEOUT_MS (see init_di)
+    parser.add_argument("--timeout-ms", type=int, default=500)
+    args = parser.parse_args()
+
+    engine = create_engine(os.environ["DATABASE_URL"])
+    with Session(engine) as session:
+        generate(session, args.rows)
+        total = session.scalar(text("SELECT count(*) FROM party_service.party"))
+    print(f"{total} parties, {SEARCHES} searches per query, limit {args.limit}\n")
+    print(f"{'query':<24}{'results':>8}{'mean ms':>10}{'p99 ms':>10}{'timeouts':>10}")
+
+    for label, query in QUERIES:
+        latencies = []
+        results = timeouts = 0
+        for _ in range(SEARCHES):
+            with Session(engine) as session:
+                started = time.perf_counter()
+                try:
+                    results = len(
+                        PartyRepository(session).search(
+                            query, args.limit, args.timeout_ms
+                        )
+                    )
+                except OperationalError:
+                    timeouts += 1
+                latencies.append((time.perf_counter() - started) * 1000)
+        print(
+            f"{f'{label}: {query}':<24}"
+            f"{results:>8}"
+            f"{statistics.mean(latencies):>10.2f}"
+            f"{statistics.quantiles(latencies, n=100)[98]:>10.2f}"
+            f"{timeouts:>10}"
+        )
+
+    print("\nPlans:")
+    searches: list[tuple[str, Any]] = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        searches.append((statement, parameters))
+
+    for label, query in QUERIES:
+        with Session(engine) as session:
+            PartyRepository(session).search(query, args.limit, args.timeout_ms * 10)
+            statement, parameters = searches[-1]
+            plan = session.connection().exec_driver_sql(
+                f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters
+            )
+            print(f"\n{label}: {query}")
+            print("\n".join(line for (line,) in plan))
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Measure the SQL statements and latency of creating and updating parties.
+
+Every POST and PATCH goes through PartyService with a real unit of work, so the numbers include the address
+upsert, the party and party history inserts, and any SELECTs issued to reload attributes after a flush or commit.
+The cache is left out, only the database is measured.
+
+Run from the project root against a scratch Postgres database with the migrations applied,
+ex. the one from docker/docker-compose.yaml:
+    DATABASE_URL=postgresql+psycopg2://... python -m benchmarks.party_writes
+
+To compare two versions of the create path, run it on both commits, ex. from a git worktree.
+Pass --expire-on-commit on commits before sessions stopped expiring entities on commit, to configure them like the app did.
+"""
+
+import argparse
+import os
+import statistics
+import time
+import uuid
+from collections import Counter
+from collections.abc import Callable
+from typing import Any, TypeVar, cast
+
+from sqlalchemy import Connection, create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from src.dto.request_dtos import PartyCreate, PartyUpdate
+from src.repository.address_repository import AddressRepository
+from src.repository.cache_repository import CacheRepository
+from src.repository.party_history_repository import PartyHistoryRepository
+from src.repository.party_repository import PartyRepository
+from src.repository.unit_of_work import UnitOfWork
+from src.service.party_service import PartyService
+
+REQUESTS = 500
+ADDRESSES = 50  # most POSTs reuse an existing address, like in production
+
+T = TypeVar("T")
+
+
+class NullCache:
+    """Accepts cache writes and drops them, in place of the CacheRepository."""
+
+    def add(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def add_tombstone(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+
+def make_create(i: int, run: str) -> PartyCreate:
+    meta = {"createdBy": "benchmark", "createdAt": "2025-01-01T12:00:00"}
+    return PartyCreate.model_validate(
+        {
+            "firstName": "John",
+            "lastName": "Doe",
+            "email": f"john.doe.{run}.{i}@example.com",
+            "phoneNumber": "5551234567",
+            "address": {
+                "streetOne": f"{i % ADDRESSES} Benchmark St {run}",
+                "city": "Springfield",
+                "state": "IL",
+                "postalCode": "62704",
+                "country": "USA",
+                "meta": meta,
+            },
+            "meta": meta,
+        }
+    )
+
+
+def make_update(i: int) -> PartyUpdate:
+    return PartyUpdate.model_validate(
+        {
+            "firstName": f"Jane{i}",
+            "meta": {"updatedBy": "benchmark", "updatedAt": "2025-01-02T10:00:00"},
+        }
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--expire-on-commit", action="store_true")
+    args = parser.parse_args()
+
+    engine = create_engine(os.environ["DATABASE_URL"])
+    # configured like the app's sessions (see init_db)
+    session_factory = sessionmaker(bind=engine, expire_on_commit=args.expire_on_commit)
+    statements: Counter[str] = Counter()
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count(
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        statements[statement.split()[0].upper()] += 1
+
+    def request(handle: Callable[[PartyService], T]) -> T:
+        """Handle one request with its own session, like the app does."""
+        with session_factory() as session:
+            uow = UnitOfWork(
+                session,
+                PartyRepository(session),
+                AddressRepository(session),
+                PartyHistoryRepository(session),
+            )
+            return handle(PartyService(uow, cast(CacheRepository, NullCache())))
+
+    run = uuid.uuid4().hex[:8]
+    print(f"{REQUESTS} requests per operation, {ADDRESSES} distinct addresses\n")
+    print(
+        f"{'operation':<10}{'stmts/req':>10}{'mean ms':>10}{'p99 ms':>10}  statements"
+    )
+
+    ids: list[int] = []
+    operations: dict[str, Callable[[int], object]] = {
+        "POST": lambda i: ids.append(
+            request(lambda service: service.add_party(make_create(i, run)))["id"]
+        ),
+        "PATCH": lambda i: request(
+            lambda service: service.update_party(ids[i], make_update(i))
+        ),
+    }
+    for name, operation in operations.items():
+        statements.clear()
+        latencies = []
+        for i in range(REQUESTS):
+            started = time.perf_counter()
+            operation(i)
+            latencies.append((time.perf_counter() - started) * 1000)
+        total = sum(statements.values())
+        breakdown = ", ".join(
+            f"{kind} {n / REQUESTS:.1f}" for kind, n in statements.most_common()
+        )
+        print(
+            f"{name:<10}"
+            f"{total / REQUESTS:>10.1f}"
+            f"{statistics.mean(latencies):>10.2f}"
+            f"{statistics.quantiles(latencies, n=100)[98]:>10.2f}"
+            f"  {breakdown}"
+        )
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Compare the throughput of the production server (gunicorn.conf.py) per worker model.
+
+Each model is started as a gunicorn server from the project root, so it runs with the production settings,
+with its worker class, workers and threads set through the environment variables gunicorn.conf.py reads:
+- sync: 2 workers per CPU plus one, each serving one request at a time.
+- gthread: a worker per CPU, with 4 threads each (the default).
+- gthread-single: a single worker, with as many threads as gthread has in total, to show what the extra processes
+  buy over threads alone, since threads of one process share the GIL.
+
+The same workload is sent to each over HTTP by concurrent keep-alive clients (see async_stack): GETs of single
+parties and batch gets of 10 parties, picked at random among parties created beforehand.
+
+Throughput is reported per wall-clock second, per worker process, and per CPU second used by the server
+(req/s per core). The CPU time is taken from the master's resource usage when it exits, which includes the workers
+it reaped, and their startup.
+
+Needs gunicorn (pip install ".[server]"). Run from the project root against scratch Postgres and Redis instances
+with the migrations applied, ex. the ones from docker/docker-compose.yaml:
+    DATABASE_URL=postgresql+psycopg2://... CACHE_URL=redis://localhost:6379 \\
+        python -m benchmarks.worker_models --clients 64 --seconds 20
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.async_stack import HOST, create_parties, run_client, wait_until_up
+
+CPUS = len(os.sched_getaffinity(0))
+
+# worker class, workers and threads per worker of each model
+MODELS = {
+    "sync": ("sync", 2 * CPUS + 1, 1),
+    "gthread": ("gthread", CPUS, 4),
+    "gthread-single": ("gthread", 1, 4 * CPUS),
+}
+
+
+def measure(
+    name: str, port: int, clients: int, seconds: float, parties: int
+) -> tuple[Counter[str], float, float]:
+    """Start the server, run the workload against it, and stop it gracefully.
+    :return: The outcomes, the wall-clock seconds of the run, and the CPU seconds used by the server.
+    """
+    worker_class, workers, threads = MODELS[name]
+    env = {
+        **os.environ,
+        "GUNICORN_BIND": f"{HOST}:{port}",
+        "GUNICORN_WORKER_CLASS": worker_class,
+        "WEB_CONCURRENCY": str(workers),
+        "GUNICORN_THREADS": str(threads),
+        "LOG_LEVEL": "WARNING",
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_up(port)
+        ids = create_parties(port, parties)
+        outcomes: Counter[str] = Counter()
+        lock = threading.Lock()
+        started = time.monotonic()
+        with ThreadPoolExecutor(clients) as pool:
+            futures = [
+                pool.submit(run_client, port, ids, started + seconds, outcomes, lock)
+                for _ in range(clients)
+            ]
+            for future in futures:
+                future.result()
+        elapsed = time.monotonic() - started
+    finally:
+        server.send_signal(signal.SIGTERM)
+    _, _, usage = os.wait4(server.pid, 0)
+    return outcomes, elapsed, usage.ru_utime + usage.ru_stime
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument(
+        "--parties", type=int, default=200, help="Parties created per model."
+    )
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--models", nargs="+", choices=MODELS, default=list(MODELS))
+    args = parser.parse_args()
+
+    print(f"{CPUS} CPUs, {args.clients} clients, {args.seconds:.0f}s per model\n")
+    print(
+        f"{'model':>16}{'workers':>9}{'threads':>9}{'requests':>10}{'req/s':>10}"
+        f"{'req/s/worker':>14}{'cpu s':>8}{'req/s/core':>12}{'errors':>8}"
+    )
+    for name in args.models:
+        _, workers, threads = MODELS[name]
+        outcomes, elapsed, cpu = measure(
+            name, args.port, args.clients, args.seconds, args.parties
+        )
+        throughput = outcomes["requests"] / elapsed
+        print(
+            f"{name:>16}{workers:>9}{threads:>9}{outcomes['requests']:>10}"
+            f"{throughput:>10.0f}{throughput / workers:>14.0f}{cpu:>8.1f}"
+            f"{outcomes['requests'] / cpu:>12.0f}{outcomes['errors']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Configuration of the production server, picked up by gunicorn when it is started from the project root:
+    gunicorn
+
+The app is created once in the master process (preload_app) and the workers are forked from it, so they share
+its memory pages and a worker that fails to start fails the deployment instead of crash-looping. The workers don't
+inherit the master's connection pools or background threads (see prepare_fork and init_forked_worker).
+
+Settings are derived from the CPUs this process may run on, and can be overridden with environment variables:
+- GUNICORN_WORKER_CLASS: "gthread" (default) or "sync".
+- WEB_CONCURRENCY: worker processes. A worker per CPU for gthread, which serves concurrent requests on threads,
+  and 2 per CPU plus one for sync, whose workers block on the database and Redis.
+- GUNICORN_THREADS: threads per gthread worker, 4 by default. Every thread can hold a database connection,
+  so the database pool is sized to the thread count unless DATABASE_POOL_SIZE is set.
+- GUNICORN_BIND, GUNICORN_TIMEOUT, GUNICORN_GRACEFUL_TIMEOUT, GUNICORN_KEEPALIVE.
+
+On SIGTERM, workers stop accepting connections and finish their in-flight requests for up to graceful_timeout
+seconds, then drain their pending cache writes and close their Redis connections before exiting
+(see register_teardown_logic).
+"""
+
+import os
+
+from gunicorn.arbiter import Arbiter
+from gunicorn.workers.base import Worker
+
+from src.util.helpers import get_env_int
+
+cpus = len(os.sched_getaffinity(0))
+
+wsgi_app = "wsgi:app"
+preload_app = True
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+workers = get_env_int(
+    "WEB_CONCURRENCY", cpus if worker_class == "gthread" else 2 * cpus + 1
+)
+threads = get_env_int("GUNICORN_THREADS", 4) if worker_class == "gthread" else 1
+timeout = get_env_int("GUNICORN_TIMEOUT", 30)
+graceful_timeout = get_env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+keepalive = get_env_int("GUNICORN_KEEPALIVE", 5)
+
+# read by create_app when the app is preloaded, after this file
+os.environ.setdefault("POOL_PROFILE", "production")
+os.environ.setdefault("DATABASE_POOL_SIZE", str(threads))
+
+
+def pre_fork(server: Arbiter, worker: Worker) -> None:
+    from src.config.config import prepare_fork
+
+    prepare_fork(server.app.wsgi())
+
+
+def post_fork(server: Arbiter, worker: Worker) -> None:
+    from src.config.config import init_forked_worker
+
+    init_forked_worker(server.app.wsgi())
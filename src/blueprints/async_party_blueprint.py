@@ -0,0 +1,95 @@
+import logging
+from typing import cast
+
+from flask.typing import RouteCallable
+from quart import Blueprint, Response, request
+from quart.views import MethodView
+from redis import RedisError
+
+from src.config.async_app import current_async_app
+from src.util.enums import ServiceEntities
+from src.dto.request_dtos import PartyBatchGet, PartyCreate
+from src.util import helpers
+from src.util.custom_types import PartyResponseTuple
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncPartyBaseView(MethodView):
+    def __init__(self) -> None:
+        self._party_service = current_async_app.container.party_service
+
+
+class AsyncPartyListView(AsyncPartyBaseView):
+    async def post(self) -> PartyResponseTuple:
+        """Handles REST requests to create a new party."""
+        party_request = PartyCreate.model_validate(await request.get_json())
+        logger.info("POST /parties endpoint received request to create Party.")
+        return await self._party_service.add_party(party_request), 201
+
+
+class AsyncPartyBatchGetView(AsyncPartyBaseView):
+    async def post(self) -> PartyResponseTuple:
+        """Handles REST requests to retrieve multiple existing parties by ID."""
+        batch_request = PartyBatchGet.model_validate(await request.get_json())
+        logger.info(
+            f"POST /parties:batchGet endpoint received request to retrieve {len(batch_request.ids)} Parties."
+        )
+        return await self._party_service.get_parties(batch_request.ids), 200
+
+
+class AsyncPartyDetailView(AsyncPartyBaseView):
+    async def get(self, id: int) -> Response:
+        """Handles REST request to retrieve an existing party by ID.
+        The cached JSON bytes are sent as the response body as is. On a miss, the party is serialized once,
+        and the same bytes are cached and sent. Responses carry a strong ETag of the body, and a request whose
+        If-None-Match matches it is answered with a 304, like the sync stack's cache_read.
+        """
+        logger.info(
+            f"GET /parties endpoint received request to retrieve Party with ID {id}."
+        )
+        body = await _read_from_cache(id)
+        if body is None:
+            body = await self._party_service.get_party_json(id)
+        response = Response(body, 200, mimetype="application/json")
+        response.set_etag(helpers.etag(body))
+        await response.make_conditional(request)
+        return response
+
+
+async def _read_from_cache(id: int) -> bytes | None:
+    """
+    Get a party from the cache as JSON bytes. If the cache is unavailable, treat it as a miss.
+    :raises EntityNotFound: If the party is cached as not existing.
+    """
+    try:
+        return await current_async_app.container.cache_repository.get_raw(
+            id, ServiceEntities.PARTY
+        )
+    except RedisError as e:
+        logger.warning(f"Could not get Party with ID {id} due to Redis Error: {e}")
+        return None
+
+
+async_party_blp = Blueprint("async_party_blueprint", __name__, url_prefix="/api")
+
+
+def _as_view(view: type[MethodView], name: str) -> RouteCallable:
+    """
+    The view function of a view class. Quart's Blueprint inherits add_url_rule from Flask's,
+    which is typed with Flask's view functions, so the Quart view function is cast to one.
+    """
+    return cast(RouteCallable, view.as_view(name))
+
+
+async_party_blp.add_url_rule(
+    "/v1/parties", view_func=_as_view(AsyncPartyListView, "party_list_view")
+)
+async_party_blp.add_url_rule(
+    "/v1/parties:batchGet",
+    view_func=_as_view(AsyncPartyBatchGetView, "party_batch_get_view"),
+)
+async_party_blp.add_url_rule(
+    "/v1/parties/<int:id>",
+    view_func=_as_view(AsyncPartyDetailView, "party_detail_view"),
+)
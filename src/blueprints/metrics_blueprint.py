@@ -0,0 +1,59 @@
+from typing import Any
+
+from flask import Blueprint, current_app
+from flask.views import MethodView
+
+
+class CacheMetrics(MethodView):
+    def get(self) -> tuple[dict[str, Any], int]:
+        """Internal endpoint exposing the cache counters of this worker, used to size the local cache and write queue."""
+        local_cache = current_app.local_cache
+        cache_writer = current_app.container.cache_writer
+        address_lookup_cache = current_app.container.address_lookup_cache
+        return {
+            "localCache": local_cache.stats() if local_cache else None,
+            "writeBehind": cache_writer.stats() if cache_writer else None,
+            "addressLookup": address_lookup_cache.stats()
+            if address_lookup_cache
+            else None,
+        }, 200
+
+
+class DatabaseMetrics(MethodView):
+    def get(self) -> tuple[dict[str, Any], int]:
+        """Internal endpoint exposing the statements this worker sent to the primary and to each read replica,
+        the fallbacks from replicas to the primary, and the status of each connection pool.
+        """
+        return current_app.db_router.stats(), 200
+
+
+class PoolMetrics(MethodView):
+    def get(self) -> tuple[dict[str, Any], int]:
+        """Internal endpoint exposing the occupancy of this worker's Postgres and Redis connection pools,
+        and how long checkouts waited for a connection and how many timed out, used to size the pools.
+        """
+        router = current_app.db_router
+        return {
+            "database": {
+                "primary": _pool_stats(router.primary.pool),
+                "replicas": [_pool_stats(replica.pool) for replica in router.replicas],
+            },
+            "cache": _pool_stats(current_app.cache.connection_pool),
+        }, 200
+
+
+def _pool_stats(pool: Any) -> dict[str, Any] | None:
+    """The stats of an instrumented pool (see connection_pools), or None for a pool that isn't instrumented."""
+    return pool.stats() if hasattr(pool, "stats") else None
+
+
+metrics_blp = Blueprint("metrics_blueprint", __name__, url_prefix="/internal")
+metrics_blp.add_url_rule(
+    rule="/metrics/cache", view_func=CacheMetrics.as_view("cache_metrics")
+)
+metrics_blp.add_url_rule(
+    rule="/metrics/database", view_func=DatabaseMetrics.as_view("database_metrics")
+)
+metrics_blp.add_url_rule(
+    rule="/metrics/pools", view_func=PoolMetrics.as_view("pool_metrics")
+)
@@ -1,13 +1,22 @@
 import logging
 
-from flask import current_app, Blueprint
+from flask import current_app, Blueprint, Response, request, stream_with_context
 from flask.views import MethodView
 
 from src.util.enums import ServiceEntities
-from src.dto.request_dtos import PartyCreate, PartyUpdate
+from src.dto.request_dtos import (
+    PartyBatchCreate,
+    PartyBatchGet,
+    PartyCreate,
+    PartyExport,
+    PartyList,
+    PartySearch,
+    PartyUpdate,
+)
 from src.middleware.validation import validate_request
 from src.middleware.caching import cache_read
-from src.util.custom_types import PartyResponseTuple
+from src.util import helpers
+from src.util.custom_types import CachedViewResponse, PartyResponseTuple
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +27,14 @@ class PartyBaseView(MethodView):
 
 
 class PartyListView(PartyBaseView):
+    def get(self) -> PartyResponseTuple:
+        """Handles REST requests to list the parties matching the query's filters, one page at a time.
+        The response includes the cursor of the next page, or null on the last page.
+        """
+        list_request = PartyList.model_validate(request.args.to_dict())
+        logger.info("GET /parties endpoint received request to list Parties.")
+        return self._party_service.list_parties(list_request), 200
+
     @validate_request(PartyCreate)
     def post(self, party_request: PartyCreate) -> PartyResponseTuple:
         """Handles REST requests to create a new party."""
@@ -25,28 +42,115 @@ class PartyListView(PartyBaseView):
         return self._party_service.add_party(party_request), 201
 
 
+class PartyBatchCreateView(PartyBaseView):
+    @validate_request(PartyBatchCreate)
+    def post(self, batch_request: PartyBatchCreate) -> PartyResponseTuple:
+        """Handles REST requests to create multiple new parties.
+        The response reports the result of every party. It is a 201 if every party was created,
+        a 207 if only some parties were created, and a 422 if none was.
+        """
+        logger.info(
+            f"POST /parties:batchCreate endpoint received request to create {len(batch_request.parties)} Parties."
+        )
+        response = self._party_service.add_parties(batch_request)
+        statuses = {result["status"] for result in response["results"]}
+        if statuses == {201}:
+            return response, 201
+        return response, 207 if 201 in statuses else 422
+
+
+class PartySearchView(PartyBaseView):
+    def get(self) -> PartyResponseTuple:
+        """Handles REST requests to search parties by name or email, ex. for typeahead.
+        Returns at most `limit` parties, most relevant first.
+        """
+        search_request = PartySearch.model_validate(request.args.to_dict())
+        logger.info("GET /parties:search endpoint received request to search Parties.")
+        return self._party_service.search_parties(search_request), 200
+
+
+class PartyExportView(PartyBaseView):
+    def get(self) -> Response:
+        """Handles REST requests to export every party as NDJSON, optionally only the ones updated since a time.
+        The response is streamed as the parties are read, and gzipped if the client accepts it.
+        """
+        export_request = PartyExport.model_validate(request.args.to_dict())
+        logger.info(
+            f"GET /parties:export endpoint received request to export Parties updated since {export_request.updated_since}."
+        )
+        body = helpers.buffer_chunks(
+            self._party_service.export_parties(export_request.updated_since)
+        )
+        headers = {"Vary": "Accept-Encoding"}
+        if request.accept_encodings["gzip"] > 0:
+            body = helpers.gzip_chunks(body)
+            headers["Content-Encoding"] = "gzip"
+        # keep the request context, and with it the database session, until the last party is sent
+        return Response(
+            stream_with_context(body), mimetype="application/x-ndjson", headers=headers
+        )
+
+
+class PartyBatchGetView(PartyBaseView):
+    @validate_request(PartyBatchGet)
+    def post(self, batch_request: PartyBatchGet) -> PartyResponseTuple:
+        """Handles REST requests to retrieve multiple existing parties by ID."""
+        logger.info(
+            f"POST /parties:batchGet endpoint received request to retrieve {len(batch_request.ids)} Parties."
+        )
+        return self._party_service.get_parties(batch_request.ids), 200
+
+
 class PartyDetailView(PartyBaseView):
-    @cache_read(ServiceEntities.PARTY)
-    def get(self, id: int) -> PartyResponseTuple:
-        """Handles REST request to retrieve an existing party by ID."""
+    @cache_read(ServiceEntities.PARTY, raw=True)
+    def get(self, id: int) -> CachedViewResponse:
+        """Handles REST request to retrieve an existing party by ID.
+        The party is serialized once, and the same bytes are cached and sent as the response body.
+        """
         logger.info(
             f"GET /parties endpoint received request to retrieve Party with ID {id}."
         )
-        return self._party_service.get_party(id), 200
+        return Response(
+            self._party_service.get_party_json(id), 200, mimetype="application/json"
+        )
 
     @validate_request(PartyUpdate)
-    def patch(self, party_request: PartyUpdate, id: int) -> PartyResponseTuple:
-        """Handles REST requests to update an existing party by ID."""
+    def patch(self, party_request: PartyUpdate, id: int) -> Response:
+        """Handles REST requests to update an existing party by ID.
+        If-Match is honoured for optimistic concurrency. Only strong ETags match, as returned by GET and PATCH.
+        The response is serialized like GET, so its ETag can be used for the next conditional request.
+        """
         logger.info(
             f"PATCH /parties endpoint received request to update Party with ID {id}."
         )
-        return self._party_service.update_party(id, party_request), 200
+        if_match = None
+        if request.if_match:
+            if_match = {"*"} if request.if_match.star_tag else request.if_match.as_set()
+        body = helpers.to_json_bytes(
+            self._party_service.update_party(id, party_request, if_match)
+        )
+        response = Response(body, 200, mimetype="application/json")
+        response.set_etag(helpers.etag(body))
+        return response
 
 
 party_blp = Blueprint("party_blueprint", __name__, url_prefix="/api")
 party_blp.add_url_rule(
     "/v1/parties", view_func=PartyListView.as_view("party_list_view")
 )
+party_blp.add_url_rule(
+    "/v1/parties:batchCreate",
+    view_func=PartyBatchCreateView.as_view("party_batch_create_view"),
+)
+party_blp.add_url_rule(
+    "/v1/parties:search", view_func=PartySearchView.as_view("party_search_view")
+)
+party_blp.add_url_rule(
+    "/v1/parties:export", view_func=PartyExportView.as_view("party_export_view")
+)
+party_blp.add_url_rule(
+    "/v1/parties:batchGet", view_func=PartyBatchGetView.as_view("party_batch_get_view")
+)
 party_blp.add_url_rule(
     "/v1/parties/<int:id>", view_func=PartyDetailView.as_view("party_detail_view")
 )
@@ -0,0 +1,150 @@
+"""Flask CLI commands operating on the cache, ex. `flask cache warm`."""
+
+import logging
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import batched
+from typing import Any, cast
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from redis import RedisError
+
+from src.repository.cache_repository import CacheRepository
+from src.repository.party_repository import PartyRepository
+from src.util import mappers
+from src.util.enums import ServiceEntities
+
+logger = logging.getLogger(__name__)
+
+# typed as its base class, since the stubs of AppGroup leave its command decorator untyped
+cache_cli = cast(click.Group, AppGroup("cache", help="Manage the cache."))
+
+
+@dataclass
+class WarmupReport:
+    """Progress of a cache warm-up."""
+
+    parties: int = 0
+    batches: int = 0
+    failed_batches: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Parties written per second."""
+        return self.parties / self.seconds if self.seconds else 0.0
+
+
+def warm_parties(
+    party_repository: PartyRepository,
+    cache_repository: CacheRepository,
+    min_id: int | None = None,
+    max_id: int | None = None,
+    updated_since: datetime | None = None,
+    batch_size: int = 500,
+    concurrency: int = 4,
+    on_progress: Callable[[WarmupReport], None] | None = None,
+    progress_interval: float = 5.0,
+) -> WarmupReport:
+    """
+    Stream parties from the database and write them to the cache in pipelined batches.
+
+    The database is read and the parties are mapped on the calling thread, while up to `concurrency` batches
+    are written to Redis at once. Parties that are already cached are left as is, since a request may have
+    cached a newer version of the party while the warm-up was running.
+    A batch that fails to be written is counted and skipped, so one Redis error doesn't abort the warm-up.
+    """
+    report = WarmupReport()
+    started = last_progress = time.monotonic()
+    in_flight: set[Future[int]] = set()
+
+    def write(batch: dict[int, dict[str, Any]]) -> int:
+        cache_repository.add_many(ServiceEntities.PARTY, batch, only_missing=True)
+        return len(batch)
+
+    def collect(done: set[Future[int]]) -> None:
+        for future in done:
+            try:
+                report.parties += future.result()
+                report.batches += 1
+            except RedisError as e:
+                logger.warning(f"Could not write batch of Parties to cache: {e}")
+                report.failed_batches += 1
+
+    parties = party_repository.stream(min_id, max_id, updated_since, batch_size)
+    with ThreadPoolExecutor(concurrency, thread_name_prefix="cache-warmup") as pool:
+        for chunk in batched(parties, batch_size):
+            # bound the number of mapped batches held in memory while Redis catches up
+            if len(in_flight) >= concurrency * 2:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+
+            batch = {
+                party.id: mappers.to_party_response(party).to_dict() for party in chunk
+            }
+            in_flight.add(pool.submit(write, batch))
+
+            if on_progress and time.monotonic() - last_progress >= progress_interval:
+                last_progress = time.monotonic()
+                report.seconds = last_progress - started
+                on_progress(report)
+
+        collect(wait(in_flight).done)
+
+    report.seconds = time.monotonic() - started
+    return report
+
+
+@cache_cli.command("warm")
+@click.option("--min-id", type=int, help="Only warm parties with this ID or higher.")
+@click.option("--max-id", type=int, help="Only warm parties with this ID or lower.")
+@click.option(
+    "--updated-since",
+    type=click.DateTime(),
+    help="Only warm parties updated at or after this time.",
+)
+@click.option(
+    "--batch-size", type=click.IntRange(min=1), default=500, show_default=True
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="Number of batches written to Redis at once.",
+)
+def warm_command(
+    min_id: int | None,
+    max_id: int | None,
+    updated_since: datetime | None,
+    batch_size: int,
+    concurrency: int,
+) -> None:
+    """Load parties from the database into the cache, ex. after a Redis failover or flush."""
+    container = current_app.container
+
+    def on_progress(report: WarmupReport) -> None:
+        click.echo(
+            f"Warmed {report.parties} parties in {report.seconds:.0f}s ({report.rate:.0f}/s)."
+        )
+
+    report = warm_parties(
+        container.party_repository,
+        container.cache_repository,
+        min_id=min_id,
+        max_id=max_id,
+        updated_since=updated_since,
+        batch_size=batch_size,
+        concurrency=concurrency,
+        on_progress=on_progress,
+    )
+    on_progress(report)
+    if report.failed_batches:
+        raise click.ClickException(
+            f"{report.failed_batches} batches could not be written to the cache."
+        )
@@ -0,0 +1,348 @@
+"""Flask CLI commands operating on parties, ex. `flask party import` and `flask party export`."""
+
+import csv
+import json
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import batched
+from typing import Any, TextIO, cast
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from pydantic import ValidationError
+from sqlalchemy import String
+
+from src.dto.request_dtos import PartyCreate
+from src.models.address import Address
+from src.models.party import Party
+from src.repository.party_import_repository import (
+    STAGED_COLUMNS,
+    PartyImportRepository,
+)
+from src.repository.unit_of_work import UnitOfWork
+from src.util import helpers
+
+logger = logging.getLogger(__name__)
+
+# typed as its base class, since the stubs of AppGroup leave its command decorator untyped
+party_cli = cast(click.Group, AppGroup("party", help="Manage parties."))
+
+FORMATS = ("ndjson", "csv")
+
+# CSV files are flat, so the address and meta fields of PartyCreate are columns next to the party fields.
+_CSV_ADDRESS_FIELDS = {
+    "streetOne",
+    "streetTwo",
+    "city",
+    "state",
+    "postalCode",
+    "country",
+}
+_CSV_META_FIELDS = {"createdBy", "createdAt"}
+
+# Rows longer than their database column would fail the COPY of the whole batch, so they are rejected upfront.
+_COLUMN_LENGTHS = {
+    column.name: column.type.length
+    for table in (Party.__table__, Address.__table__)
+    for column in table.c
+    if isinstance(column.type, String) and column.type.length
+}
+
+StagedRow = tuple[Any, ...]
+Reject = dict[str, Any]
+
+
+@dataclass
+class ImportReport:
+    """Progress of a bulk import."""
+
+    resumed_from: int = 0
+    rows: int = 0
+    imported: int = 0
+    rejected: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Rows read per second."""
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def read_records(path: str, fmt: str, after_line: int = 0) -> Iterator[tuple[int, Any]]:
+    """
+    Stream the records of an NDJSON or CSV file with the line they end on, skipping the lines up to after_line.
+    NDJSON records are returned unparsed, so they are parsed by the validation workers.
+    """
+    with open(path, newline="", encoding="utf-8") as file:
+        if fmt == "csv":
+            reader = csv.DictReader(file)
+            for record in reader:
+                if reader.line_num > after_line:
+                    yield reader.line_num, record
+            return
+
+        for line, text in enumerate(file, start=1):
+            if line > after_line and text.strip():
+                yield line, text
+
+
+def validate_records(
+    records: list[tuple[int, Any]],
+) -> tuple[list[StagedRow], list[Reject]]:
+    """
+    Validate records against PartyCreate, and convert the valid ones to staged rows (see STAGED_COLUMNS).
+    Runs in a worker process.
+    :return: The staged rows, and a reject for every invalid record with the line it ends on and its errors.
+    """
+    rows, rejects = [], []
+    for line, record in records:
+        try:
+            payload = json.loads(record) if isinstance(record, str) else _nest(record)
+            party = PartyCreate.model_validate(payload)
+        except json.JSONDecodeError as e:
+            errors = [{"field": "", "message": f"Invalid JSON: {e.msg}"}]
+        except ValidationError as e:
+            errors = helpers.to_validation_errors(e)
+        else:
+            row = _to_staged_row(line, party)
+            if not (errors := _length_errors(row)):
+                rows.append(row)
+                continue
+        rejects.append({"line": line, "errors": errors, "record": record})
+    return rows, rejects
+
+
+def import_parties(
+    import_repository: PartyImportRepository,
+    unit_of_work: UnitOfWork,
+    path: str,
+    fmt: str,
+    job: str,
+    reject_file: TextIO,
+    user: str,
+    batch_size: int = 10000,
+    workers: int = 4,
+    on_progress: Callable[[ImportReport], None] | None = None,
+    progress_interval: float = 5.0,
+) -> ImportReport:
+    """
+    Stream parties from a file into the database.
+
+    The file is read on the calling thread, and batches are validated by `workers` processes at once.
+    Batches are merged in file order, each in its own transaction, together with the job's checkpoint:
+    the last line of the batch. An interrupted import resumes after its checkpoint when run again with the same job.
+
+    Invalid records are written to the reject file before their batch commits,
+    so an import resumed after a crash may repeat the rejects of one batch, but never loses any.
+    """
+    after_line = import_repository.get_checkpoint(job)
+    report = ImportReport(resumed_from=after_line)
+    started = last_progress = time.monotonic()
+    in_flight: deque[tuple[int, Future[tuple[list[StagedRow], list[Reject]]]]] = deque()
+
+    def merge(
+        last_line: int, future: Future[tuple[list[StagedRow], list[Reject]]]
+    ) -> None:
+        rows, rejects = future.result()
+        for reject in rejects:
+            reject_file.write(json.dumps(reject, default=str) + "\n")
+        reject_file.flush()
+        with unit_of_work:
+            if rows:
+                import_repository.copy_to_staging(rows)
+                report.imported += import_repository.merge_staging()
+            import_repository.save_checkpoint(job, last_line, user)
+        report.rows += len(rows) + len(rejects)
+        report.rejected += len(rejects)
+        report.batches += 1
+
+    # spawned workers don't inherit the app's database connections
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=context) as pool:
+        for batch in batched(read_records(path, fmt, after_line), batch_size):
+            # bound the number of batches held in memory while the database catches up
+            if len(in_flight) >= workers * 2:
+                merge(*in_flight.popleft())
+            in_flight.append((batch[-1][0], pool.submit(validate_records, list(batch))))
+
+            if on_progress and time.monotonic() - last_progress >= progress_interval:
+                last_progress = time.monotonic()
+                report.seconds = last_progress - started
+                on_progress(report)
+
+        while in_flight:
+            merge(*in_flight.popleft())
+
+    report.seconds = time.monotonic() - started
+    return report
+
+
+def _nest(record: dict[str, str]) -> dict[str, Any]:
+    """Nest the address and meta columns of a CSV record like in a POST payload. Empty cells are left out."""
+    party: dict[str, Any] = {"address": {}, "meta": {}}
+    for field, value in record.items():
+        if not value:
+            continue
+        if field in _CSV_ADDRESS_FIELDS:
+            party["address"][field] = value
+        elif field in _CSV_META_FIELDS:
+            party["meta"][field] = value
+        else:
+            party[field] = value
+    return party
+
+
+def _to_staged_row(line: int, party: PartyCreate) -> StagedRow:
+    address = party.address
+    return (
+        line,
+        party.first_name,
+        party.middle_name,
+        party.last_name,
+        str(party.email),
+        party.phone_number,
+        address.street_one,
+        address.street_two,
+        address.city,
+        address.state,
+        address.postal_code,
+        address.country,
+        address.get_hash(),
+        party.meta.created_by,
+    )
+
+
+def _length_errors(row: StagedRow) -> list[dict[str, str]]:
+    return [
+        {
+            "field": helpers.to_camel_case(column),
+            "message": f"String should have at most {_COLUMN_LENGTHS[column]} characters",
+        }
+        for column, value in zip(STAGED_COLUMNS, row)
+        if isinstance(value, str)
+        and column in _COLUMN_LENGTHS
+        and len(value) > _COLUMN_LENGTHS[column]
+    ]
+
+
+@party_cli.command("import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(FORMATS),
+    help="Defaults to the file's extension.",
+)
+@click.option(
+    "--job",
+    help="Name of the import, used to resume it. Defaults to the file's name.",
+)
+@click.option(
+    "--reject-file",
+    type=click.Path(dir_okay=False, writable=True),
+    help="NDJSON file invalid records are appended to. Defaults to <path>.rejects.ndjson.",
+)
+@click.option(
+    "--batch-size", type=click.IntRange(min=1), default=10000, show_default=True
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=os.cpu_count() or 1,
+    show_default="number of CPUs",
+    help="Number of processes validating batches at once.",
+)
+def import_command(
+    path: str,
+    fmt: str | None,
+    job: str | None,
+    reject_file: str | None,
+    batch_size: int,
+    workers: int,
+) -> None:
+    """
+    Import parties from an NDJSON or CSV file, ex. during a migration.
+
+    NDJSON records are POST payloads. CSV files have a header row with the same fields,
+    with the address and meta fields as columns of their own (ex. streetOne, createdBy).
+    """
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+    if fmt not in FORMATS:
+        raise click.BadParameter(
+            f"Can't tell the format of '{path}', pass --format.", param_hint="--format"
+        )
+    job = job or os.path.basename(path)
+    reject_file = reject_file or f"{path}.rejects.ndjson"
+    container = current_app.container
+
+    def on_progress(report: ImportReport) -> None:
+        click.echo(
+            f"Read {report.rows} rows in {report.seconds:.0f}s ({report.rate:.0f}/s), "
+            f"imported {report.imported} parties, rejected {report.rejected}."
+        )
+
+    with open(reject_file, "a", encoding="utf-8") as rejects:
+        report = import_parties(
+            container.party_import_repository,
+            container.unit_of_work,
+            path,
+            fmt,
+            job,
+            rejects,
+            user=f"import:{job}"[:50],
+            batch_size=batch_size,
+            workers=workers,
+            on_progress=on_progress,
+        )
+    if report.resumed_from:
+        click.echo(f"Resumed after line {report.resumed_from}.")
+    on_progress(report)
+    if report.rejected:
+        click.echo(f"Rejected rows were written to {reject_file}.")
+
+
+@party_cli.command("export")
+@click.option(
+    "--updated-since",
+    type=click.DateTime(),
+    help="Only export parties updated at or after this time.",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, writable=True),
+    help="File to write to. Defaults to stdout.",
+)
+@click.option(
+    "--gzip",
+    "compress",
+    is_flag=True,
+    help="Gzip the output. Implied by an output file ending in .gz.",
+)
+@click.option(
+    "--batch-size", type=click.IntRange(min=1), default=1000, show_default=True
+)
+def export_command(
+    updated_since: datetime | None,
+    output: str | None,
+    compress: bool,
+    batch_size: int,
+) -> None:
+    """Export every party as NDJSON, ex. for analytics. Memory use doesn't grow with the number of parties."""
+    body = helpers.buffer_chunks(
+        current_app.container.party_service.export_parties(updated_since, batch_size)
+    )
+    if compress or (output or "").endswith(".gz"):
+        body = helpers.gzip_chunks(body)
+    with click.open_file(output or "-", "wb") as file:
+        for chunk in body:
+            file.write(chunk)
@@ -0,0 +1,22 @@
+from typing import cast
+
+from quart import Quart, current_app
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_scoped_session
+
+from src.config.async_container import AsyncContainer
+from src.repository.cache_codecs import CacheCodec
+
+
+class AsyncApp(Quart):
+    """The Quart app of the async app, with the dependencies create_async_app sets on it."""
+
+    container: AsyncContainer
+    engine: AsyncEngine
+    session: async_scoped_session[AsyncSession]
+    cache: Redis
+    cache_codec: CacheCodec
+
+
+# current_app, typed as the async app it always is in the async app's views
+current_async_app = cast(AsyncApp, current_app)
@@ -0,0 +1,125 @@
+import asyncio
+import os
+from typing import Optional
+
+from pydantic import ValidationError
+from redis.asyncio import Redis
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import (
+    async_scoped_session,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from src.blueprints.async_party_blueprint import async_party_blp
+from src.config.async_app import AsyncApp
+from src.config.async_container import AsyncContainer
+from src.config.cache_policy import load_cache_policies
+from src.config.config import Config, init_logger
+from src.exception.custom_exceptions import EntityNotFound
+from src.exception.async_exception_handlers import (
+    handle_validation_error,
+    handle_database_error,
+    handle_not_found_error,
+)
+from src.repository.cache_codecs import CacheCodec
+from src.util.helpers import get_env_int
+
+
+def create_async_app() -> AsyncApp:
+    """
+    Application factory pattern, for the async app. It is served by an ASGI server (see asgi.py).
+
+    The async app serves getting a party, getting multiple parties, and creating a party, with the same
+    request and response payloads as the sync app. It shares the database and the cache with the sync app,
+    which serves every other endpoint.
+    """
+    init_logger()
+    app = AsyncApp(__name__)
+    app.config.from_object(Config)
+
+    init_async_db(app)
+    init_async_cache(app)
+    init_async_di(app)
+    init_async_exception_handlers(app)
+    register_async_teardown_logic(app)
+
+    app.register_blueprint(async_party_blp)
+
+    return app
+
+
+def init_async_di(app: AsyncApp) -> None:
+    """Create the dependency injection container of the async app."""
+    app.container = AsyncContainer(
+        app.session, app.cache, load_cache_policies(), app.cache_codec
+    )
+
+
+def init_async_db(app: AsyncApp) -> None:
+    """
+    Create the async engine and its connection pool, and the app's async scoped session.
+
+    The engine connects with asyncpg to the database of DATABASE_URL, whatever its driver is.
+    Every request is handled in its own task, so the scoped session hands every request its own session.
+    """
+    url = os.getenv("DATABASE_URL")
+    if url is None:
+        raise Exception(
+            "App failed to start because the environment variable 'DATABASE_URL' is not set"
+        )
+
+    app.engine = create_async_engine(
+        _to_async_url(url), pool_recycle=3600, pool_pre_ping=True
+    )
+    # Same as the sync app, entities are still read after their transaction commits.
+    session_factory = async_sessionmaker(bind=app.engine, expire_on_commit=False)
+    app.session = async_scoped_session(session_factory, scopefunc=asyncio.current_task)
+
+
+def _to_async_url(url: str) -> URL:
+    """The URL with its driver replaced by asyncpg, if it is a Postgres URL. Other URLs must name an async driver."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "postgresql":
+        return parsed.set(drivername="postgresql+asyncpg")
+    return parsed
+
+
+def init_async_cache(app: AsyncApp) -> None:
+    """Create the redis.asyncio client. Values are encoded like in the sync app (see init_cache)."""
+    url = os.getenv("CACHE_URL")
+    if url is None:
+        raise Exception(
+            "App failed to start because the environment variable 'REDIS_URL' is not set"
+        )
+
+    app.cache = Redis.from_url(url)
+    app.cache_codec = CacheCodec(
+        serializer=os.getenv("CACHE_CODEC", "json"),
+        compress_threshold=get_env_int("CACHE_COMPRESS_THRESHOLD", 256),
+    )
+
+
+def init_async_exception_handlers(app: AsyncApp) -> None:
+    app.register_error_handler(ValidationError, handle_validation_error)
+    app.register_error_handler(EntityNotFound, handle_not_found_error)
+    app.register_error_handler(SQLAlchemyError, handle_database_error)
+
+
+def register_async_teardown_logic(app: AsyncApp) -> None:
+    """Register logic to run when the application context is removed, and when the app stops serving.
+
+    The request's database session is closed when its application context is removed. The Redis connections
+    and the connection pool are closed once the ASGI server stops serving, since they are shared by every request.
+    """
+
+    @app.after_serving
+    async def shutdown() -> None:
+        app.logger.info("Closing redis connections")
+        await app.cache.aclose()
+        await app.engine.dispose()
+
+    @app.teardown_appcontext
+    async def cleanup(exc: Optional[BaseException] = None) -> None:
+        await app.session.remove()
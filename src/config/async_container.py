@@ -0,0 +1,90 @@
+from typing import Optional
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session
+
+from src.config.cache_policy import CachePolicy
+from src.repository.cache_codecs import CacheCodec
+from src.repository.async_cache_repository import AsyncCacheRepository
+from src.repository.async_address_repository import AsyncAddressRepository
+from src.repository.async_party_history_repository import (
+    AsyncPartyHistoryRepository,
+)
+from src.repository.async_party_repository import AsyncPartyRepository
+from src.repository.async_unit_of_work import AsyncUnitOfWork
+from src.service.async_party_service import AsyncPartyService
+from src.util.enums import ServiceEntities
+
+
+class AsyncContainer:
+    """
+    Dependency injection container of the async app. Same as Container, with the async dependencies.
+
+    The repositories and the unit of work hold the app's async scoped session, which passes every call on
+    to the session of the current request's task (see init_async_db).
+    """
+
+    def __init__(
+        self,
+        db_session: async_scoped_session[AsyncSession],
+        cache: Redis,
+        cache_policies: dict[ServiceEntities, CachePolicy] | None = None,
+        cache_codec: CacheCodec | None = None,
+    ) -> None:
+        self._db_session = db_session
+        self._cache = cache
+        self._cache_policies = cache_policies
+        self._cache_codec = cache_codec
+        self._cache_repository: Optional[AsyncCacheRepository] = None
+        self._party_repository: Optional[AsyncPartyRepository] = None
+        self._address_repository: Optional[AsyncAddressRepository] = None
+        self._party_history_repository: Optional[AsyncPartyHistoryRepository] = None
+        self._party_service: Optional[AsyncPartyService] = None
+        self._unit_of_work: Optional[AsyncUnitOfWork] = None
+
+    @property
+    def cache_repository(self) -> AsyncCacheRepository:
+        if not self._cache_repository:
+            self._cache_repository = AsyncCacheRepository(
+                self._cache, self._cache_policies, self._cache_codec
+            )
+        return self._cache_repository
+
+    @property
+    def party_history_repository(self) -> AsyncPartyHistoryRepository:
+        if not self._party_history_repository:
+            self._party_history_repository = AsyncPartyHistoryRepository(
+                self._db_session
+            )
+        return self._party_history_repository
+
+    @property
+    def party_repository(self) -> AsyncPartyRepository:
+        if not self._party_repository:
+            self._party_repository = AsyncPartyRepository(self._db_session)
+        return self._party_repository
+
+    @property
+    def address_repository(self) -> AsyncAddressRepository:
+        if not self._address_repository:
+            self._address_repository = AsyncAddressRepository(self._db_session)
+        return self._address_repository
+
+    @property
+    def unit_of_work(self) -> AsyncUnitOfWork:
+        if not self._unit_of_work:
+            self._unit_of_work = AsyncUnitOfWork(
+                self._db_session,
+                self.party_repository,
+                self.address_repository,
+                self.party_history_repository,
+            )
+        return self._unit_of_work
+
+    @property
+    def party_service(self) -> AsyncPartyService:
+        if not self._party_service:
+            self._party_service = AsyncPartyService(
+                self.unit_of_work, self.cache_repository
+            )
+        return self._party_service
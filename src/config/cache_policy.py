@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+
+from src.util.enums import ServiceEntities
+from src.util.helpers import get_env_bool, get_env_float, get_env_int
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    Caching behaviour of one entity type.
+
+    single_flight: On a cache miss, only one request per key rebuilds the entry. The others wait for it.
+    lock_timeout: Seconds the Redis rebuild lock is held at most, in case the rebuilding worker dies.
+    lock_wait: Seconds a request waits for another worker's rebuild before loading the entity itself.
+    negative_ttl: Seconds an ID that doesn't exist is remembered as not found. 0 disables negative caching.
+    ttl: Seconds an entry is kept.
+    ttl_jitter: Fraction the TTL of each entry is randomly shortened or lengthened by, so entries written
+    together (ex. by a warm-up) don't all expire at once.
+    early_expiration_beta: Scales how eagerly an entry is refreshed in the background before it expires, relative
+    to how long it took to compute (XFetch). 1.0 is the usual choice, higher refreshes earlier. 0 disables it.
+    """
+
+    single_flight: bool = False
+    lock_timeout: float = 5.0
+    lock_wait: float = 1.0
+    negative_ttl: int = 0
+    ttl: int = 86400
+    ttl_jitter: float = 0.1
+    early_expiration_beta: float = 0.0
+
+
+DEFAULT_CACHE_POLICIES: dict[ServiceEntities, CachePolicy] = {
+    ServiceEntities.PARTY: CachePolicy(
+        single_flight=True, negative_ttl=30, early_expiration_beta=1.0
+    ),
+}
+
+
+def load_cache_policies() -> dict[ServiceEntities, CachePolicy]:
+    """
+    Build the cache policy of every entity from the defaults, overridden by environment variables
+    named after the entity, ex. CACHE_PARTY_SINGLE_FLIGHT, CACHE_PARTY_LOCK_TIMEOUT, CACHE_PARTY_LOCK_WAIT,
+    CACHE_PARTY_NEGATIVE_TTL, CACHE_PARTY_TTL, CACHE_PARTY_TTL_JITTER, CACHE_PARTY_EARLY_EXPIRATION_BETA.
+    """
+    policies = {}
+    for entity in ServiceEntities:
+        default = DEFAULT_CACHE_POLICIES.get(entity, CachePolicy())
+        prefix = f"CACHE_{entity.name}"
+        policies[entity] = CachePolicy(
+            single_flight=get_env_bool(
+                f"{prefix}_SINGLE_FLIGHT", default.single_flight
+            ),
+            lock_timeout=get_env_float(f"{prefix}_LOCK_TIMEOUT", default.lock_timeout),
+            lock_wait=get_env_float(f"{prefix}_LOCK_WAIT", default.lock_wait),
+            negative_ttl=get_env_int(f"{prefix}_NEGATIVE_TTL", default.negative_ttl),
+            ttl=get_env_int(f"{prefix}_TTL", default.ttl),
+            ttl_jitter=get_env_float(f"{prefix}_TTL_JITTER", default.ttl_jitter),
+            early_expiration_beta=get_env_float(
+                f"{prefix}_EARLY_EXPIRATION_BETA", default.early_expiration_beta
+            ),
+        )
+    return policies
@@ -1,28 +1,60 @@
+import atexit
 import os
 import sys
+import threading
+import time
+from collections.abc import Callable
 from typing import Optional
 import logging
 
-from flask import Flask
+from flask import Flask, g
+from flask.helpers import get_debug_flag
 from pydantic import ValidationError
 from redis import Redis
-from sqlalchemy import QueuePool, create_engine
+from redis.client import PubSub, PubSubWorkerThread
+from sqlalchemy import Engine, create_engine, make_url
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import scoped_session, sessionmaker
 
 from src.blueprints.health_check_blueprint import hc_blp
 from src.blueprints.party_blueprint import party_blp
-from src.exception.custom_exceptions import EntityNotFound
+from src.blueprints.metrics_blueprint import metrics_blp
+from src.cli.cache_commands import cache_cli
+from src.cli.party_commands import party_cli
+from src.exception.custom_exceptions import (
+    EntityNotFound,
+    PreconditionFailed,
+    SearchTimeout,
+)
+from src.config.cache_policy import load_cache_policies
 from src.config.container import Container
+from src.config.pool_profile import DatabasePoolProfile, load_pool_profile
+from src.repository.cache_codecs import CacheCodec
+from src.repository.cache_writer import CacheWriterOptions
+from src.repository.connection_pools import (
+    InstrumentedBlockingConnectionPool,
+    InstrumentedQueuePool,
+    PoolValidator,
+)
+from src.repository.local_cache import LocalCache
+from src.repository.replica_router import ReplicaRouter, RoutingSession
+from src.util.constants import CacheConstants
+from src.util.enums import PrePing
+from src.util.helpers import get_env_bool, get_env_float, get_env_int
 from src.exception.exception_handlers import (
     handle_validation_error,
     handle_database_error,
     handle_not_found_error,
+    handle_precondition_failed_error,
+    handle_search_timeout_error,
 )
 
+# Whether FLASK_DEBUG is set, read the way Flask reads it. get_debug_flag is untyped, so it is called through this.
+debug_flag: Callable[[], bool] = get_debug_flag
+
 
 class Config:
-    DEBUG = True
+    DEBUG = debug_flag()
     API_TITLE = "My API"
     API_VERSION = "v1"
     OPENAPI_VERSION = "3.0.2"
@@ -36,12 +68,17 @@ def create_app() -> Flask:
 
     init_db(app)
     init_cache(app)
+    init_local_cache(app)
     init_di(app)
     init_exception_handlers(app)
     register_teardown_logic(app)
 
     app.register_blueprint(party_blp)
     app.register_blueprint(hc_blp)
+    app.register_blueprint(metrics_blp)
+
+    app.cli.add_command(cache_cli)
+    app.cli.add_command(party_cli)
 
     return app
 
@@ -49,25 +86,78 @@ def create_app() -> Flask:
 def init_logger() -> None:
     """Customize the root level logger.
     These settings will then propagate down to the child loggers (flask, blueprint, service loggers etc.).
+
+    The level is LOG_LEVEL, or DEBUG when FLASK_DEBUG is set and INFO otherwise.
     """
     logging.basicConfig(
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        level=logging.DEBUG,
+        level=os.getenv("LOG_LEVEL", "DEBUG" if debug_flag() else "INFO").upper(),
         handlers=[logging.StreamHandler(stream=sys.stdout)],
         force=True,  # override the werkzeug logger so all loggers use these settings
     )
 
 
 def init_di(app: Flask) -> None:
-    app.container = Container(app.session(), app.cache)
+    """
+    Create the dependency injection container.
+
+    Cache writes are sent from a background thread when CACHE_WRITE_BEHIND_ENABLED is set, with at most
+    CACHE_WRITE_BEHIND_QUEUE_SIZE pending writes. A request waits up to CACHE_WRITE_BEHIND_BLOCK_TIMEOUT
+    seconds for room in a full queue.
+
+    Address hashes are mapped to address IDs in an in-process LRU backed by Redis, unless
+    ADDRESS_LOOKUP_CACHE_ENABLED is turned off. The LRU holds ADDRESS_LOOKUP_CACHE_MAX_SIZE hashes,
+    and mappings are kept for ADDRESS_LOOKUP_CACHE_TTL seconds.
+
+    Party searches are cancelled after SEARCH_STATEMENT_TIMEOUT_MS milliseconds.
+    """
+    cache_writer_options = None
+    if get_env_bool("CACHE_WRITE_BEHIND_ENABLED", False):
+        cache_writer_options = CacheWriterOptions(
+            max_size=get_env_int("CACHE_WRITE_BEHIND_QUEUE_SIZE", 10000),
+            block_timeout=get_env_float("CACHE_WRITE_BEHIND_BLOCK_TIMEOUT", 0.05),
+        )
+
+    address_lookup_ttl = get_env_int("ADDRESS_LOOKUP_CACHE_TTL", 86400)
+    address_lookup_local_cache = None
+    if get_env_bool("ADDRESS_LOOKUP_CACHE_ENABLED", True):
+        address_lookup_local_cache = LocalCache(
+            max_size=get_env_int("ADDRESS_LOOKUP_CACHE_MAX_SIZE", 10000),
+            ttl=address_lookup_ttl,
+        )
+
+    app.container = Container(
+        app.session,
+        app.cache,
+        app.local_cache,
+        load_cache_policies(),
+        app.cache_codec,
+        cache_writer_options,
+        address_lookup_local_cache,
+        address_lookup_ttl,
+        get_env_int("SEARCH_STATEMENT_TIMEOUT_MS", 500),
+    )
 
 
 def init_db(app: Flask) -> None:
-    options = {
-        "poolclass": QueuePool,
-        "pool_recycle": 3600,
-        "pool_pre_ping": True,
-    }
+    """
+    Create the engine and its connection pool, and the app's scoped session.
+
+    The scoped session hands every app context its own session: Flask pushes one for every request
+    and CLI command, and background work that uses the database pushes its own (see caching._refresh).
+    Sessions borrow a connection from the pool when they first use the database,
+    and are closed when their app context is torn down, which returns the connection to the pool
+    and discards the entities they loaded.
+
+    Read replicas are configured with DATABASE_REPLICA_URLS, a comma separated list of URLs. The reads of
+    read-only units of work are sent to a replica, unless the session already wrote or the replica lags more than
+    DATABASE_REPLICA_MAX_LAG seconds behind, which is checked every DATABASE_REPLICA_LAG_CHECK_INTERVAL seconds
+    (see ReplicaRouter). Everything else is sent to the primary of DATABASE_URL.
+
+    The primary and every replica get a connection pool of the same profile (see load_pool_profile).
+    When idle connections are validated in the background, a validator thread is started per engine.
+    """
+    profile = load_pool_profile().database
 
     url = os.getenv("DATABASE_URL")
     if url is None:
@@ -75,35 +165,201 @@ def init_db(app: Flask) -> None:
             "App failed to start because the environment variable 'DATABASE_URL' is not set"
         )
 
-    engine = create_engine(url, **options)
-    session_factory = sessionmaker(bind=engine)
-    app.session = scoped_session(session_factory)
+    engine = _create_engine(url, profile)
+    replicas = [
+        _create_engine(replica_url.strip(), profile)
+        for replica_url in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+        if replica_url.strip()
+    ]
+    app.pool_validators = []
+    if profile.pre_ping == PrePing.BACKGROUND:
+        app.pool_validators = [
+            PoolValidator(validated, profile.validation_interval)
+            for validated in [engine, *replicas]
+        ]
+        for validator in app.pool_validators:
+            validator.start()
+    app.db_router = ReplicaRouter(
+        engine,
+        replicas,
+        max_lag=get_env_float("DATABASE_REPLICA_MAX_LAG", 5.0),
+        lag_check_interval=get_env_float("DATABASE_REPLICA_LAG_CHECK_INTERVAL", 1.0),
+    )
+    # Entities are still read after their transaction commits (ex. to write them to the cache).
+    # Every app context (a request, a CLI command) gets its own session (see _session_scope), which is removed
+    # when the context tears down, so its state doesn't need to be reloaded with a SELECT after a commit.
+    session_factory = sessionmaker(
+        bind=engine,
+        class_=RoutingSession,
+        router=app.db_router,
+        expire_on_commit=False,
+    )
+    app.session = scoped_session(session_factory, scopefunc=_session_scope)
+
+
+def _create_engine(url: str, profile: DatabasePoolProfile) -> Engine:
+    """Create an engine whose connection pool is configured by the profile, and counts its checkouts."""
+    connect_args = {}
+    if (
+        profile.statement_timeout_ms
+        and make_url(url).get_backend_name() == "postgresql"
+    ):
+        connect_args["options"] = f"-c statement_timeout={profile.statement_timeout_ms}"
+    return create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=profile.pool_size,
+        max_overflow=profile.max_overflow,
+        pool_timeout=profile.pool_timeout,
+        pool_recycle=profile.pool_recycle,
+        pool_pre_ping=profile.pre_ping == PrePing.CHECKOUT,
+        connect_args=connect_args,
+    )
+
+
+def _session_scope() -> int:
+    """Key of the current session in the scoped session's registry: the current app context, or else the thread."""
+    # the g proxy is falsy outside of an app context, and every app context has its own g
+    if g:
+        return id(g._get_current_object())
+    return threading.get_ident()
 
 
 def init_cache(app: Flask) -> None:
+    """
+    Create the Redis client, on a connection pool configured by the pool profile (see load_pool_profile).
+    Commands wait for a free connection once the pool's connections are all in use.
+    """
     url = os.getenv("CACHE_URL")
     if url is None:
         raise Exception(
             "App failed to start because the environment variable 'REDIS_URL' is not set"
         )
 
-    app.cache = Redis.from_url(url)
+    profile = load_pool_profile().cache
+    app.cache = Redis(
+        connection_pool=InstrumentedBlockingConnectionPool.from_url(
+            url,
+            max_connections=profile.max_connections,
+            timeout=profile.pool_timeout,
+            socket_timeout=profile.socket_timeout or None,
+            socket_connect_timeout=profile.socket_connect_timeout or None,
+            health_check_interval=profile.health_check_interval,
+        )
+    )
+    # CACHE_CODEC is "json" or "msgpack". Values larger than CACHE_COMPRESS_THRESHOLD bytes are compressed.
+    app.cache_codec = CacheCodec(
+        serializer=os.getenv("CACHE_CODEC", "json"),
+        compress_threshold=get_env_int("CACHE_COMPRESS_THRESHOLD", 256),
+    )
+
+
+def init_local_cache(app: Flask) -> None:
+    """
+    Optionally create the in-process cache that sits in front of Redis.
+
+    Each worker subscribes to the invalidation channel with its own Redis client, so the listener
+    is not affected by the app's connections being closed on teardown. If the subscription errors,
+    invalidations may have been missed, so the local cache is cleared.
+
+    Configured with LOCAL_CACHE_ENABLED, LOCAL_CACHE_MAX_SIZE and LOCAL_CACHE_TTL (seconds).
+    """
+    app.local_cache = None
+    if not get_env_bool("LOCAL_CACHE_ENABLED", False):
+        return
+
+    app.local_cache = LocalCache(
+        max_size=get_env_int("LOCAL_CACHE_MAX_SIZE", 10000),
+        ttl=get_env_float("LOCAL_CACHE_TTL", 60),
+    )
+    _start_cache_listener(app, app.local_cache)
+
+
+def _start_cache_listener(app: Flask, local_cache: LocalCache) -> None:
+    """Subscribe the local cache to the invalidation channel, on a thread that listens for invalidations."""
+
+    def on_listener_error(
+        e: BaseException, pubsub: PubSub, thread: PubSubWorkerThread
+    ) -> None:
+        app.logger.warning(
+            f"Cache invalidation listener failed, clearing local cache: {e}"
+        )
+        local_cache.clear()
+        time.sleep(1)  # back off instead of spinning while Redis is unreachable
+
+    pubsub = Redis.from_url(os.environ["CACHE_URL"]).pubsub(  # type: ignore[no-untyped-call]
+        ignore_subscribe_messages=True
+    )
+    pubsub.subscribe(
+        **{CacheConstants.INVALIDATION_CHANNEL: local_cache.handle_invalidation}
+    )
+    app.cache_listener = pubsub.run_in_thread(
+        sleep_time=1, daemon=True, exception_handler=on_listener_error
+    )
 
 
 def init_exception_handlers(app: Flask) -> None:
     app.register_error_handler(ValidationError, handle_validation_error)
     app.register_error_handler(EntityNotFound, handle_not_found_error)
+    app.register_error_handler(PreconditionFailed, handle_precondition_failed_error)
+    app.register_error_handler(SearchTimeout, handle_search_timeout_error)
     app.register_error_handler(SQLAlchemyError, handle_database_error)
 
 
 def register_teardown_logic(app: Flask) -> None:
-    """Register logic to run when the application context is removed. This will occur when the app shutdowns."""
+    """Register logic to run when the application context is removed, and when the app shuts down.
 
-    @app.teardown_appcontext
-    def cleanup(exc: Optional[Exception] = None) -> None:
+    The application context is removed after every request, so only the request's database session is closed then.
+    Pending cache writes are drained, and the Redis connections closed, when the process exits instead,
+    since the Redis client and its connection pool are shared by concurrent requests.
+    """
+
+    @atexit.register
+    def shutdown() -> None:
+        if hasattr(app, "container"):
+            app.logger.info("Draining pending cache writes")
+            app.container.shutdown()
         if hasattr(app, "cache"):
             app.logger.info("Closing redis connections")
             app.cache.close()
+        for validator in getattr(app, "pool_validators", []):
+            validator.close()
+
+    @app.teardown_appcontext
+    def cleanup(exc: Optional[Exception] = None) -> None:
         if hasattr(app, "session"):
-            app.logger.info("Closing database connections")
             app.session.remove()
+
+
+def prepare_fork(app: Flask) -> None:
+    """
+    Stop the background threads of an app that worker processes are about to be forked from
+    (see gunicorn.conf.py), so no thread holds a lock, or is half-way through using a connection, when a fork
+    copies the process. The app doesn't serve requests in this process, so the threads aren't needed.
+    Called before every fork, so it can be called again once the threads are stopped.
+    """
+    for validator in app.pool_validators:
+        validator.close()
+    if listener := getattr(app, "cache_listener", None):
+        listener.stop()
+        listener.join()
+        del app.cache_listener
+
+
+def init_forked_worker(app: Flask) -> None:
+    """
+    Make a worker process forked from the process the app was created in (see prepare_fork) ready to serve.
+
+    The worker gets pools of its own: the engines' pools and the Redis pool are replaced without closing the
+    connections they hold, which belong to the parent, so no socket is shared by two processes. The pool
+    validators and the cache invalidation listener are started again in the worker.
+    """
+    for engine in [app.db_router.primary, *app.db_router.replicas]:
+        engine.dispose(close=False)
+    app.cache.connection_pool.reset()
+    for validator in app.pool_validators:
+        validator.start()
+    if app.local_cache is not None:
+        # invalidations sent while no listener was subscribed were missed
+        app.local_cache.clear()
+        _start_cache_listener(app, app.local_cache)
@@ -1,14 +1,22 @@
+import threading
 from typing import Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, scoped_session
 from redis import Redis
 
+from src.config.cache_policy import CachePolicy
+from src.repository.cache_codecs import CacheCodec
+from src.repository.address_lookup_cache import AddressLookupCache
 from src.repository.cache_repository import CacheRepository
+from src.repository.cache_writer import CacheWriter, CacheWriterOptions
+from src.repository.local_cache import LocalCache
 from src.repository.address_repository import AddressRepository
 from src.repository.party_history_repository import PartyHistoryRepository
+from src.repository.party_import_repository import PartyImportRepository
 from src.repository.party_repository import PartyRepository
 from src.repository.unit_of_work import UnitOfWork
 from src.service.party_service import PartyService
+from src.util.enums import ServiceEntities
 
 
 class Container:
@@ -22,55 +30,139 @@ class Container:
     Each property attribute of this class validates that an instance of the class it is supposed to return
     is not created. If it is, return it as is. App dependencies are singletons now. This limits outgoing
     DB and Cache connections to one dependency for each connection type respectively.
+
+    Dependencies are created under a lock, since concurrent requests can ask for one that isn't created yet,
+    and each must be created once (ex. the cache writer starts a thread).
+
+    The repositories and the unit of work hold the app's scoped session, not a session. Every call on it is
+    passed on to the session of the current app context (see init_db), so the singletons can be shared by
+    concurrent requests, while each request reads and writes through its own session and transaction.
     """
 
-    def __init__(self, db_session: Session, cache: Redis) -> None:
+    def __init__(
+        self,
+        db_session: scoped_session[Session],
+        cache: Redis,
+        local_cache: LocalCache | None = None,
+        cache_policies: dict[ServiceEntities, CachePolicy] | None = None,
+        cache_codec: CacheCodec | None = None,
+        cache_writer_options: CacheWriterOptions | None = None,
+        address_lookup_local_cache: LocalCache | None = None,
+        address_lookup_ttl: int = 86400,
+        search_timeout_ms: int = 500,
+    ) -> None:
         self._db_session = db_session
         self._cache = cache
+        self._local_cache = local_cache
+        self._cache_policies = cache_policies
+        self._cache_codec = cache_codec
+        self._cache_writer_options = cache_writer_options
+        self._address_lookup_local_cache = address_lookup_local_cache
+        self._address_lookup_ttl = address_lookup_ttl
+        self._search_timeout_ms = search_timeout_ms
         self._cache_repository: Optional[CacheRepository] = None
+        self._cache_writer: Optional[CacheWriter] = None
+        self._address_lookup_cache: Optional[AddressLookupCache] = None
         self._party_repository: Optional[PartyRepository] = None
         self._address_repository: Optional[AddressRepository] = None
         self._party_history_repository: Optional[PartyHistoryRepository] = None
+        self._party_import_repository: Optional[PartyImportRepository] = None
         self._party_service: Optional[PartyService] = None
         self._unit_of_work: Optional[UnitOfWork] = None
+        # reentrant, since creating a dependency gets the ones it depends on
+        self._lock = threading.RLock()
 
     @property
     def cache_repository(self) -> CacheRepository:
-        if not self._cache_repository:
-            self._cache_repository = CacheRepository(self._cache)
-        return self._cache_repository
+        with self._lock:
+            if not self._cache_repository:
+                self._cache_repository = CacheRepository(
+                    self._cache,
+                    self._local_cache,
+                    self._cache_policies,
+                    self._cache_codec,
+                )
+            return self._cache_repository
+
+    @property
+    def cache_writer(self) -> CacheWriter | None:
+        """The write-behind cache writer, or None if cache writes are synchronous."""
+        with self._lock:
+            if not self._cache_writer and self._cache_writer_options:
+                self._cache_writer = CacheWriter(
+                    self.cache_repository, self._cache_writer_options
+                )
+                self._cache_writer.start()
+            return self._cache_writer
+
+    @property
+    def address_lookup_cache(self) -> AddressLookupCache | None:
+        """The address hash to ID cache, or None if addresses are always looked up by hash."""
+        with self._lock:
+            if not self._address_lookup_cache and self._address_lookup_local_cache:
+                self._address_lookup_cache = AddressLookupCache(
+                    self._cache,
+                    self._address_lookup_local_cache,
+                    self._address_lookup_ttl,
+                )
+            return self._address_lookup_cache
 
     @property
     def party_history_repository(self) -> PartyHistoryRepository:
-        if not self._party_history_repository:
-            self._party_history_repository = PartyHistoryRepository(self._db_session)
-        return self._party_history_repository
+        with self._lock:
+            if not self._party_history_repository:
+                self._party_history_repository = PartyHistoryRepository(
+                    self._db_session
+                )
+            return self._party_history_repository
 
     @property
     def party_repository(self) -> PartyRepository:
-        if not self._party_repository:
-            self._party_repository = PartyRepository(self._db_session)
-        return self._party_repository
+        with self._lock:
+            if not self._party_repository:
+                self._party_repository = PartyRepository(self._db_session)
+            return self._party_repository
+
+    @property
+    def party_import_repository(self) -> PartyImportRepository:
+        with self._lock:
+            if not self._party_import_repository:
+                self._party_import_repository = PartyImportRepository(self._db_session)
+            return self._party_import_repository
 
     @property
     def address_repository(self) -> AddressRepository:
-        if not self._address_repository:
-            self._address_repository = AddressRepository(self._db_session)
-        return self._address_repository
+        with self._lock:
+            if not self._address_repository:
+                self._address_repository = AddressRepository(self._db_session)
+            return self._address_repository
 
     @property
     def unit_of_work(self) -> UnitOfWork:
-        if not self._unit_of_work:
-            self._unit_of_work = UnitOfWork(
-                self._db_session,
-                self.party_repository,
-                self.address_repository,
-                self.party_history_repository,
-            )
-        return self._unit_of_work
+        with self._lock:
+            if not self._unit_of_work:
+                self._unit_of_work = UnitOfWork(
+                    self._db_session,
+                    self.party_repository,
+                    self.address_repository,
+                    self.party_history_repository,
+                )
+            return self._unit_of_work
 
     @property
     def party_service(self) -> PartyService:
-        if not self._party_service:
-            self._party_service = PartyService(self.unit_of_work, self.cache_repository)
-        return self._party_service
+        with self._lock:
+            if not self._party_service:
+                self._party_service = PartyService(
+                    self.unit_of_work,
+                    self.cache_repository,
+                    self.cache_writer,
+                    self.address_lookup_cache,
+                    self._search_timeout_ms,
+                )
+            return self._party_service
+
+    def shutdown(self) -> None:
+        """Send the cache writes that are still pending. Called once when the app shuts down."""
+        if self._cache_writer:
+            self._cache_writer.close()
@@ -0,0 +1,123 @@
+import os
+from dataclasses import dataclass
+
+from src.util.enums import PrePing
+from src.util.helpers import get_env_float, get_env_int
+
+
+@dataclass(frozen=True)
+class DatabasePoolProfile:
+    """
+    Connection pool of each database engine (the primary and every read replica).
+
+    pool_size: Connections kept open in the pool.
+    max_overflow: Connections opened on top of pool_size under load, closed when they are returned.
+    pool_timeout: Seconds a checkout waits for a connection before failing.
+    pool_recycle: Seconds after which a connection is replaced when it is checked out, before the server
+    or a load balancer drops it.
+    pre_ping: Whether a connection is pinged on every checkout, which costs a round-trip per unit of work,
+    or idle connections are pinged by a background thread every validation_interval seconds instead.
+    validation_interval: Seconds between background validations of the idle connections.
+    statement_timeout_ms: Milliseconds after which Postgres cancels a statement. 0 disables the timeout.
+    """
+
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_recycle: int = 3600
+    pre_ping: PrePing = PrePing.CHECKOUT
+    validation_interval: float = 30.0
+    statement_timeout_ms: int = 0
+
+
+@dataclass(frozen=True)
+class CachePoolProfile:
+    """
+    Connection pool of the Redis client.
+
+    max_connections: Connections the pool opens at most.
+    pool_timeout: Seconds a command waits for a free connection before failing.
+    socket_timeout: Seconds a command waits for Redis to answer. 0 waits forever.
+    socket_connect_timeout: Seconds a new connection waits to be established. 0 waits forever.
+    health_check_interval: Seconds a connection is idle before it is pinged when it is next used. 0 disables it.
+    """
+
+    max_connections: int = 50
+    pool_timeout: float = 20.0
+    socket_timeout: float = 0.0
+    socket_connect_timeout: float = 0.0
+    health_check_interval: int = 0
+
+
+@dataclass(frozen=True)
+class PoolProfile:
+    database: DatabasePoolProfile
+    cache: CachePoolProfile
+
+
+# Development keeps few connections and waits on them. Production sizes the pools for a worker serving
+# concurrent requests, fails fast when they are exhausted instead of queueing requests behind them,
+# and validates idle connections in the background instead of on every checkout.
+POOL_PROFILES: dict[str, PoolProfile] = {
+    "development": PoolProfile(DatabasePoolProfile(), CachePoolProfile()),
+    "production": PoolProfile(
+        DatabasePoolProfile(
+            pool_size=10,
+            max_overflow=5,
+            pool_timeout=5.0,
+            pool_recycle=1800,
+            pre_ping=PrePing.BACKGROUND,
+            statement_timeout_ms=5000,
+        ),
+        CachePoolProfile(
+            max_connections=64,
+            pool_timeout=1.0,
+            socket_timeout=0.5,
+            socket_connect_timeout=0.5,
+            health_check_interval=30,
+        ),
+    ),
+}
+
+
+def load_pool_profile() -> PoolProfile:
+    """
+    Build the pool profile of the environment named by POOL_PROFILE ("development" by default),
+    with each setting overridden by its environment variable:
+    DATABASE_POOL_SIZE, DATABASE_MAX_OVERFLOW, DATABASE_POOL_TIMEOUT, DATABASE_POOL_RECYCLE, DATABASE_PRE_PING
+    ("checkout" or "background"), DATABASE_VALIDATION_INTERVAL, DATABASE_STATEMENT_TIMEOUT_MS,
+    CACHE_MAX_CONNECTIONS, CACHE_POOL_TIMEOUT, CACHE_SOCKET_TIMEOUT, CACHE_SOCKET_CONNECT_TIMEOUT,
+    CACHE_HEALTH_CHECK_INTERVAL.
+    """
+    name = os.getenv("POOL_PROFILE", "development")
+    if name not in POOL_PROFILES:
+        raise Exception(
+            f"App failed to start because POOL_PROFILE '{name}' is not one of {', '.join(POOL_PROFILES)}"
+        )
+    database, cache = POOL_PROFILES[name].database, POOL_PROFILES[name].cache
+    return PoolProfile(
+        DatabasePoolProfile(
+            pool_size=get_env_int("DATABASE_POOL_SIZE", database.pool_size),
+            max_overflow=get_env_int("DATABASE_MAX_OVERFLOW", database.max_overflow),
+            pool_timeout=get_env_float("DATABASE_POOL_TIMEOUT", database.pool_timeout),
+            pool_recycle=get_env_int("DATABASE_POOL_RECYCLE", database.pool_recycle),
+            pre_ping=PrePing(os.getenv("DATABASE_PRE_PING", database.pre_ping.value)),
+            validation_interval=get_env_float(
+                "DATABASE_VALIDATION_INTERVAL", database.validation_interval
+            ),
+            statement_timeout_ms=get_env_int(
+                "DATABASE_STATEMENT_TIMEOUT_MS", database.statement_timeout_ms
+            ),
+        ),
+        CachePoolProfile(
+            max_connections=get_env_int("CACHE_MAX_CONNECTIONS", cache.max_connections),
+            pool_timeout=get_env_float("CACHE_POOL_TIMEOUT", cache.pool_timeout),
+            socket_timeout=get_env_float("CACHE_SOCKET_TIMEOUT", cache.socket_timeout),
+            socket_connect_timeout=get_env_float(
+                "CACHE_SOCKET_CONNECT_TIMEOUT", cache.socket_connect_timeout
+            ),
+            health_check_interval=get_env_int(
+                "CACHE_HEALTH_CHECK_INTERVAL", cache.health_check_interval
+            ),
+        ),
+    )
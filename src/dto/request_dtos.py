@@ -2,10 +2,11 @@ from datetime import datetime
 from typing import Annotated, TYPE_CHECKING, Any
 from pydantic import BaseModel, ConfigDict, EmailStr, field_validator
 from pydantic.alias_generators import to_camel
-from pydantic import Field, AfterValidator
+from pydantic import Field, AfterValidator, BeforeValidator
 from pydantic_core.core_schema import ValidationInfo
 
 from src.util.enums import USState
+from src.util.helpers import decode_cursor
 import hashlib
 
 
@@ -55,6 +56,7 @@ PostalType = Annotated[
 CountryType = Annotated[
     str, Field(min_length=3, max_length=3), AfterValidator(country_validator)
 ]
+CursorType = Annotated[dict[str, Any], BeforeValidator(decode_cursor)]
 
 
 class CustomBaseModel(BaseModel):
@@ -171,3 +173,93 @@ class PartyUpdate(CustomBaseModel):
         if v is None:
             raise ValueError(f"{info.field_name} cannot be null when provided")
         return v
+
+
+class PartyBatchGet(CustomBaseModel):
+    """
+    During a batch GET request, validates the list of Party IDs to retrieve.
+    The number of IDs is capped so a single request can't load an unbounded number of rows.
+    """
+
+    ids: list[int] = Field(min_length=1, max_length=500)
+
+
+class PartyBatchCreate(CustomBaseModel):
+    """
+    During a batch create request, validates the list of Parties to create.
+    Each Party is validated against PartyCreate on its own (see PartyService.add_parties),
+    so an invalid Party is reported individually instead of failing validation of the whole request.
+
+    If atomic, either every Party is created or none is. Otherwise, the valid Parties are created
+    even if others are invalid.
+    """
+
+    parties: list[dict[str, Any]] = Field(min_length=1, max_length=1000)
+    atomic: bool = True
+
+
+class PartyExport(CustomBaseModel):
+    """
+    During an export request, validates the query parameters.
+    Only Parties updated at or after updated_since are exported, if provided.
+    """
+
+    updated_since: datetime | None = None
+
+
+class PartyList(CustomBaseModel):
+    """
+    During a list request, validates the query parameters: the filters, and the page to return.
+    Filters are exact matches, and are combined with AND.
+
+    Pages are ordered by ID, or by update time and ID if filtered by updated_since. The cursor is the opaque
+    sort key of the last Party of the previous page (see nextCursor), so it must be used with the same ordering.
+    """
+
+    last_name: GeneralStringType | None = None
+    email: EmailStr | None = None
+    postal_code: PostalType | None = None
+    state: StateType | None = None
+    updated_since: datetime | None = None
+    cursor: CursorType | None = None
+    limit: int = Field(default=50, ge=1, le=200)
+
+    @field_validator("cursor")
+    @classmethod
+    def check_cursor_matches_order(
+        cls, v: dict[str, Any] | None, info: ValidationInfo[Any]
+    ) -> dict[str, Any] | None:
+        """Check that the cursor was created for the ordering of the request, and parse its update time if any."""
+        if v is None:
+            return v
+        if (info.data.get("updated_since") is None) == ("updatedAt" in v):
+            raise ValueError(
+                f"{info.field_name} was created for a different ordering, restart from the first page"
+            )
+        if "updatedAt" in v:
+            try:
+                return {**v, "updatedAt": datetime.fromisoformat(v["updatedAt"])}
+            except (TypeError, ValueError):
+                raise ValueError(f"{info.field_name} is not a valid page cursor")
+        return v
+
+
+class PartySearch(CustomBaseModel):
+    """
+    During a search request, validates the query parameters.
+    Every word of the query is matched on its own, so words shorter than three characters are rejected,
+    since they have no trigram to search the indexes with.
+    """
+
+    q: str = Field(min_length=3, max_length=100)
+    limit: int = Field(default=20, ge=1, le=50)
+
+    @field_validator("q")
+    @classmethod
+    def check_has_words(cls, v: str, info: ValidationInfo[Any]) -> str:
+        words = v.split()
+        if not words or any(len(word) < 3 for word in words):
+            raise ValueError(
+                f"every word of {info.field_name} must have at least 3 characters"
+            )
+        return " ".join(words)
@@ -0,0 +1,56 @@
+import logging
+from http import HTTPStatus
+from typing import Any
+
+from quart import request
+from sqlalchemy.exc import SQLAlchemyError
+from pydantic import ValidationError
+
+from src.util import helpers
+from src.exception.custom_exceptions import ErrorDTO, EntityNotFound
+
+logger = logging.getLogger(__name__)
+
+
+async def handle_validation_error(e: ValidationError) -> tuple[dict[str, Any], int]:
+    """Handle validation errors that occur during Pydantic model validation, like handle_validation_error."""
+
+    logger.error(
+        f"The request failed due to the following validation error(s): {e.json(indent=4)}"
+    )
+
+    error_dto = ErrorDTO(
+        status=HTTPStatus.UNPROCESSABLE_ENTITY.value,
+        title=HTTPStatus.UNPROCESSABLE_ENTITY.phrase,
+        detail="Request validation failed",
+        instance=request.path,
+    ).to_dict(validation_errors=helpers.to_validation_errors(e))
+
+    return error_dto, 422
+
+
+async def handle_database_error(e: SQLAlchemyError) -> tuple[dict[str, Any], int]:
+    """Handle database errors that occur during the request, like handle_database_error."""
+
+    logger.exception(f"The request failed due to the following database error: {e}")
+    error_dto = ErrorDTO(
+        status=HTTPStatus.INTERNAL_SERVER_ERROR.value,
+        title=HTTPStatus.INTERNAL_SERVER_ERROR.phrase,
+        detail="An unexpected error occurred processing request.",
+        instance=request.path,
+    ).to_dict()
+
+    return error_dto, 500
+
+
+async def handle_not_found_error(e: EntityNotFound) -> tuple[dict[str, Any], int]:
+    """Handles errors when the entity was not found and one was expected to be there, like handle_not_found_error."""
+    logger.exception(str(e))
+    error_dto = ErrorDTO(
+        status=HTTPStatus.NOT_FOUND.value,
+        title=HTTPStatus.NOT_FOUND.phrase,
+        detail=str(e),
+        instance=request.path,
+    ).to_dict()
+
+    return error_dto, 404
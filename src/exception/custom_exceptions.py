@@ -35,3 +35,30 @@ class EntityNotFound(Exception):
         self.entity_name = entity_name.value.capitalize()
         self.entity_id = entity_id
         super().__init__(f"{self.entity_name} with ID {entity_id} was not found.")
+
+
+class PreconditionFailed(Exception):
+    """
+    Custom exception raised when a conditional request (ex. If-Match) doesn't match the current state of the entity,
+    meaning the client is about to overwrite changes it hasn't seen.
+    """
+
+    def __init__(self, entity_name: ServiceEntities, entity_id: int) -> None:
+        self.entity_name = entity_name.value.capitalize()
+        self.entity_id = entity_id
+        super().__init__(
+            f"{self.entity_name} with ID {entity_id} was modified since it was retrieved."
+        )
+
+
+class SearchTimeout(Exception):
+    """
+    Custom exception raised when a search was cancelled because it ran longer than its statement timeout,
+    usually because the query matches too many rows to rank.
+    """
+
+    def __init__(self, timeout_ms: int) -> None:
+        self.timeout_ms = timeout_ms
+        super().__init__(
+            f"Search did not finish within {timeout_ms}ms. Try a longer or more specific query."
+        )
@@ -5,7 +5,13 @@ from flask import Response, jsonify, request
 from sqlalchemy.exc import SQLAlchemyError
 from pydantic import ValidationError
 
-from src.exception.custom_exceptions import ErrorDTO, EntityNotFound
+from src.util import helpers
+from src.exception.custom_exceptions import (
+    ErrorDTO,
+    EntityNotFound,
+    PreconditionFailed,
+    SearchTimeout,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -17,32 +23,12 @@ def handle_validation_error(e: ValidationError) -> tuple[Response, int]:
         f"The request failed due to the following validation error(s): {e.json(indent=4)}"
     )
 
-    validation_errors = []
-    for error in e.errors():
-        field = ".".join(str(loc) for loc in error["loc"])
-
-        # Try to get custom error message from ctx, otherwise use default msg
-        if "ctx" in error and "error" in error["ctx"]:
-            # in the error[ctx][error] value, the field name is snake case
-            # ex. "first_name cannot be null when provided"
-            # I use camel case for this API, so it may be confusing to consumers having a snake case field
-            # in the error response message, so remove that snake cased field, and we already define the field
-            # in the field key using the field variables anyways (see .append() call).
-            delimiter = " "
-            str_list = str(error["ctx"]["error"]).split(delimiter)
-            del str_list[0]
-            message = delimiter.join(str_list).capitalize()
-        else:
-            message = error["msg"]
-
-        validation_errors.append({"field": field, "message": message})
-
     error_dto = ErrorDTO(
         status=HTTPStatus.UNPROCESSABLE_ENTITY.value,
         title=HTTPStatus.UNPROCESSABLE_ENTITY.phrase,
         detail="Request validation failed",
         instance=request.path,
-    ).to_dict(validation_errors=validation_errors)
+    ).to_dict(validation_errors=helpers.to_validation_errors(e))
 
     return jsonify(error_dto), 422
 
@@ -72,3 +58,29 @@ def handle_not_found_error(e: EntityNotFound) -> tuple[Response, int]:
     ).to_dict()
 
     return jsonify(error_dto), 404
+
+
+def handle_precondition_failed_error(e: PreconditionFailed) -> tuple[Response, int]:
+    """Handles conditional requests whose precondition doesn't match the current state of the entity."""
+    logger.warning(str(e))
+    error_dto = ErrorDTO(
+        status=HTTPStatus.PRECONDITION_FAILED.value,
+        title=HTTPStatus.PRECONDITION_FAILED.phrase,
+        detail=str(e),
+        instance=request.path,
+    ).to_dict()
+
+    return jsonify(error_dto), 412
+
+
+def handle_search_timeout_error(e: SearchTimeout) -> tuple[Response, int]:
+    """Handles searches cancelled by their statement timeout. The search may succeed if it is narrowed or retried."""
+    logger.warning(str(e))
+    error_dto = ErrorDTO(
+        status=HTTPStatus.SERVICE_UNAVAILABLE.value,
+        title=HTTPStatus.SERVICE_UNAVAILABLE.phrase,
+        detail=str(e),
+        instance=request.path,
+    ).to_dict()
+
+    return jsonify(error_dto), 503
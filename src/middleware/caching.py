@@ -1,43 +1,259 @@
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from functools import wraps
 from typing import Callable, Any
+import json
 import logging
+import threading
+import time
 from redis import RedisError
+from redis.exceptions import LockError
+from src.repository.cache_repository import CacheRepository
 from src.util.enums import ServiceEntities
+from flask import Flask, Response, request
 from flask.globals import current_app
-from src.util.custom_types import PartyResponseTuple
+from src.util import helpers
+from src.util.custom_types import CachedViewResponse
 
 logger = logging.getLogger(__name__)
 
+# How often a request waiting on another worker's rebuild checks the cache again.
+_POLL_INTERVAL = 0.05
+
+
+class KeyedLock:
+    """In-process lock per key. Locks are created on first use and discarded once no thread holds or waits on them."""
+
+    def __init__(self) -> None:
+        self._guard = threading.Lock()
+        self._locks: dict[str, tuple[threading.Lock, int]] = {}
+
+    @contextmanager
+    def hold(self, key: str) -> Iterator[None]:
+        with self._guard:
+            lock, users = self._locks.get(key, (threading.Lock(), 0))
+            self._locks[key] = (lock, users + 1)
+        try:
+            with lock:
+                yield
+        finally:
+            with self._guard:
+                lock, users = self._locks[key]
+                if users == 1:
+                    del self._locks[key]
+                else:
+                    self._locks[key] = (lock, users - 1)
+
+
+_rebuild_locks = KeyedLock()
+
+# Entries that are about to expire are recomputed here, off the request thread.
+_refresh_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-refresh")
+_refreshing: set[str] = set()
+_refreshing_guard = threading.Lock()
+
 
 def cache_read(
-    entity_type: ServiceEntities,
+    entity_type: ServiceEntities, raw: bool = False
 ) -> Callable[
-    [Callable[[Any, int], PartyResponseTuple]], Callable[[Any, int], PartyResponseTuple]
+    [Callable[[Any, int], CachedViewResponse]], Callable[[Any, int], CachedViewResponse]
 ]:
-    """Returns a decorator that checks the cache for an entity via the provided ID."""
+    """Returns a decorator that checks the cache for an entity via the provided ID.
+
+    In raw mode, a cache hit returns the stored JSON bytes directly as the response body, without decoding them.
+    Raw responses carry a strong ETag of the body, and a request whose If-None-Match matches it
+    is answered with a 304 and no body (see _make_conditional).
+
+    If the entity's cache policy enables single-flight, concurrent misses for the same ID are collapsed
+    so only one request loads the entity (see _load_single_flight).
+
+    A hit on an entry that is about to expire is still served from the cache,
+    while the entity is reloaded in the background (see _refresh_in_background).
+    """
 
     def decorator(
-        func: Callable[[Any, int], PartyResponseTuple],
-    ) -> Callable[[Any, int], PartyResponseTuple]:
+        func: Callable[[Any, int], CachedViewResponse],
+    ) -> Callable[[Any, int], CachedViewResponse]:
         @wraps(func)
-        def wrapper(self: Any, id: int) -> PartyResponseTuple:
+        def wrapper(self: Any, id: int) -> CachedViewResponse:
             entity = entity_type.value
             cache_repo = current_app.container.cache_repository
             logger.debug(f"Getting {entity} with ID: {id} from cache.")
-            cached = None
 
-            try:
-                cached = cache_repo.get(id, entity_type)
-            except RedisError as e:
-                logger.warning(
-                    f"Could not get {entity} with ID {id} due to Redis Error: {e}"
-                )
-            if cached:
+            if cached := _get_from_cache(
+                cache_repo,
+                id,
+                entity_type,
+                raw,
+                on_early_expiry=lambda: _refresh_in_background(
+                    cache_repo, id, entity_type, lambda: func(self, id)
+                ),
+            ):
                 logger.debug(f"Cache hit for {entity} with ID {id}.")
-                return cached, 200
+                return _to_response(cached)
             logger.debug(f"Cache miss for {entity} with ID {id}.")
-            return func(self, id)
+
+            if cache_repo.policy(entity_type).single_flight:
+                return _make_conditional(
+                    _load_single_flight(
+                        cache_repo, id, entity_type, raw, lambda: func(self, id)
+                    )
+                )
+            return _make_conditional(func(self, id))
 
         return wrapper
 
     return decorator
+
+
+def _get_from_cache(
+    cache_repo: CacheRepository,
+    id: int,
+    entity_type: ServiceEntities,
+    raw: bool,
+    on_early_expiry: Callable[[], None] | None = None,
+) -> dict[str, Any] | bytes | None:
+    """
+    Get the entity from the cache, as JSON bytes in raw mode. A Redis error is treated as a miss.
+    If the entry should be refreshed before it expires, on_early_expiry is called.
+    """
+    try:
+        body, refresh = cache_repo.lookup(id, entity_type)
+    except RedisError as e:
+        logger.warning(
+            f"Could not get {entity_type.value} with ID {id} due to Redis Error: {e}"
+        )
+        return None
+
+    if refresh and on_early_expiry:
+        on_early_expiry()
+    if body is None or raw:
+        return body
+    decoded: dict[str, Any] = json.loads(body)
+    return decoded
+
+
+def _refresh_in_background(
+    cache_repo: CacheRepository,
+    id: int,
+    entity_type: ServiceEntities,
+    load: Callable[[], CachedViewResponse],
+) -> None:
+    """
+    Reload an entity that is about to expire on a background thread. Loading it writes it back to the cache.
+    A refresh is skipped if one is already running for the key in this worker,
+    or if another worker holds the rebuild lock.
+    """
+    key = f"{entity_type.value}:{id}"
+    with _refreshing_guard:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+    logger.debug(f"Refreshing {entity_type.value} with ID {id} before it expires.")
+    app = current_app._get_current_object()
+    _refresh_pool.submit(_refresh, app, cache_repo, id, entity_type, load, key)
+
+
+def _refresh(
+    app: Flask,
+    cache_repo: CacheRepository,
+    id: int,
+    entity_type: ServiceEntities,
+    load: Callable[[], CachedViewResponse],
+    key: str,
+) -> None:
+    try:
+        with app.app_context():
+            lock = cache_repo.lock(id, entity_type)
+            if not lock.acquire():
+                return
+            try:
+                load()
+            finally:
+                try:
+                    lock.release()
+                except (LockError, RedisError):
+                    pass  # the lock expires on its own
+    except Exception as e:
+        # the cached entry was already served, and it still expires as usual
+        logger.warning(f"Could not refresh {entity_type.value} with ID {id}: {e}")
+    finally:
+        with _refreshing_guard:
+            _refreshing.discard(key)
+
+
+def _to_response(cached: dict[str, Any] | bytes) -> CachedViewResponse:
+    """Cached JSON bytes are sent as the response body as is. Decoded entities are serialized by Flask."""
+    if isinstance(cached, bytes):
+        return _make_conditional(Response(cached, 200, mimetype="application/json"))
+    return cached, 200
+
+
+def _make_conditional(response: CachedViewResponse) -> CachedViewResponse:
+    """
+    Tag a JSON bytes response with the ETag of its body, and turn it into a 304 if the request's
+    If-None-Match matches. The body is hashed as is, it is never decoded.
+    """
+    if not isinstance(response, Response) or response.status_code != 200:
+        return response
+    if "ETag" not in response.headers:
+        response.set_etag(helpers.etag(response.get_data()))
+    # the request proxy is falsy outside of a request
+    if request:
+        response.make_conditional(request)
+    return response
+
+
+def _load_single_flight(
+    cache_repo: CacheRepository,
+    id: int,
+    entity_type: ServiceEntities,
+    raw: bool,
+    load: Callable[[], CachedViewResponse],
+) -> CachedViewResponse:
+    """
+    Rebuild a missing cache entry so that only one request per key loads it from the database.
+
+    Within this worker, threads missing on the same key queue on an in-process lock. Once a thread gets it,
+    the cache is checked again, since the thread before it has most likely just rebuilt the entry.
+    Across workers, a short Redis lock elects the rebuilding request. Requests that lose the election
+    poll the cache until the policy's lock wait elapses, then load the entity themselves
+    so a slow or failed rebuild never blocks a request for long. If Redis is unavailable, the entity is loaded directly.
+    """
+    entity = entity_type.value
+    policy = cache_repo.policy(entity_type)
+
+    with _rebuild_locks.hold(f"{entity}:{id}"):
+        if cached := _get_from_cache(cache_repo, id, entity_type, raw):
+            logger.debug(f"{entity} with ID {id} was rebuilt by another request.")
+            return _to_response(cached)
+
+        lock = cache_repo.lock(id, entity_type)
+        try:
+            acquired = lock.acquire()
+        except RedisError as e:
+            logger.warning(
+                f"Could not lock {entity} with ID {id} due to Redis Error: {e}"
+            )
+            return load()
+
+        if acquired:
+            try:
+                return load()
+            finally:
+                try:
+                    lock.release()
+                except (LockError, RedisError) as e:
+                    # the lock expires on its own
+                    logger.debug(f"Could not release lock for {entity} {id}: {e}")
+
+        logger.debug(f"Waiting for another worker to rebuild {entity} with ID {id}.")
+        deadline = time.monotonic() + policy.lock_wait
+        while time.monotonic() < deadline:
+            time.sleep(_POLL_INTERVAL)
+            if cached := _get_from_cache(cache_repo, id, entity_type, raw):
+                return _to_response(cached)
+
+        logger.debug(f"Timed out waiting for {entity} with ID {id}, loading it.")
+        return load()
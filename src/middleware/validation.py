@@ -3,24 +3,24 @@ from typing import TypeVar, ParamSpec, Type, Callable
 from flask import request
 from pydantic import BaseModel
 import logging
-from src.util.custom_types import PartyResponseTuple
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T", bound=BaseModel)
+R = TypeVar("R")
 P = ParamSpec("P")
 
 
 def validate_request(
     model: Type[T],
-) -> Callable[[Callable[..., PartyResponseTuple]], Callable[P, PartyResponseTuple]]:
+) -> Callable[[Callable[..., R]], Callable[P, R]]:
     """Returns a decorator that validates the request payload against the provided pydantic model."""
 
     def decorator(
-        func: Callable[..., PartyResponseTuple],
-    ) -> Callable[P, PartyResponseTuple]:
+        func: Callable[..., R],
+    ) -> Callable[P, R]:
         @wraps(func)
-        def wrapper(*args: P.args, **kwargs: P.kwargs) -> PartyResponseTuple:
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
             logger.debug("Validating request.")
             return func(*args, model(**request.json), **kwargs)
 
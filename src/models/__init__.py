@@ -1,3 +1,4 @@
 from src.models.address import Address as Address
 from src.models.party import Party as Party
 from src.models.party_history import PartyHistory as PartyHistory
+from src.models.import_checkpoint import ImportCheckpoint as ImportCheckpoint
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import String, Text
+from sqlalchemy import Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.models.base import Base
@@ -13,17 +13,22 @@ class Address(Base):
     """Represents a row from party_service.address
 
     This table stores address information.
+
+    The postal code and state indexes serve the address filters of the party list endpoint.
     """
 
     __tablename__ = "address"
-    __table_args__ = {"schema": "party_service"}
+    __table_args__ = (
+        Index("ix_party_service_address_state_postal_code", "state", "postal_code"),
+        {"schema": "party_service"},
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     street_one: Mapped[str] = mapped_column(String(50))
     street_two: Mapped[Optional[str]] = mapped_column(String(50), default=None)
     city: Mapped[str] = mapped_column(String(50))
     state: Mapped[str] = mapped_column(String(2))
-    postal_code: Mapped[str] = mapped_column(String(10))
+    postal_code: Mapped[str] = mapped_column(String(10), index=True)
     country: Mapped[str] = mapped_column(String(3))
-    hash: Mapped[str] = mapped_column(Text)
+    hash: Mapped[str] = mapped_column(Text, index=True, unique=True)
     parties: Mapped[List["Party"]] = relationship(back_populates="address")
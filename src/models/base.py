@@ -8,8 +8,13 @@ class Base(DeclarativeBase):
     """Base class with common audit fields
 
     Should be inherited by all other SQLAlchemy models.
+
+    Server generated values (the audit timestamps) are fetched with RETURNING in the same statement
+    that inserts or updates a row, instead of being expired and loaded with a SELECT when they are next read.
     """
 
+    __mapper_args__ = {"eager_defaults": True}
+
     created_at: Mapped[datetime] = mapped_column(server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
         server_default=func.now(), onupdate=func.now()
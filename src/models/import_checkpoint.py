@@ -0,0 +1,18 @@
+from sqlalchemy import BigInteger, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+
+
+class ImportCheckpoint(Base):
+    """Represents a row from party_service.import_checkpoint
+
+    This table stores how far a bulk import has progressed, so an interrupted import can be resumed.
+    It is updated in the same transaction as the rows it covers.
+    """
+
+    __tablename__ = "import_checkpoint"
+    __table_args__ = {"schema": "party_service"}
+
+    job: Mapped[str] = mapped_column(Text, primary_key=True)
+    line: Mapped[int] = mapped_column(BigInteger)
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.models.base import Base
@@ -14,10 +14,29 @@ class Party(Base):
     """Represents a row from party_service.party
 
     This table stores party contact information.
+
+    The composite indexes serve the filters of the party list endpoint, each ending with the page's sort key,
+    so a filtered page is read in order from one index range (see PartyRepository.get_page).
+    The trigram indexes serve substring searches of names and emails (see PartyRepository.search).
     """
 
     __tablename__ = "party"
-    __table_args__ = {"schema": "party_service"}
+    __table_args__ = (
+        Index("ix_party_service_party_last_name_id", "last_name", "id"),
+        Index("ix_party_service_party_email_id", "email", "id"),
+        Index("ix_party_service_party_updated_at_id", "updated_at", "id"),
+        Index("ix_party_service_party_address_id_id", "address_id", "id"),
+        *(
+            Index(
+                f"ix_party_service_party_{column}_trgm",
+                column,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            )
+            for column in ("first_name", "last_name", "email")
+        ),
+        {"schema": "party_service"},
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     first_name: Mapped[str] = mapped_column(String(100))
@@ -0,0 +1,61 @@
+from typing import Any
+
+from redis import Redis
+
+from src.repository.local_cache import LocalCache
+from src.util.constants import AppConstants
+
+
+class AddressLookupCache:
+    """Maps address hashes to address IDs, so finding an existing address doesn't need a query by hash.
+
+    A bounded, in-process LRU sits in front of Redis. Addresses are never changed in place (a changed address
+    is a new row with a new hash), so a mapping can only become wrong if its address is deleted or merged
+    into another one. Callers therefore treat a cached ID as a hint: the address is loaded by ID, and if it no longer
+    exists the mapping is deleted and the address is looked up by hash instead.
+    Code that deletes or merges addresses should also delete their hashes here.
+    """
+
+    def __init__(self, cache: Redis, local_cache: LocalCache, ttl: int) -> None:
+        """
+        :param cache: The Redis client.
+        :param local_cache: The in-process LRU, used only for address hashes.
+        :param ttl: Seconds a mapping is kept in Redis.
+        """
+        self._cache = cache
+        self._local_cache = local_cache
+        self._ttl = ttl
+
+    def get(self, address_hash: str) -> int | None:
+        """Get the ID of the address with the hash, or None if it isn't cached."""
+        if (address_id := self._local_cache.get(address_hash)) is not None:
+            return int(address_id)
+
+        stored = self._cache.get(self._generate_key(address_hash))
+        if not isinstance(stored, bytes):
+            return None
+        address_id = int(stored)
+        self._local_cache.set(address_hash, address_id)
+        return address_id
+
+    def add(self, address_hash: str, address_id: int) -> None:
+        """Remember the ID of the address with the hash."""
+        self._local_cache.set(address_hash, address_id)
+        self._cache.set(
+            self._generate_key(address_hash),
+            str(address_id).encode("ascii"),
+            ex=self._ttl,
+        )
+
+    def delete(self, address_hash: str) -> None:
+        """Forget the address with the hash, ex. because it was deleted or merged into another address."""
+        self._local_cache.delete(address_hash)
+        self._cache.delete(self._generate_key(address_hash))
+
+    def stats(self) -> dict[str, Any]:
+        """Counters of the in-process LRU."""
+        return self._local_cache.stats()
+
+    @staticmethod
+    def _generate_key(address_hash: str) -> str:
+        return f"{AppConstants.APP_NAME}:address-hash:{address_hash}"
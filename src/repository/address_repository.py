@@ -1,17 +1,105 @@
-from sqlalchemy.orm import Session
+from typing import Any, Sequence
+
+from sqlalchemy import inspect
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.sql import select
+from sqlalchemy.sql.selectable import ExecutableReturnsRows
 
 from src.repository.base_repository import BaseRepository
 from src.models.address import Address
+from src.util.custom_types import DatabaseSession
 
 
 class AddressRepository(BaseRepository[Address]):
     """Data access layer for address entities."""
 
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: DatabaseSession) -> None:
         super().__init__(session, Address)
 
     def get_by_hash(self, address_hash: str) -> Address | None:
         return self._session.execute(
             select(Address).where(Address.hash == address_hash)
         ).scalar()
+
+    def get_or_create(self, address: Address) -> Address:
+        """
+        Get the stored address with the same hash as the given one, inserting the given address if there is none.
+
+        The address is resolved in one statement: an INSERT ... ON CONFLICT (hash) DO NOTHING RETURNING,
+        combined with a SELECT by hash for when the address already exists. Concurrent requests creating
+        the same address can't create a duplicate, because of the unique index on hash.
+        If another transaction inserts the same address while this statement runs, the statement waits for it
+        and returns nothing, because the SELECT can't see rows committed after the statement started.
+        The address is then selected again.
+        """
+        stored = self._session.scalars(_get_or_create_statement(address)).first()
+        if stored is None:
+            stored = self._session.scalars(
+                select(Address).where(Address.hash == address.hash)
+            ).one()
+        return stored
+
+    def get_or_create_many(self, addresses: Sequence[Address]) -> dict[str, Address]:
+        """
+        Same as get_or_create for multiple addresses with distinct hashes, keyed by hash.
+
+        Existing addresses are selected with one IN query, and the others are inserted with one multi-row
+        INSERT ... ON CONFLICT (hash) DO NOTHING RETURNING. Addresses inserted by another transaction
+        in the meantime are selected again afterward.
+
+        The rows are inserted in the order of their hashes, so two transactions inserting some of the same
+        addresses lock their hashes in the same order, and the second waits for the first instead of deadlocking.
+        """
+        hashes = [address.hash for address in addresses]
+        stored = self._get_by_hashes(hashes)
+
+        if missing := sorted(
+            (address for address in addresses if address.hash not in stored),
+            key=lambda address: address.hash,
+        ):
+            rows = [_column_values(address) for address in missing]
+            # every row of a multi-row INSERT has the same columns, ex. street_two is set on some addresses only
+            keys: set[str] = set().union(*rows)
+            statement = (
+                insert(Address)
+                .values([{key: row.get(key) for key in keys} for row in rows])
+                .on_conflict_do_nothing(index_elements=[Address.hash])
+                .returning(Address)
+            )
+            stored.update(
+                (address.hash, address) for address in self._session.scalars(statement)
+            )
+        if conflicted := [hash for hash in hashes if hash not in stored]:
+            stored.update(self._get_by_hashes(conflicted))
+        return stored
+
+    def _get_by_hashes(self, hashes: Sequence[str]) -> dict[str, Address]:
+        addresses = self._session.scalars(
+            select(Address).where(Address.hash.in_(hashes))
+        )
+        return {address.hash: address for address in addresses}
+
+
+def _get_or_create_statement(address: Address) -> ExecutableReturnsRows:
+    """The statement of get_or_create, which returns the stored address, or the given one once it's inserted."""
+    columns = Address.__table__.c
+    inserted = (
+        insert(Address)
+        .values(**_column_values(address))
+        .on_conflict_do_nothing(index_elements=[Address.hash])
+        .returning(*columns)
+        .cte("inserted")
+    )
+    existing = select(*columns).where(Address.hash == address.hash)
+    return select(Address).from_statement(
+        select(*inserted.c).union_all(existing).limit(1)
+    )
+
+
+def _column_values(address: Address) -> dict[str, Any]:
+    """The column values set on a new address, leaving out the ones generated by the database."""
+    return {
+        attr.key: value
+        for attr in inspect(Address).column_attrs
+        if (value := getattr(address, attr.key)) is not None
+    }
@@ -0,0 +1,31 @@
+from sqlalchemy.sql import select
+
+from src.repository.address_repository import _get_or_create_statement
+from src.repository.async_base_repository import (
+    AsyncBaseRepository,
+    AsyncDatabaseSession,
+)
+from src.models.address import Address
+
+
+class AsyncAddressRepository(AsyncBaseRepository[Address]):
+    """Data access layer for address entities, for the async stack."""
+
+    def __init__(self, session: AsyncDatabaseSession) -> None:
+        super().__init__(session, Address)
+
+    async def get_or_create(self, address: Address) -> Address:
+        """
+        Get the stored address with the same hash as the given one, inserting the given address if there is none,
+        with the same statement as AddressRepository.get_or_create.
+        """
+        stored = (
+            await self._session.scalars(_get_or_create_statement(address))
+        ).first()
+        if stored is None:
+            stored = (
+                await self._session.scalars(
+                    select(Address).where(Address.hash == address.hash)
+                )
+            ).one()
+        return stored
@@ -0,0 +1,30 @@
+from typing import Iterable, TypeVar, Generic, Type
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session
+
+T = TypeVar("T")
+
+# An async session, or the async app's scoped session, which proxies to the session of the current request
+AsyncDatabaseSession = AsyncSession | async_scoped_session[AsyncSession]
+
+
+class AsyncBaseRepository(Generic[T]):
+    """Same as BaseRepository, for the async stack.
+
+    Entities are only added to the session, so adding them doesn't need to be awaited.
+    Anything that may query the database is a coroutine.
+    """
+
+    def __init__(self, session: AsyncDatabaseSession, clazz: Type[T]) -> None:
+        self._session = session
+        self._clazz = clazz
+
+    def add(self, entity: T) -> None:
+        self._session.add(entity)
+
+    def add_all(self, entities: Iterable[T]) -> None:
+        """Add multiple entities. They are inserted with multi-row INSERTs when the session flushes."""
+        self._session.add_all(entities)
+
+    async def get_by_id(self, id: int) -> T:
+        return await self._session.get_one(self._clazz, id)
@@ -0,0 +1,195 @@
+from redis.asyncio import Redis
+from typing import Any, Sequence
+from src.config.cache_policy import CachePolicy
+from src.repository.cache_codecs import CacheCodec
+from src.repository.cache_repository import (
+    _GET_WITH_REFERENCE,
+    _REFERENCES,
+    BaseCacheRepository,
+    CacheLookup,
+)
+from src.util.constants import CacheConstants
+from src.exception.custom_exceptions import EntityNotFound
+from src.util.enums import ServiceEntities
+
+
+class AsyncCacheRepository(BaseCacheRepository):
+    """Same as CacheRepository, for the async stack, on a redis.asyncio client.
+
+    Entries are stored in the same format as CacheRepository's, so the sync and async stacks share the cache.
+    There is no local cache tier, since the async app doesn't listen for invalidations.
+    """
+
+    def __init__(
+        self,
+        cache: Redis,
+        policies: dict[ServiceEntities, CachePolicy] | None = None,
+        codec: CacheCodec | None = None,
+    ) -> None:
+        super().__init__(policies, codec)
+        self._cache = cache
+        self._get_with_reference = cache.register_script(_GET_WITH_REFERENCE)
+
+    async def add(
+        self,
+        id: int,
+        entity: ServiceEntities,
+        value: Any,
+        invalidate: bool = False,
+        compute_time: float = 0.0,
+    ) -> None:
+        """
+        Add an entity to the cache (see CacheRepository.add).
+        :param id: The unique identifier (ex. primary key) for the entity.
+        :param entity: An enum identifying the entity being stored.
+        :param value: The attributes of the entity, or the entity already serialized to JSON bytes.
+        :param invalidate: Whether the entity was changed, in which case every worker is told to drop
+        its local copy.
+        :param compute_time: Seconds it took to load the entity, used to refresh it before it expires.
+        """
+        key = self._generate_key(id, entity)
+        entries = self._normalize(key, entity, value)
+
+        pipe = self._cache.pipeline(transaction=False)
+        for entry_key, (entry_entity, body) in entries.items():
+            encoded, ttl = self._encode(body, entry_entity, compute_time)
+            pipe.set(entry_key, encoded, ex=ttl)
+        if invalidate:
+            pipe.publish(CacheConstants.INVALIDATION_CHANNEL, key)
+        await pipe.execute()
+
+    async def add_tombstone(self, id: int, entity: ServiceEntities) -> None:
+        """
+        Remember that an entity doesn't exist, for the policy's negative TTL (see CacheRepository.add_tombstone).
+        :param id: The unique identifier (ex. primary key) for the entity.
+        :param entity: An enum identifying the entity that was not found.
+        """
+        ttl = self.policy(entity).negative_ttl
+        if ttl <= 0:
+            return
+        await self._cache.set(
+            self._generate_key(id, entity), CacheCodec.TOMBSTONE, ex=ttl, nx=True
+        )
+
+    async def get_raw(self, id: int, entity: ServiceEntities) -> bytes | None:
+        """
+        Get an entity from the cache as the stored JSON bytes, so it can be sent as a response body without decoding.
+        :param id: The unique identifier (ex. primary key) for the entity.
+        :param entity: An enum identifying the entity being stored.
+        :return: The entity serialized to JSON.
+        :raises EntityNotFound: If the entity is cached as not existing.
+        """
+        return (await self.lookup(id, entity)).body
+
+    async def lookup(self, id: int, entity: ServiceEntities) -> CacheLookup:
+        """
+        Same as get_raw, but also tells whether the entry should be refreshed before it expires
+        (see CacheRepository.lookup).
+        :raises EntityNotFound: If the entity is cached as not existing.
+        """
+        key = self._generate_key(id, entity)
+        if entity in _REFERENCES:
+            body, refresh = await self._get_entry_with_reference(key, entity)
+        else:
+            body, refresh = await self._get_entry(key, entity)
+        if body == CacheCodec.TOMBSTONE:
+            raise EntityNotFound(entity, id)
+        return CacheLookup(body, refresh)
+
+    async def add_many(
+        self,
+        entity: ServiceEntities,
+        values: dict[int, Any],
+        not_found: Sequence[int] = (),
+        invalidate: bool = False,
+    ) -> None:
+        """
+        Add multiple entities to the cache in one pipelined round-trip (see CacheRepository.add_many).
+        :param entity: An enum identifying the entities being stored.
+        :param values: The attributes of each entity, keyed by the entity's unique identifier.
+        :param not_found: IDs to store tombstones for (see add_tombstone).
+        :param invalidate: Whether the entities were changed, in which case every worker is told to drop
+        its local copies.
+        """
+        entries: dict[str, tuple[ServiceEntities, bytes]] = {}
+        for id, value in values.items():
+            entries.update(
+                self._normalize(self._generate_key(id, entity), entity, value)
+            )
+
+        pipe = self._cache.pipeline(transaction=False)
+        for key, (entry_entity, body) in entries.items():
+            encoded, ttl = self._encode(body, entry_entity)
+            pipe.set(key, encoded, ex=ttl)
+        if (ttl := self.policy(entity).negative_ttl) > 0:
+            for id in not_found:
+                pipe.set(
+                    self._generate_key(id, entity),
+                    CacheCodec.TOMBSTONE,
+                    ex=ttl,
+                    nx=True,
+                )
+        if invalidate:
+            for id in values:
+                pipe.publish(
+                    CacheConstants.INVALIDATION_CHANNEL, self._generate_key(id, entity)
+                )
+        await pipe.execute()
+
+    async def get_many(
+        self, ids: Sequence[int], entity: ServiceEntities
+    ) -> dict[int, dict[str, Any] | None]:
+        """
+        Get multiple entities from the cache with one MGET, plus one for the entities they embed.
+        :param ids: The unique identifiers of the entities.
+        :param entity: An enum identifying the entities being retrieved.
+        :return: The attributes of each entity found, keyed by its unique identifier.
+        Entities cached as not existing are included with a value of None.
+        """
+        keys = {id: self._generate_key(id, entity) for id in ids}
+        entries = await self._get_entries(list(keys.values()))
+        found = {id: entries[key] for id, key in keys.items() if key in entries}
+
+        if entity in _REFERENCES:
+            references = self._find_references(found, entity)
+            embedded = await self._get_entries(
+                list(dict.fromkeys(key for key, _, _ in references.values()))
+            )
+            self._splice_references(found, references, embedded)
+        return self._to_documents(found)
+
+    async def _get_entry(
+        self, key: str, entity: ServiceEntities
+    ) -> tuple[bytes | None, bool]:
+        """Get one stored entry as JSON bytes, and whether to refresh it early."""
+        stored: Any = await self._cache.get(key)
+        body = self._decode(key, stored)
+        if body is None:
+            return None, False
+        return body, self._expires_early(stored, entity)
+
+    async def _get_entry_with_reference(
+        self, key: str, entity: ServiceEntities
+    ) -> tuple[bytes | None, bool]:
+        """
+        Get the entry of an entity that references another entity, with the referenced entity's entry spliced in,
+        and whether to refresh either of them early. Both entries are read in one round-trip.
+        """
+        stored = await self._get_with_reference(
+            keys=[key], args=[self._key_prefix(_REFERENCES[entity][1])]
+        )
+        entries, refresh = self._decode_with_reference(key, entity, stored)
+        body = self._splice_reference(
+            key, entity, {entry_key: body for entry_key, (_, body) in entries.items()}
+        )
+        return body, refresh and body is not None
+
+    async def _get_entries(self, keys: list[str]) -> dict[str, bytes]:
+        """Get stored entries as JSON bytes, keyed by cache key, with one MGET."""
+        if not keys:
+            return {}
+        found: dict[str, bytes] = {}
+        for key, stored in zip(keys, await self._cache.mget(keys)):
+            if (body := self._decode(key, stored)) is not None:
+                found[key] = body
+        return found
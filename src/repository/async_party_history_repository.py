@@ -0,0 +1,12 @@
+from src.repository.async_base_repository import (
+    AsyncBaseRepository,
+    AsyncDatabaseSession,
+)
+from src.models.party_history import PartyHistory
+
+
+class AsyncPartyHistoryRepository(AsyncBaseRepository[PartyHistory]):
+    """Data access layer for party history entities, for the async stack."""
+
+    def __init__(self, session: AsyncDatabaseSession) -> None:
+        super().__init__(session, PartyHistory)
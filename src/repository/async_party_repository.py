@@ -0,0 +1,38 @@
+from typing import Sequence
+
+from sqlalchemy.orm import joinedload
+from sqlalchemy.sql import select
+
+from src.repository.async_base_repository import (
+    AsyncBaseRepository,
+    AsyncDatabaseSession,
+)
+from src.repository.party_repository import _GET_WITH_ADDRESS
+from src.models.party import Party
+
+
+class AsyncPartyRepository(AsyncBaseRepository[Party]):
+    """Data access layer for party entities, for the async stack.
+
+    The address is always loaded with the party, since an async session can't lazy load it later.
+    """
+
+    def __init__(self, session: AsyncDatabaseSession) -> None:
+        super().__init__(session, Party)
+
+    async def get_by_id(self, id: int) -> Party:
+        """
+        Get a party by ID with its address joined in the same statement, reusing PartyRepository's statement.
+        :raises NoResultFound: If the party doesn't exist.
+        """
+        return (await self._session.scalars(_GET_WITH_ADDRESS, {"id": id})).one()
+
+    async def get_by_ids(self, ids: Sequence[int]) -> Sequence[Party]:
+        """Get all parties with the provided IDs in one query, with their address joined in the same statement."""
+        return (
+            await self._session.scalars(
+                select(Party)
+                .where(Party.id.in_(ids))
+                .options(joinedload(Party.address))
+            )
+        ).all()
@@ -0,0 +1,69 @@
+import logging
+from types import TracebackType
+
+
+from src.repository.async_party_history_repository import (
+    AsyncPartyHistoryRepository,
+)
+from src.repository.async_address_repository import AsyncAddressRepository
+from src.repository.async_party_repository import AsyncPartyRepository
+from src.repository.async_base_repository import AsyncDatabaseSession
+
+uow_logger = logging.getLogger(__name__)
+
+
+class AsyncUnitOfWork:
+    """Same as UnitOfWork, for the async stack. Used as an async context manager.
+
+    In the async app, the session is the app's async scoped session, so a transaction is started, committed or
+    rolled back on the session of the current request only (see init_async_db).
+    """
+
+    def __init__(
+        self,
+        session: AsyncDatabaseSession,
+        party_repository: AsyncPartyRepository,
+        address_repository: AsyncAddressRepository,
+        party_history_repository: AsyncPartyHistoryRepository,
+    ):
+        self.session = session
+        self.party_repository = party_repository
+        self.address_repository = address_repository
+        self.party_history_repository = party_history_repository
+
+    async def __aenter__(self) -> None:
+        """
+        When an instance of this class starts being used as an async context manager, this magic method
+        will be invoked. This will start the database transaction.
+        :return:
+        """
+        uow_logger.debug("Starting Transaction...")
+
+    async def __aexit__(
+        self,
+        exc_type: BaseException | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> bool | None:
+        """
+        When an instance of this class stops being used as an async context manager, this magic method
+        will be invoked. This will stop the database transaction by either committing or rolling back.
+        :param exc_type: The exception type, if an exception occurs.
+        :param exc_val: The exception value, if an exception occurs.
+        :param exc_tb: The exception traceback, if an exception occurs.
+        :return:
+        """
+        if exc_type:
+            uow_logger.debug("Rolling back Transaction...")
+            await self.session.rollback()
+            return False
+
+        uow_logger.debug("Committing Transaction.")
+        await self.session.commit()
+        return None
+
+    async def flush(self) -> None:
+        """
+        Flush all object changes in the current transaction, ex. to get the IDs of new entities (see UnitOfWork.flush).
+        """
+        await self.session.flush()
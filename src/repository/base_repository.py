@@ -1,5 +1,5 @@
-from sqlalchemy.orm import Session
-from typing import TypeVar, Generic, Type
+from typing import Iterable, TypeVar, Generic, Type
+from src.util.custom_types import DatabaseSession
 
 T = TypeVar("T")
 
@@ -11,12 +11,16 @@ class BaseRepository(Generic[T]):
     Only such methods should go in here. This avoids having to rewrite duplicate methods across multiple repository classes.
     """
 
-    def __init__(self, session: Session, clazz: Type[T]) -> None:
+    def __init__(self, session: DatabaseSession, clazz: Type[T]) -> None:
         self._session = session
         self._clazz = clazz
 
     def add(self, entity: T) -> None:
         self._session.add(entity)
 
+    def add_all(self, entities: Iterable[T]) -> None:
+        """Add multiple entities. They are inserted with multi-row INSERTs when the session flushes."""
+        self._session.add_all(entities)
+
     def get_by_id(self, id: int) -> T:
         return self._session.get_one(entity=self._clazz, ident=id)
@@ -0,0 +1,181 @@
+"""Encoding of values stored in the cache.
+
+Every stored value starts with a one-byte header identifying its format, followed by the payload.
+Decoding only looks at the header, so any worker can read entries written by a worker configured
+with another codec, ex. during a rolling deploy that changes CACHE_CODEC. A value without a header,
+which starts with "{", is read as plain JSON.
+
+Workers of a release that predates a format can't read it, so entities are cached under a key namespace
+versioned with the format (see CacheConstants.KEY_PREFIX), and a new format needs a new version.
+
+A value can be wrapped in an envelope recording when it expires and how long it took to compute,
+which is used to refresh entries shortly before they expire (see CacheRepository.lookup).
+The entry of an entity that references another entity by ID starts with the ID in plain text, so Redis can read it
+without decoding the value, and fetch both entries in one round-trip.
+"""
+
+import json
+import logging
+import struct
+import zlib
+from enum import IntEnum
+from typing import Any, NamedTuple
+
+try:
+    import msgpack
+except ImportError:  # optional dependency, installed with the "msgpack" extra
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+_LEGACY_JSON_PREFIX = ord("{")
+_ENVELOPE = struct.Struct("!dd")
+
+
+class CacheFormat(IntEnum):
+    """The one-byte header of a cached value. Never reuse or renumber a value, old entries may still exist."""
+
+    JSON = 1
+    JSON_ZLIB = 2
+    MSGPACK = 3
+    MSGPACK_ZLIB = 4
+    TOMBSTONE = 5  # the entity is known not to exist, there is no payload
+    ENVELOPE = 6  # expiry and compute time, followed by a value of another format
+    REFERENCE = 7  # ID of the referenced entity in ASCII digits and a ":", followed by a value of another format
+
+
+class CacheMetadata(NamedTuple):
+    """Stored alongside a value in an envelope."""
+
+    expires_at: float  # unix timestamp
+    compute_time: float  # seconds it took to load the value from the database
+
+
+class CacheDecodeError(Exception):
+    """Raised when a cached value can't be decoded by this worker, ex. it was written in an unknown format."""
+
+
+class CacheCodec:
+    """
+    Serializes cache values to JSON or msgpack, compressing payloads larger than the threshold with zlib.
+
+    JSON is the default because cached JSON can be sent as a response body as is (see CacheRepository.get_raw).
+    msgpack is more compact, but has to be converted back to JSON on every read.
+    """
+
+    TOMBSTONE = bytes((CacheFormat.TOMBSTONE,))
+
+    def __init__(self, serializer: str = "json", compress_threshold: int = 256) -> None:
+        """
+        :param serializer: Either "json" or "msgpack".
+        :param compress_threshold: Payloads larger than this many bytes are compressed. 0 disables compression.
+        """
+        if serializer not in ("json", "msgpack"):
+            raise ValueError(f"Unknown cache serializer '{serializer}'.")
+        if serializer == "msgpack" and msgpack is None:
+            raise ValueError(
+                "The msgpack cache serializer requires the 'msgpack' package to be installed."
+            )
+        self._serializer = serializer
+        self._compress_threshold = compress_threshold
+
+    def encode(self, value: Any) -> bytes:
+        """Encode a JSON-serializable value."""
+        if self._serializer == "msgpack":
+            return self._with_header(CacheFormat.MSGPACK, msgpack.packb(value))
+        return self._with_header(
+            CacheFormat.JSON, json.dumps(value, separators=(",", ":")).encode("utf-8")
+        )
+
+    def encode_json(self, body: bytes) -> bytes:
+        """Encode a value that is already serialized to JSON. With the JSON serializer, the bytes are stored as is."""
+        if self._serializer == "msgpack":
+            return self._with_header(
+                CacheFormat.MSGPACK, msgpack.packb(json.loads(body))
+            )
+        return self._with_header(CacheFormat.JSON, body)
+
+    def _with_header(self, fmt: CacheFormat, payload: bytes) -> bytes:
+        if 0 < self._compress_threshold < len(payload):
+            payload = zlib.compress(payload)
+            fmt = (
+                CacheFormat.JSON_ZLIB
+                if fmt == CacheFormat.JSON
+                else CacheFormat.MSGPACK_ZLIB
+            )
+        return bytes((fmt,)) + payload
+
+    @staticmethod
+    def wrap(data: bytes, metadata: CacheMetadata) -> bytes:
+        """Wrap an encoded value in an envelope carrying its metadata."""
+        return bytes((CacheFormat.ENVELOPE,)) + _ENVELOPE.pack(*metadata) + data
+
+    @staticmethod
+    def with_reference(data: bytes, id: int) -> bytes:
+        """Prefix an encoded value with the ID of the entity it references."""
+        return bytes((CacheFormat.REFERENCE,)) + f"{id}:".encode("ascii") + data
+
+    @staticmethod
+    def unwrap(data: bytes) -> tuple[bytes, CacheMetadata | None]:
+        """
+        Split a cached value into the encoded value and its metadata, or None if it isn't in an envelope.
+        The ID of a referenced entity is dropped, it is also in the value.
+        """
+        if data and data[0] == CacheFormat.REFERENCE:
+            end = data.find(b":", 1)
+            if end < 0:
+                raise CacheDecodeError("Cached reference is truncated.")
+            data = data[end + 1 :]
+        if not data or data[0] != CacheFormat.ENVELOPE:
+            return data, None
+        if len(data) <= _ENVELOPE.size:
+            raise CacheDecodeError("Cached envelope is truncated.")
+        metadata = CacheMetadata(*_ENVELOPE.unpack_from(data, 1))
+        return data[1 + _ENVELOPE.size :], metadata
+
+    @staticmethod
+    def decode(data: bytes) -> Any:
+        """Decode a cached value of any known format."""
+        fmt, payload = CacheCodec._split(CacheCodec.unwrap(data)[0])
+        if fmt in (CacheFormat.MSGPACK, CacheFormat.MSGPACK_ZLIB):
+            return msgpack.unpackb(payload)
+        return json.loads(payload)
+
+    @staticmethod
+    def decode_json(data: bytes) -> bytes:
+        """
+        Decode a cached value of any known format to JSON bytes. JSON payloads are returned without being parsed.
+        Tombstones are returned as is, so callers can tell them apart with `== CacheCodec.TOMBSTONE`.
+        """
+        data, _ = CacheCodec.unwrap(data)
+        if data == CacheCodec.TOMBSTONE:
+            return data
+        fmt, payload = CacheCodec._split(data)
+        if fmt in (CacheFormat.MSGPACK, CacheFormat.MSGPACK_ZLIB):
+            return json.dumps(msgpack.unpackb(payload), separators=(",", ":")).encode(
+                "utf-8"
+            )
+        return payload
+
+    @staticmethod
+    def _split(data: bytes) -> tuple[CacheFormat, bytes]:
+        """Split a cached value into its format and its decompressed payload."""
+        if not data:
+            raise CacheDecodeError("Cached value is empty.")
+        if data[0] == _LEGACY_JSON_PREFIX:
+            return CacheFormat.JSON, data
+
+        try:
+            fmt, payload = CacheFormat(data[0]), data[1:]
+        except ValueError:
+            raise CacheDecodeError(f"Unknown cache format {data[0]}.")
+        if fmt in (CacheFormat.MSGPACK, CacheFormat.MSGPACK_ZLIB) and msgpack is None:
+            raise CacheDecodeError(
+                "Cached value is msgpack, but the 'msgpack' package is not installed."
+            )
+        if fmt in (CacheFormat.JSON_ZLIB, CacheFormat.MSGPACK_ZLIB):
+            try:
+                payload = zlib.decompress(payload)
+            except zlib.error as e:
+                raise CacheDecodeError(f"Cached value is corrupt: {e}")
+        return fmt, payload
@@ -1,49 +1,647 @@
 from redis import Redis
+from redis.lock import Lock
 import logging
 import json
-from typing import Any
-from src.util.constants import AppConstants
+import math
+import random
+import time
+from typing import Any, NamedTuple, Sequence
+from src.config.cache_policy import CachePolicy
+from src.repository.cache_codecs import CacheCodec, CacheDecodeError, CacheMetadata
+from src.repository.local_cache import LocalCache
+from src.util.constants import CacheConstants
+from src.exception.custom_exceptions import EntityNotFound
 from src.util.enums import ServiceEntities
+from src.util import helpers
 
 logger = logging.getLogger(__name__)
 
+# Entities that embed another entity, as (JSON field, embedded entity). Their cache entries hold the ID of the embedded
+# entity in place of a copy of it, and the embedded entity is cached once under its own key.
+_REFERENCES: dict[ServiceEntities, tuple[str, ServiceEntities]] = {
+    ServiceEntities.PARTY: ("address", ServiceEntities.ADDRESS),
+}
 
-class CacheRepository:
-    """Responsible for interacting with the external Cache being used by this application for faster reads."""
+# Get an entry, and the entry of the entity it references, in one round-trip. The referenced entity's ID is read from
+# the entry's prefix (see CacheCodec.with_reference), and appended to the key prefix of the referenced entity (ARGV[1]).
+# Returns {} on a miss, {entry} if the entry doesn't reference another entity, else {entry, referenced entry or ""}.
+# The referenced key isn't declared in KEYS since it isn't known beforehand, so this doesn't run on Redis Cluster.
+_GET_WITH_REFERENCE = r"""
+local entry = redis.call('GET', KEYS[1])
+if not entry then
+    return {}
+end
+local id = string.match(entry, '^\7(%d+):')
+if not id then
+    return {entry}
+end
+return {entry, redis.call('GET', ARGV[1] .. id) or ''}
+"""
 
-    def __init__(self, cache: Redis) -> None:
+# Write the entries of an entity unless a newer version of the entity was written, in one round-trip.
+# The version of the last write is kept under its own key (KEYS[1]), and compared to the version of this write (ARGV[1]).
+# KEYS[2..] are the entries. ARGV[2] is the TTL of the version, ARGV[3] and ARGV[4] the channel and message of
+# the invalidation to publish ("" to publish none), followed by the value and TTL of every entry, in the order of KEYS.
+# Returns 1 if the entries were written, 0 if a newer version was written.
+_SET_IF_NEWER = r"""
+local stored = redis.call('GET', KEYS[1])
+if stored and tonumber(stored) > tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+for i = 2, #KEYS do
+    redis.call('SET', KEYS[i], ARGV[2 * i + 1], 'EX', ARGV[2 * i + 2])
+end
+if ARGV[3] ~= '' then
+    redis.call('PUBLISH', ARGV[3], ARGV[4])
+end
+return 1
+"""
+
+
+class CacheLookup(NamedTuple):
+    """The result of CacheRepository.lookup."""
+
+    body: bytes | None
+    refresh: (
+        bool  # the entry is about to expire and should be recomputed in the background
+    )
+
+
+class BaseCacheRepository:
+    """Class to be inherited by the sync and async cache repositories.
+
+    Contains the logic that doesn't talk to Redis: cache keys, policies, encoding entries with the codec,
+    and normalizing entities that embed another entity. Only such methods should go in here.
+    See CacheRepository for how entries are stored.
+    """
+
+    def __init__(
+        self,
+        policies: dict[ServiceEntities, CachePolicy] | None = None,
+        codec: CacheCodec | None = None,
+    ) -> None:
+        self._policies = policies or {}
+        self._codec = codec or CacheCodec()
+
+    def policy(self, entity: ServiceEntities) -> CachePolicy:
+        """Get the caching behaviour configured for the entity."""
+        return self._policies.get(entity, CachePolicy())
+
+    def _normalize(
+        self, key: str, entity: ServiceEntities, value: Any
+    ) -> dict[str, tuple[ServiceEntities, bytes]]:
+        """
+        Serialize an entity to the entries to store, keyed by cache key.
+        An embedded entity is stored under its own key, and replaced by its ID in the entity's entry.
+        """
+        body = value if isinstance(value, bytes) else helpers.to_json_bytes(value)
+        if (reference := _REFERENCES.get(entity)) is None:
+            return {key: (entity, body)}
+
+        field, embedded_entity = reference
+        document = value if isinstance(value, dict) else json.loads(body)
+        embedded = document.get(field)
+        if not isinstance(embedded, dict) or "id" not in embedded:
+            return {key: (entity, body)}
+
+        embedded_body = helpers.to_json_bytes(embedded)
+        marker = self._field_marker(field)
+        start = body.find(marker) + len(marker)
+        end = start + len(embedded_body)
+        if start < len(marker) or body[start:end] != embedded_body:
+            # not serialized with to_json_bytes, so the embedded bytes can't be located. Store it as is.
+            return {key: (entity, body)}
+
+        return {
+            key: (
+                entity,
+                body[:start] + str(embedded["id"]).encode("ascii") + body[end:],
+            ),
+            self._generate_key(embedded["id"], embedded_entity): (
+                embedded_entity,
+                embedded_body,
+            ),
+        }
+
+    def _find_reference(
+        self, body: bytes, entity: ServiceEntities
+    ) -> tuple[int, int, int] | None:
+        """
+        Locate the embedded entity's ID in a normalized entry.
+        :return: The ID, and the start and end offsets of its digits, or None if the entry embeds a copy of the entity.
+        """
+        if (reference := _REFERENCES.get(entity)) is None:
+            return None
+        marker = self._field_marker(reference[0])
+        # quotes inside JSON strings are escaped, so the marker can only match the field itself
+        start = body.find(marker)
+        if start < 0:
+            return None
+        start += len(marker)
+        end = start
+        while end < len(body) and body[end : end + 1].isdigit():
+            end += 1
+        if end == start:
+            return None
+        return int(body[start:end]), start, end
+
+    def _find_references(
+        self, found: dict[int, bytes], entity: ServiceEntities
+    ) -> dict[int, tuple[str, int, int]]:
+        """
+        Locate the embedded entity of each normalized entry, keyed by the entity's ID.
+        :return: The cache key of the embedded entity, and the start and end offsets of its ID (see _find_reference).
+        """
+        embedded_entity = _REFERENCES[entity][1]
+        references: dict[int, tuple[str, int, int]] = {}
+        for id, body in found.items():
+            if (reference := self._find_reference(body, entity)) is not None:
+                embedded_id, start, end = reference
+                references[id] = (
+                    self._generate_key(embedded_id, embedded_entity),
+                    start,
+                    end,
+                )
+        return references
+
+    @staticmethod
+    def _splice_references(
+        found: dict[int, bytes],
+        references: dict[int, tuple[str, int, int]],
+        embedded: dict[str, bytes],
+    ) -> None:
+        """
+        Replace the IDs of the embedded entities with their entries, in place.
+        Entries whose embedded entity is missing are removed, so they are treated as misses.
+        """
+        for id, (key, start, end) in references.items():
+            part = embedded.get(key)
+            if part is None or part == CacheCodec.TOMBSTONE:
+                del found[id]
+            else:
+                found[id] = found[id][:start] + part + found[id][end:]
+
+    @staticmethod
+    def _to_documents(found: dict[int, bytes]) -> dict[int, dict[str, Any] | None]:
+        """Decode entries read by get_many. Tombstones have a value of None."""
+        return {
+            id: None if body == CacheCodec.TOMBSTONE else json.loads(body)
+            for id, body in found.items()
+        }
+
+    def _decode_with_reference(
+        self, key: str, entity: ServiceEntities, stored: list[Any]
+    ) -> tuple[dict[str, tuple[ServiceEntities, bytes]], bool]:
+        """
+        Decode the entries read by the _GET_WITH_REFERENCE script.
+        :return: The entries found as JSON bytes, keyed by cache key (the entity's, and the one of the entity
+        it references), and whether to refresh either of them early.
+        """
+        entries: dict[str, tuple[ServiceEntities, bytes]] = {}
+        if not stored or (body := self._decode(key, stored[0])) is None:
+            return entries, False
+        entries[key] = (entity, body)
+        refresh = self._expires_early(stored[0], entity)
+
+        reference = self._find_reference(body, entity)
+        if len(stored) > 1 and reference is not None:
+            embedded_entity = _REFERENCES[entity][1]
+            embedded_key = self._generate_key(reference[0], embedded_entity)
+            if (embedded := self._decode(embedded_key, stored[1])) is not None:
+                entries[embedded_key] = (embedded_entity, embedded)
+                refresh = refresh or self._expires_early(stored[1], embedded_entity)
+        return entries, refresh
+
+    def _splice_reference(
+        self, key: str, entity: ServiceEntities, entries: dict[str, bytes]
+    ) -> bytes | None:
+        """
+        Get an entry with the entry of the entity it references spliced back in, from entries keyed by cache key.
+        Tombstones are returned as is. If the referenced entry is missing, the entry is treated as a miss.
+        """
+        body = entries.get(key)
+        if body is None or (reference := self._find_reference(body, entity)) is None:
+            return body
+        embedded_id, start, end = reference
+        embedded = entries.get(self._generate_key(embedded_id, _REFERENCES[entity][1]))
+        if embedded is None or embedded == CacheCodec.TOMBSTONE:
+            return None
+        return body[:start] + embedded + body[end:]
+
+    @staticmethod
+    def _field_marker(field: str) -> bytes:
+        return f'"{field}":'.encode("utf-8")
+
+    def _encode(
+        self, body: bytes, entity: ServiceEntities, compute_time: float = 0.0
+    ) -> tuple[bytes, int]:
+        """
+        Encode an entry with the codec, and pick its TTL. The expiry is stored with the entry if it can expire early,
+        and the ID of the entity it references if it is normalized.
+        """
+        policy = self.policy(entity)
+        jitter = policy.ttl * policy.ttl_jitter
+        ttl = max(1, round(policy.ttl + random.uniform(-jitter, jitter)))
+        encoded = self._codec.encode_json(body)
+        if policy.early_expiration_beta > 0:
+            encoded = CacheCodec.wrap(
+                encoded, CacheMetadata(time.time() + ttl, compute_time)
+            )
+        if (reference := self._find_reference(body, entity)) is not None:
+            encoded = CacheCodec.with_reference(encoded, reference[0])
+        return encoded, ttl
+
+    def _expires_early(self, stored: bytes, entity: ServiceEntities) -> bool:
+        """XFetch: refresh when now - compute_time * beta * ln(rand) reaches the expiry."""
+        beta = self.policy(entity).early_expiration_beta
+        if beta <= 0:
+            return False
+        _, metadata = CacheCodec.unwrap(stored)
+        if metadata is None:
+            return False
+        # 1 - random() is in (0, 1], so the log is defined
+        gap = -metadata.compute_time * beta * math.log(1.0 - random.random())
+        return time.time() + gap >= metadata.expires_at
+
+    def _decode(self, key: str, stored: Any) -> bytes | None:
+        """
+        Decode a value read from Redis to JSON bytes.
+        Values that can't be decoded by this worker are treated as a miss, and get overwritten once the entity is reloaded.
+        """
+        if not stored or not isinstance(stored, bytes):
+            return None
+        try:
+            return self._codec.decode_json(stored)
+        except CacheDecodeError as e:
+            logger.warning(f"Could not decode cached value of key {key}: {e}")
+            return None
+
+    @staticmethod
+    def _generate_key(id: int, entity: ServiceEntities) -> str:
+        """
+        Generate a unique cache key for the entity. The creation of this cache key
+        allows the cache to create a namespace or "folder" that belongs only to this service,
+        and to this version of the format of cached values (see CacheConstants.KEY_PREFIX).
+        :param id: The unique identifier (ex. primary key) for the entity.
+        :param entity: An enum identifying the entity being stored.
+        :return: A unique cache key.
+        """
+        return f"{BaseCacheRepository._key_prefix(entity)}{id}"
+
+    @staticmethod
+    def _key_prefix(entity: ServiceEntities) -> str:
+        """The prefix of the cache keys of an entity, followed by the entity's ID."""
+        return f"{CacheConstants.KEY_PREFIX}:{entity.value}:"
+
+
+class CacheRepository(BaseCacheRepository):
+    """Responsible for interacting with the external Cache being used by this application for faster reads.
+
+    If a local cache is provided, it is used as an in-process tier in front of Redis.
+    Values are stored in Redis in the format of the codec, but the local cache always holds plain JSON bytes.
+
+    IDs that don't exist can be cached as short-lived tombstones (see add_tombstone),
+    so repeated lookups for them never reach the database.
+
+    Entries are normalized: a party entry references its address by ID, and the address is cached separately,
+    since many parties share one address. Reads splice the address bytes back into the party bytes,
+    so the result is identical to the party serialized as a whole. If the address entry is missing,
+    the party is treated as a miss. A party and its address are read from Redis in one round-trip, by a script
+    that reads the address ID from the party entry (see _GET_WITH_REFERENCE).
+
+    Writes can be versioned, so a write of an entity read before an update can't overwrite the updated entity,
+    even if the two were written by different workers (see add).
+
+    TTLs are set per entity by its cache policy, with random jitter. If the policy enables early expiration,
+    entries are stored with their expiry and compute time, so a read can tell when to refresh an entry
+    before it expires (see lookup).
+    """
+
+    def __init__(
+        self,
+        cache: Redis,
+        local_cache: LocalCache | None = None,
+        policies: dict[ServiceEntities, CachePolicy] | None = None,
+        codec: CacheCodec | None = None,
+    ) -> None:
+        super().__init__(policies, codec)
         self._cache = cache
+        self._local_cache = local_cache
+        self._get_with_reference = cache.register_script(_GET_WITH_REFERENCE)
+        self._set_if_newer = cache.register_script(_SET_IF_NEWER)
 
-    def add(self, id: int, entity: ServiceEntities, value: Any) -> None:
+    def lock(self, id: int, entity: ServiceEntities) -> Lock:
+        """
+        Get the Redis lock that guards rebuilding the cache entry of an entity, so only one worker
+        loads it from the database at a time. The lock expires on its own after the policy's lock timeout.
+        :param id: The unique identifier (ex. primary key) for the entity.
+        :param entity: An enum identifying the entity being rebuilt.
+        """
+        lock: Lock = self._cache.lock(
+            f"{self._generate_key(id, entity)}:lock",
+            timeout=self.policy(entity).lock_timeout,
+            blocking=False,
+        )
+        return lock
+
+    def add(
+        self,
+        id: int,
+        entity: ServiceEntities,
+        value: Any,
+        invalidate: bool = False,
+        compute_time: float = 0.0,
+        version: float | None = None,
+    ) -> bool:
         """
         Add an entity to the cache.
         :param id: The unique identifier (ex. primary key) for the entity.
         :param entity: An enum identifying the entity being stored.
-        :param value: The attributes of the entity.
+        :param value: The attributes of the entity, or the entity already serialized to JSON bytes.
+        :param invalidate: Whether the entity was changed, in which case every worker is told to drop
+        its local copy. The write and the invalidation message are sent in one round-trip.
+        :param compute_time: Seconds it took to load the entity, used to refresh it before it expires.
+        :param version: Orders writes of the same entity, higher is newer (ex. its updated_at). If set, the entity
+        isn't written if a newer version of it was written, by any worker (see _SET_IF_NEWER).
+        :return: Whether the entity was written.
         """
-        bytes_val = json.dumps(value).encode("utf-8")
-        self._cache.set(self._generate_key(id, entity), bytes_val, ex=86400)
+        key = self._generate_key(id, entity)
+        entries = self._normalize(key, entity, value)
+
+        if version is not None:
+            encoded_entries = {
+                entry_key: self._encode(body, entry_entity, compute_time)
+                for entry_key, (entry_entity, body) in entries.items()
+            }
+            written = self._set_if_newer(
+                keys=[f"{key}:version", *encoded_entries],
+                args=[
+                    repr(version),
+                    max(ttl for _, ttl in encoded_entries.values()),
+                    CacheConstants.INVALIDATION_CHANNEL if invalidate else "",
+                    key,
+                    *(
+                        arg
+                        for encoded, ttl in encoded_entries.values()
+                        for arg in (encoded, ttl)
+                    ),
+                ],
+            )
+            if not written:
+                return False
+        elif invalidate or len(entries) > 1:
+            pipe = self._cache.pipeline(transaction=False)
+            for entry_key, (entry_entity, body) in entries.items():
+                encoded, ttl = self._encode(body, entry_entity, compute_time)
+                pipe.set(entry_key, encoded, ex=ttl)
+            if invalidate:
+                pipe.publish(CacheConstants.INVALIDATION_CHANNEL, key)
+            pipe.execute()
+        else:
+            encoded, ttl = self._encode(entries[key][1], entity, compute_time)
+            self._cache.set(key, encoded, ex=ttl)
+
+        if self._local_cache is not None:
+            for entry_key, (_, body) in entries.items():
+                self._local_cache.set(entry_key, body)
+        return True
+
+    def delete(self, id: int, entity: ServiceEntities) -> None:
+        """
+        Remove an entity from the cache, and tell every worker to drop its local copy.
+        Removing an address makes every party referencing it a miss.
+        :param id: The unique identifier (ex. primary key) for the entity.
+        :param entity: An enum identifying the entity being removed.
+        """
+        key = self._generate_key(id, entity)
+        pipe = self._cache.pipeline(transaction=False)
+        pipe.delete(key)
+        pipe.publish(CacheConstants.INVALIDATION_CHANNEL, key)
+        pipe.execute()
+        if self._local_cache is not None:
+            self._local_cache.delete(key)
+
+    def add_tombstone(self, id: int, entity: ServiceEntities) -> None:
+        """
+        Remember that an entity doesn't exist, for the policy's negative TTL.
+        The tombstone is only written if there is no entry yet, so it can't replace an entity
+        that was created after the lookup that didn't find it. Writing the entity overwrites the tombstone.
+        :param id: The unique identifier (ex. primary key) for the entity.
+        :param entity: An enum identifying the entity that was not found.
+        """
+        ttl = self.policy(entity).negative_ttl
+        if ttl <= 0:
+            return
+        key = self._generate_key(id, entity)
+        written = self._cache.set(key, CacheCodec.TOMBSTONE, ex=ttl, nx=True)
+        if written and self._local_cache is not None:
+            self._local_cache.set(key, CacheCodec.TOMBSTONE, ttl=ttl)
 
     def get(self, id: int, entity: ServiceEntities) -> dict[str, Any] | None:
         """
-        Get an entity from the cache.
+        Get an entity from the cache. The local cache is checked first, then Redis.
         :param id: The unique identifier (ex. primary key) for the entity.
         :param entity: An enum identifying the entity being stored.
         :return: The attributes of the entity.
+        :raises EntityNotFound: If the entity is cached as not existing.
         """
-        bytes_val = self._cache.get(self._generate_key(id, entity))
-        if bytes_val and isinstance(bytes_val, bytes):
-            decoded: dict[str, Any] = json.loads(bytes_val.decode("utf-8"))
-            return decoded
-        return None
+        bytes_val = self.get_raw(id, entity)
+        if bytes_val is None:
+            return None
+        decoded: dict[str, Any] = json.loads(bytes_val)
+        return decoded
 
-    @staticmethod
-    def _generate_key(id: int, entity: ServiceEntities) -> str:
+    def get_raw(self, id: int, entity: ServiceEntities) -> bytes | None:
         """
-        Generate a unique cache key for the entity. The creation of this cache key
-        allows the cache to create a namespace or "folder" that belongs only to this service.
+        Get an entity from the cache as the stored JSON bytes, so it can be sent as a response body without decoding.
+        The local cache is checked first, then Redis.
         :param id: The unique identifier (ex. primary key) for the entity.
         :param entity: An enum identifying the entity being stored.
-        :return: A unique cache key.
+        :return: The entity serialized to JSON.
+        :raises EntityNotFound: If the entity is cached as not existing.
         """
-        return f"{AppConstants.APP_NAME}:{entity.value}:{id}"
+        return self.lookup(id, entity).body
+
+    def lookup(self, id: int, entity: ServiceEntities) -> CacheLookup:
+        """
+        Same as get_raw, but also tells whether the entry should be refreshed before it expires.
+
+        An entry read from Redis is refreshed early with a probability that rises as its expiry approaches,
+        scaled by how long the entity took to compute and the policy's early expiration beta (XFetch).
+        Typically one request refreshes a hot entry shortly before it expires, so it never fully misses.
+        :raises EntityNotFound: If the entity is cached as not existing.
+        """
+        key = self._generate_key(id, entity)
+        if entity in _REFERENCES:
+            body, refresh = self._get_entry_with_reference(key, entity)
+        else:
+            body, refresh = self._get_entry(key, entity)
+        if body == CacheCodec.TOMBSTONE:
+            raise EntityNotFound(entity, id)
+        return CacheLookup(body, refresh)
+
+    def add_many(
+        self,
+        entity: ServiceEntities,
+        values: dict[int, Any],
+        not_found: Sequence[int] = (),
+        only_missing: bool = False,
+        invalidate: bool = False,
+    ) -> None:
+        """
+        Add multiple entities to the cache in one pipelined round-trip.
+        :param entity: An enum identifying the entities being stored.
+        :param values: The attributes of each entity, keyed by the entity's unique identifier.
+        :param not_found: IDs to store tombstones for (see add_tombstone).
+        :param only_missing: Only write entities that are not cached yet, so entries written by requests
+        in the meantime, which may be newer than the values, are kept.
+        :param invalidate: Whether the entities were changed, in which case every worker is told to drop
+        its local copies (see add).
+        """
+        entries: dict[str, tuple[ServiceEntities, bytes]] = {}
+        for id, value in values.items():
+            entries.update(
+                self._normalize(self._generate_key(id, entity), entity, value)
+            )
+
+        pipe = self._cache.pipeline(transaction=False)
+        for key, (entry_entity, body) in entries.items():
+            encoded, ttl = self._encode(body, entry_entity)
+            pipe.set(key, encoded, ex=ttl, nx=only_missing)
+            if self._local_cache is not None and not only_missing:
+                self._local_cache.set(key, body)
+        if (ttl := self.policy(entity).negative_ttl) > 0:
+            for id in not_found:
+                pipe.set(
+                    self._generate_key(id, entity),
+                    CacheCodec.TOMBSTONE,
+                    ex=ttl,
+                    nx=True,
+                )
+        if invalidate:
+            for id in values:
+                pipe.publish(
+                    CacheConstants.INVALIDATION_CHANNEL, self._generate_key(id, entity)
+                )
+        pipe.execute()
+
+    def get_many(
+        self, ids: Sequence[int], entity: ServiceEntities
+    ) -> dict[int, dict[str, Any] | None]:
+        """
+        Get multiple entities from the cache. IDs missing from the local cache are fetched from Redis with one MGET.
+        :param ids: The unique identifiers of the entities.
+        :param entity: An enum identifying the entities being retrieved.
+        :return: The attributes of each entity found, keyed by its unique identifier.
+        Entities cached as not existing are included with a value of None.
+        """
+        keys = {id: self._generate_key(id, entity) for id in ids}
+        entries = self._get_entries(list(keys.values()), entity)
+        found = {id: entries[key] for id, key in keys.items() if key in entries}
+
+        if entity in _REFERENCES:
+            references = self._find_references(found, entity)
+            embedded = self._get_entries(
+                list(dict.fromkeys(key for key, _, _ in references.values())),
+                _REFERENCES[entity][1],
+            )
+            self._splice_references(found, references, embedded)
+        return self._to_documents(found)
+
+    def _get_entry(
+        self, key: str, entity: ServiceEntities
+    ) -> tuple[bytes | None, bool]:
+        """
+        Get one stored entry as JSON bytes, and whether to refresh it early. The local cache is checked first, then Redis.
+        Entries in the local cache outlive their Redis read by at most the local TTL, so they aren't refreshed early.
+        """
+        generation = None
+        body: bytes | None = None
+
+        if self._local_cache is not None:
+            generation = self._local_cache.generation
+            body = self._local_cache.get(key)
+            if body is not None:
+                return body, False
+
+        stored: Any = self._cache.get(key)
+        body = self._decode(key, stored)
+        if body is None:
+            return None, False
+        if self._local_cache is not None:
+            self._local_cache.set(key, body, generation, self._local_ttl(body, entity))
+        return body, self._expires_early(stored, entity)
+
+    def _get_entry_with_reference(
+        self, key: str, entity: ServiceEntities
+    ) -> tuple[bytes | None, bool]:
+        """
+        Get the entry of an entity that references another entity, with the referenced entity's entry spliced in,
+        and whether to refresh either of them early. The local cache is checked first. Otherwise both entries are read
+        from Redis in one round-trip.
+        """
+        generation = None
+        if self._local_cache is not None:
+            generation = self._local_cache.generation
+            local: dict[str, bytes] = {}
+            if (body := self._local_cache.get(key)) is not None:
+                local[key] = body
+                if (reference := self._find_reference(body, entity)) is not None:
+                    embedded_key = self._generate_key(
+                        reference[0], _REFERENCES[entity][1]
+                    )
+                    if (embedded := self._local_cache.get(embedded_key)) is not None:
+                        local[embedded_key] = embedded
+            if (body := self._splice_reference(key, entity, local)) is not None:
+                return body, False
+
+        stored = self._get_with_reference(
+            keys=[key], args=[self._key_prefix(_REFERENCES[entity][1])]
+        )
+        entries, refresh = self._decode_with_reference(key, entity, stored)
+        if self._local_cache is not None:
+            for entry_key, (entry_entity, body) in entries.items():
+                self._local_cache.set(
+                    entry_key, body, generation, self._local_ttl(body, entry_entity)
+                )
+        body = self._splice_reference(
+            key, entity, {entry_key: body for entry_key, (_, body) in entries.items()}
+        )
+        return body, refresh and body is not None
+
+    def _get_entries(
+        self, keys: list[str], entity: ServiceEntities
+    ) -> dict[str, bytes]:
+        """Get stored entries as JSON bytes, keyed by cache key. Keys missing from the local cache are fetched with one MGET."""
+        found: dict[str, bytes] = {}
+        remaining = keys
+        generation = None
+
+        if self._local_cache is not None:
+            generation = self._local_cache.generation
+            remaining = []
+            for key in keys:
+                local = self._local_cache.get(key)
+                if local is not None:
+                    found[key] = local
+                else:
+                    remaining.append(key)
+
+        if remaining:
+            for key, stored in zip(remaining, self._cache.mget(remaining)):
+                body = self._decode(key, stored)
+                if body is not None:
+                    if self._local_cache is not None:
+                        self._local_cache.set(
+                            key, body, generation, self._local_ttl(body, entity)
+                        )
+                    found[key] = body
+
+        return found
+
+    def _local_ttl(self, body: bytes, entity: ServiceEntities) -> float | None:
+        """Tombstones are kept locally no longer than in Redis."""
+        if body == CacheCodec.TOMBSTONE:
+            return self.policy(entity).negative_ttl
+        return None
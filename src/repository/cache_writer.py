@@ -0,0 +1,239 @@
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from redis import RedisError
+
+from src.repository.cache_repository import CacheRepository
+from src.util.enums import ServiceEntities
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CacheWriterOptions:
+    """
+    max_size: The maximum number of pending writes.
+    block_timeout: Seconds a request waits for room in a full queue before its write is dropped.
+    """
+
+    max_size: int = 10000
+    block_timeout: float = 0.05
+
+
+@dataclass
+class _PendingWrite:
+    value: Any
+    version: float
+    invalidate: bool
+    compute_time: float
+
+
+class CacheWriter:
+    """
+    Writes entities to the cache on a background thread, so a slow cache doesn't add to request latency.
+
+    Pending writes are coalesced by key: if an entity is written again before its previous write was sent,
+    only the latest value is sent. Writes are versioned (ex. by the entity's updated_at), and a write older than
+    one already accepted for the same key is discarded. At most one write of a key is sent at a time, so writes
+    of the same entity reach Redis in the order they were accepted. Redis also compares the version of every write
+    to the version of the last one (see CacheRepository.add), so a stale read can't overwrite a newer update
+    written by another worker either.
+
+    When the queue is full, a request waits briefly for room. If there still is none, writes that only populate
+    the cache after a read are dropped, since the next read reloads the entity anyway. Writes of changed entities
+    are sent synchronously instead, because dropping them would leave a stale value in the cache. A synchronous
+    write waits for a write of the same entity that is being sent to finish first.
+    """
+
+    def __init__(
+        self, cache_repository: CacheRepository, options: CacheWriterOptions
+    ) -> None:
+        self._cache_repository = cache_repository
+        self._options = options
+        self._pending: OrderedDict[tuple[ServiceEntities, int], _PendingWrite] = (
+            OrderedDict()
+        )
+        # last accepted version per key, kept for a bounded number of recently written keys
+        self._versions: OrderedDict[tuple[ServiceEntities, int], float] = OrderedDict()
+        # keys whose write is being sent, by the background thread or synchronously
+        self._in_flight: set[tuple[ServiceEntities, int]] = set()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread: threading.Thread | None = None
+        self._counters = dict.fromkeys(
+            [
+                "submitted",
+                "coalesced",
+                "stale",
+                "dropped",
+                "synchronous",
+                "written",
+                "failed",
+            ],
+            0,
+        )
+
+    def start(self) -> None:
+        """Start the background thread that sends pending writes."""
+        self._thread = threading.Thread(
+            target=self._run, name="cache-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(
+        self,
+        id: int,
+        entity: ServiceEntities,
+        value: Any,
+        version: float,
+        invalidate: bool = False,
+        compute_time: float = 0.0,
+    ) -> None:
+        """
+        Queue an entity to be written to the cache (see CacheRepository.add).
+        :param id: The unique identifier (ex. primary key) for the entity.
+        :param entity: An enum identifying the entity being stored.
+        :param value: The attributes of the entity, or the entity already serialized to JSON bytes.
+        :param version: Orders writes of the same entity. Higher is newer.
+        :param invalidate: Whether the entity was changed.
+        :param compute_time: Seconds it took to load the entity.
+        """
+        key = (entity, id)
+        with self._condition:
+            self._counters["submitted"] += 1
+            if self._is_stale(key, version):
+                return
+            self._remember_version(key, version)
+
+            if key not in self._pending and not self._has_room():
+                self._condition.wait_for(
+                    lambda: self._has_room() or self._closed or key in self._pending,
+                    timeout=self._options.block_timeout,
+                )
+                # a newer write of the same entity may have been accepted while waiting
+                if self._is_stale(key, version):
+                    return
+
+            write = _PendingWrite(value, version, invalidate, compute_time)
+            if key in self._pending:
+                self._coalesce(key, write)
+                return
+
+            if self._has_room() and not self._closed:
+                self._pending[key] = write
+                self._condition.notify_all()
+                return
+
+            if not invalidate:
+                self._counters["dropped"] += 1
+                return
+
+            # a write of the same entity that is being sent must land first, or it would overwrite this one
+            self._condition.wait_for(lambda: key not in self._in_flight)
+            if self._is_stale(key, version):
+                return
+            # the entity may have been queued again while waiting, then this write is sent with that one
+            if key in self._pending:
+                self._coalesce(key, write)
+                return
+            self._counters["synchronous"] += 1
+            self._in_flight.add(key)
+
+        self._write(key, write)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop accepting writes, and wait for the pending writes to be sent."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                logger.warning(
+                    f"Cache writer did not drain {len(self._pending)} pending writes within {timeout}s."
+                )
+
+    def stats(self) -> dict[str, Any]:
+        """Counters used to size the queue."""
+        with self._condition:
+            return {
+                "pending": len(self._pending),
+                "maxSize": self._options.max_size,
+                **self._counters,
+            }
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: (
+                        self._next_key() is not None
+                        or (self._closed and not self._pending)
+                    )
+                )
+                key = self._next_key()
+                if key is None:
+                    return
+                pending = self._pending.pop(key)
+                self._in_flight.add(key)
+                self._condition.notify_all()
+            self._write(key, pending)
+
+    def _next_key(self) -> tuple[ServiceEntities, int] | None:
+        """The oldest pending key that isn't being written, or None if there is none."""
+        return next((key for key in self._pending if key not in self._in_flight), None)
+
+    def _coalesce(self, key: tuple[ServiceEntities, int], write: _PendingWrite) -> None:
+        """Replace the pending write of a key with a newer write."""
+        pending = self._pending[key]
+        self._counters["coalesced"] += 1
+        pending.value = write.value
+        pending.version = write.version
+        pending.invalidate = pending.invalidate or write.invalidate
+        pending.compute_time = write.compute_time
+
+    def _write(self, key: tuple[ServiceEntities, int], pending: _PendingWrite) -> None:
+        """Send a write of a key marked as in flight, and then unmark it."""
+        entity, id = key
+        try:
+            written = self._cache_repository.add(
+                id,
+                entity,
+                pending.value,
+                invalidate=pending.invalidate,
+                compute_time=pending.compute_time,
+                version=pending.version,
+            )
+            # a newer version was written by another worker
+            counter = "written" if written else "stale"
+        except RedisError as e:
+            logger.warning(
+                f"Could not write {entity.value} with ID {id} to cache due to Redis Error: {e}."
+            )
+            counter = "failed"
+        with self._condition:
+            self._counters[counter] += 1
+            self._in_flight.discard(key)
+            self._condition.notify_all()
+
+    def _has_room(self) -> bool:
+        return len(self._pending) < self._options.max_size
+
+    def _is_stale(self, key: tuple[ServiceEntities, int], version: float) -> bool:
+        if version < self._versions.get(key, float("-inf")):
+            entity, id = key
+            logger.debug(f"Discarding stale cache write for {entity.value} {id}.")
+            self._counters["stale"] += 1
+            return True
+        return False
+
+    def _remember_version(
+        self, key: tuple[ServiceEntities, int], version: float
+    ) -> None:
+        self._versions[key] = version
+        self._versions.move_to_end(key)
+        while len(self._versions) > self._options.max_size * 10:
+            self._versions.popitem(last=False)
@@ -0,0 +1,222 @@
+import logging
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from redis import BlockingConnectionPool, ConnectionError
+from sqlalchemy import Dialect, Engine
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import ConnectionPoolEntry, PoolProxiedConnection, QueuePool
+from sqlalchemy.util.queue import Empty
+
+logger = logging.getLogger(__name__)
+
+
+class CheckoutStats:
+    """Counters of the checkouts of a connection pool: how many there were, how long they took, and how many
+    timed out waiting for a free connection."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def checked_out(self, wait: float) -> None:
+        with self._lock:
+            self._checkouts += 1
+            self._wait_total += wait
+            self._wait_max = max(self._wait_max, wait)
+
+    def timed_out(self) -> None:
+        with self._lock:
+            self._timeouts += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "checkoutWaitSeconds": self._wait_total,
+                "averageCheckoutWaitSeconds": self._wait_total / self._checkouts
+                if self._checkouts
+                else 0.0,
+                "maxCheckoutWaitSeconds": self._wait_max,
+            }
+
+
+class _NoIdleConnection(Exception):
+    """Raised by a checkout of InstrumentedQueuePool.validate_idle when no connection is idle."""
+
+
+class InstrumentedQueuePool(QueuePool):
+    """A QueuePool that counts its checkouts.
+
+    The checkout wait is the time it takes to get a connection from the pool, including waiting for one
+    to be returned, opening a new one, and the pre-ping if it is enabled, which is the latency a unit of work
+    pays before its first statement.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkout_stats = CheckoutStats()
+        self._invalidations = 0
+        # set while validate_idle checks out a connection on the current thread
+        self._idle_only = threading.local()
+
+    def connect(self) -> PoolProxiedConnection:
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except TimeoutError:
+            self.checkout_stats.timed_out()
+            raise
+        self.checkout_stats.checked_out(time.perf_counter() - started)
+        return connection
+
+    def validate_idle(self, dialect: Dialect) -> int:
+        """
+        Ping every connection idle in the pool once, with the dialect's ping that pool_pre_ping uses, and invalidate
+        those that are broken, so they are reopened when they are next checked out instead of failing a request.
+        Idle connections are checked out one at a time, so requests can still use the others meanwhile,
+        and the validation stops once none is idle: it never opens a connection, nor waits for one.
+        These checkouts aren't counted.
+        :param dialect: The dialect of the pool's engine.
+        :return: The number of connections invalidated.
+        """
+        invalidated = 0
+        # returned connections go to the back of the queue, so each idle connection is checked out once
+        for _ in range(self.checkedin()):
+            self._idle_only.active = True
+            try:
+                connection = super().connect()
+            except _NoIdleConnection:
+                break
+            finally:
+                self._idle_only.active = False
+            try:
+                dbapi_connection = connection.dbapi_connection
+                alive = dbapi_connection is not None and dialect.do_ping(
+                    dbapi_connection
+                )
+            except Exception as e:
+                logger.warning(f"Could not ping pooled connection: {e}")
+                alive = False
+            if not alive:
+                connection.invalidate()
+                invalidated += 1
+            connection.close()
+        self._invalidations += invalidated
+        return invalidated
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        if not getattr(self._idle_only, "active", False):
+            return super()._do_get()
+        # a checkout of validate_idle only takes an idle connection
+        try:
+            return self._pool.get(False)
+        except Empty:
+            raise _NoIdleConnection()
+
+    def stats(self) -> dict[str, Any]:
+        """Occupancy of the pool, and counters of its checkouts."""
+        return {
+            "size": self.size(),
+            "maxOverflow": self._max_overflow,
+            "idle": self.checkedin(),
+            "inUse": self.checkedout(),
+            # overflow() counts up from -size while the pool is filling up
+            "overflow": max(self.overflow(), 0),
+            "invalidations": self._invalidations,
+            **self.checkout_stats.stats(),
+        }
+
+
+class PoolValidator:
+    """
+    Validates the idle connections of an engine's pool (see InstrumentedQueuePool.validate_idle) every interval
+    seconds on a background thread, instead of pinging each connection on checkout with pool_pre_ping.
+
+    The engine's current pool is validated every time, since disposing an engine replaces its pool.
+    A validator can be started again after it was closed, ex. in a worker process forked from the process
+    that created it, which doesn't inherit its thread.
+    """
+
+    def __init__(self, engine: Engine, interval: float) -> None:
+        self._engine = engine
+        self._interval = interval
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start the background thread that validates the pool."""
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(self._stopped,), name="pool-validator", daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop the background thread, and wait for a validation in progress to finish."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self, stopped: threading.Event) -> None:
+        while not stopped.wait(self._interval):
+            pool = self._engine.pool
+            if not isinstance(pool, InstrumentedQueuePool):
+                return
+            try:
+                if invalidated := pool.validate_idle(self._engine.dialect):
+                    logger.info(
+                        f"Invalidated {invalidated} broken connections of {self._engine.url!r}"
+                    )
+            except Exception as e:
+                # the pool stays usable, broken connections are reopened when they fail
+                logger.warning(f"Could not validate pooled connections: {e}")
+
+
+class InstrumentedBlockingConnectionPool(BlockingConnectionPool):
+    """A Redis BlockingConnectionPool that counts its checkouts.
+
+    The pool opens at most max_connections connections, and a command waits up to timeout seconds for one of them
+    to be free before failing, instead of opening as many connections as there are concurrent commands.
+    The checkout wait includes waiting for a free connection, and connecting it if it is new or was disconnected.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        # the methods of the pool are untyped, so they are called through typed references
+        init: Callable[..., None] = super().__init__
+        init(*args, **kwargs)
+        self.checkout_stats = CheckoutStats()
+
+    def get_connection(self, *args: Any, **kwargs: Any) -> Any:
+        get_connection: Callable[..., Any] = super().get_connection
+        started = time.perf_counter()
+        try:
+            connection = get_connection(*args, **kwargs)
+        except ConnectionError:
+            # the pool raises the same error when no connection was free in time, and when one couldn't connect
+            if (
+                self.timeout is not None
+                and time.perf_counter() - started >= self.timeout
+            ):
+                self.checkout_stats.timed_out()
+            raise
+        self.checkout_stats.checked_out(time.perf_counter() - started)
+        return connection
+
+    def stats(self) -> dict[str, Any]:
+        """Occupancy of the pool, and counters of its checkouts."""
+        # the queue holds the idle connections, and a None for every connection not opened yet
+        idle = sum(connection is not None for connection in list(self.pool.queue))
+        return {
+            "maxConnections": self.max_connections,
+            "connections": len(self._connections),
+            "idle": idle,
+            "inUse": len(self._connections) - idle,
+            **self.checkout_stats.stats(),
+        }
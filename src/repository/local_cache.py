@@ -0,0 +1,113 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class LocalCache:
+    """Bounded, in-process LRU cache with a per-entry TTL.
+
+    This sits in front of Redis (see CacheRepository) so hot entities can be served without a network round-trip.
+    Every worker process has its own instance, so entries are invalidated across workers through Redis pub/sub.
+    The invalidation generation counter protects against a race where a value read from Redis before
+    an invalidation arrives is stored locally after it, which would otherwise keep the stale value alive until its TTL.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    @property
+    def generation(self) -> int:
+        """The number of invalidations seen so far. Capture it before reading from Redis and pass it to set()."""
+        return self._generation
+
+    def get(self, key: str) -> Any | None:
+        """Get a value by key, or None if the key is missing or its TTL has elapsed."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        generation: int | None = None,
+        ttl: float | None = None,
+    ) -> None:
+        """
+        Store a value, evicting the least recently used entries when the cache is full.
+        :param key: The cache key.
+        :param value: The value to store.
+        :param generation: The generation captured before the value was read from Redis. If an invalidation
+        happened since then, the value may be stale and is not stored.
+        :param ttl: Seconds to keep the value, if shorter than the cache's TTL.
+        """
+        ttl = self._ttl if ttl is None else min(ttl, self._ttl)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def delete(self, key: str) -> None:
+        """Drop a key because it was changed, possibly by another worker."""
+        with self._lock:
+            self._generation += 1
+            self._invalidations += 1
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry. Used when invalidation messages may have been missed."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def handle_invalidation(self, message: dict[str, Any]) -> None:
+        """Redis pub/sub handler. The message data is the cache key that was changed."""
+        key = message["data"]
+        if isinstance(key, bytes):
+            key = key.decode("utf-8")
+        logger.debug(f"Received cache invalidation for key {key}.")
+        self.delete(key)
+
+    def stats(self) -> dict[str, Any]:
+        """Counters used to size the cache."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "maxSize": self._max_size,
+                "ttl": self._ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hitRate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+            }
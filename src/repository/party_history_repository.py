@@ -1,11 +1,10 @@
-from sqlalchemy.orm import Session
-
 from src.repository.base_repository import BaseRepository
 from src.models.party_history import PartyHistory
+from src.util.custom_types import DatabaseSession
 
 
 class PartyHistoryRepository(BaseRepository[PartyHistory]):
     """Data access layer for party history entities."""
 
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: DatabaseSession) -> None:
         super().__init__(session, PartyHistory)
@@ -0,0 +1,183 @@
+import csv
+import io
+from typing import Any, Sequence, cast
+
+from sqlalchemy import BigInteger, Column, CursorResult, MetaData, Table, Text, func
+from sqlalchemy.dialects.postgresql import distinct_on, insert
+from sqlalchemy.sql import select
+
+from src.models.address import Address
+from src.models.import_checkpoint import ImportCheckpoint
+from src.models.party import Party
+from src.models.party_history import PartyHistory
+from src.util.custom_types import DatabaseSession
+
+# The columns of a staged row, in order.
+STAGED_COLUMNS = (
+    "line",
+    "first_name",
+    "middle_name",
+    "last_name",
+    "email",
+    "phone_number",
+    "street_one",
+    "street_two",
+    "city",
+    "state",
+    "postal_code",
+    "country",
+    "hash",
+    "created_by",
+)
+
+# Rows are copied into a temporary table, which only the importing connection can see,
+# and which is emptied when each batch's transaction commits.
+_staging = Table(
+    "party_import",
+    MetaData(),
+    *(Column(name, BigInteger if name == "line" else Text) for name in STAGED_COLUMNS),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DELETE ROWS",
+)
+
+_ADDRESS_COLUMNS = (
+    "street_one",
+    "street_two",
+    "city",
+    "state",
+    "postal_code",
+    "country",
+)
+_PARTY_COLUMNS = ("first_name", "middle_name", "last_name", "email", "phone_number")
+
+
+class PartyImportRepository:
+    """
+    Data access layer for bulk imports of parties.
+
+    Validated rows are streamed into a staging table with COPY, and then merged into the address, party
+    and party history tables with set-based statements, so each batch takes a handful of statements
+    no matter how many rows it has. Postgres only.
+    """
+
+    def __init__(self, session: DatabaseSession) -> None:
+        self._session = session
+
+    def get_checkpoint(self, job: str) -> int:
+        """Get the last line of the job's file that was imported, or 0 if the job hasn't imported anything."""
+        checkpoint = self._session.get(ImportCheckpoint, job)
+        return checkpoint.line if checkpoint else 0
+
+    def save_checkpoint(self, job: str, line: int, user: str) -> None:
+        """
+        Record that the job's file was imported up to the line. Saved in the same transaction
+        as the rows it covers, so a resumed import neither skips nor duplicates rows.
+        """
+        statement = (
+            insert(ImportCheckpoint)
+            .values(job=job, line=line, created_by=user, updated_by=user)
+            .on_conflict_do_update(
+                index_elements=[ImportCheckpoint.job],
+                set_={"line": line, "updated_by": user, "updated_at": func.now()},
+            )
+        )
+        self._session.execute(statement)
+
+    def copy_to_staging(self, rows: Sequence[Sequence[Any]]) -> None:
+        """
+        Stream rows into the staging table with COPY.
+        :param rows: Rows with the values of STAGED_COLUMNS, in order. None is stored as NULL.
+        """
+        connection = self._session.connection()
+        _staging.create(connection, checkfirst=True)
+
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        cursor: Any = connection.connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {_staging.name} ({', '.join(STAGED_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        finally:
+            cursor.close()
+
+    def merge_staging(self) -> int:
+        """
+        Merge the staged rows into the address, party and party history tables.
+
+        Addresses are deduplicated by hash, among the staged rows and against the existing addresses.
+        The parties are inserted in line order, and their history records are created from
+        the inserted rows in the same statement.
+        :return: The number of parties inserted.
+        """
+        staged = _staging.c
+        address = cast(Table, Address.__table__)
+        party = cast(Table, Party.__table__)
+        history = cast(Table, PartyHistory.__table__)
+
+        self._session.execute(
+            insert(address)
+            .from_select(
+                [*_ADDRESS_COLUMNS, "hash", "created_by", "updated_by"],
+                select(
+                    *(staged[name] for name in _ADDRESS_COLUMNS),
+                    staged.hash,
+                    staged.created_by,
+                    staged.created_by,
+                )
+                .ext(distinct_on(staged.hash))
+                .order_by(staged.hash, staged.line),
+            )
+            .on_conflict_do_nothing(index_elements=[address.c.hash])
+        )
+
+        inserted = (
+            insert(party)
+            .from_select(
+                [*_PARTY_COLUMNS, "address_id", "created_by", "updated_by"],
+                select(
+                    *(staged[name] for name in _PARTY_COLUMNS),
+                    address.c.id,
+                    staged.created_by,
+                    staged.created_by,
+                )
+                .join(address, address.c.hash == staged.hash)
+                .order_by(staged.line),
+            )
+            .returning(*party.c)
+            .cte("inserted")
+        )
+        result = self._session.execute(
+            insert(history).from_select(
+                [
+                    "party_id",
+                    *_PARTY_COLUMNS,
+                    "street_one",
+                    "street_two",
+                    "city",
+                    "state",
+                    "zip_code",
+                    "country",
+                    "party_created_at",
+                    "party_updated_at",
+                    "party_created_by",
+                    "party_updated_by",
+                    "created_by",
+                    "updated_by",
+                ],
+                select(
+                    inserted.c.id,
+                    *(inserted.c[name] for name in _PARTY_COLUMNS),
+                    *(address.c[name] for name in _ADDRESS_COLUMNS),
+                    inserted.c.created_at,
+                    inserted.c.updated_at,
+                    inserted.c.created_by,
+                    inserted.c.updated_by,
+                    inserted.c.updated_by,
+                    inserted.c.updated_by,
+                ).join(address, address.c.id == inserted.c.address_id),
+            )
+        )
+        return cast(CursorResult[Any], result).rowcount
@@ -1,11 +1,164 @@
-from sqlalchemy.orm import Session
+from collections.abc import Iterator
+from datetime import datetime
+from typing import Any, Sequence
+
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload
+from sqlalchemy.sql import bindparam, or_, select, tuple_
 
 from src.repository.base_repository import BaseRepository
+from src.models.address import Address
 from src.models.party import Party
+from src.util.custom_types import DatabaseSession
+
+# Built once, so every lookup reuses the same statement object and its compiled form is taken from
+# the engine's compiled cache without rebuilding the statement. address_id is NOT NULL, so the address
+# can be inner joined, which also lets the row be locked with FOR UPDATE.
+_GET_WITH_ADDRESS = (
+    select(Party)
+    .options(joinedload(Party.address, innerjoin=True))
+    .where(Party.id == bindparam("id"))
+)
+_GET_WITH_ADDRESS_FOR_UPDATE = _GET_WITH_ADDRESS.with_for_update(of=Party)
 
 
 class PartyRepository(BaseRepository[Party]):
     """Data access layer for party entities."""
 
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: DatabaseSession) -> None:
         super().__init__(session, Party)
+
+    def get_by_id(self, id: int) -> Party:
+        """
+        Get a party by ID with its address joined in the same statement, so mapping it to a response
+        doesn't lazy load the address with a second query.
+        :raises NoResultFound: If the party doesn't exist.
+        """
+        return self._session.scalars(_GET_WITH_ADDRESS, {"id": id}).one()
+
+    def get_by_id_for_update(self, id: int) -> Party:
+        """
+        Same as get_by_id, but the party's row is locked until the transaction ends so it can't be changed concurrently.
+        :raises NoResultFound: If the party doesn't exist.
+        """
+        return self._session.scalars(_GET_WITH_ADDRESS_FOR_UPDATE, {"id": id}).one()
+
+    def get_by_ids(self, ids: Sequence[int]) -> Sequence[Party]:
+        """Get all parties with the provided IDs in one query, with their address joined in the same statement."""
+        return (
+            self._session.execute(
+                select(Party)
+                .where(Party.id.in_(ids))
+                .options(joinedload(Party.address))
+            )
+            .scalars()
+            .all()
+        )
+
+    def get_page(
+        self,
+        last_name: str | None = None,
+        email: str | None = None,
+        postal_code: str | None = None,
+        state: str | None = None,
+        updated_since: datetime | None = None,
+        after: tuple[Any, ...] | None = None,
+        limit: int = 50,
+    ) -> list[tuple[int, datetime]]:
+        """
+        Get the ID and update time of a page of parties matching the filters, in keyset order:
+        by update time and ID if filtered by updated_since, otherwise by ID.
+
+        Only the keys are selected, so the parties themselves can be read from the cache. A page starts right
+        after the sort key of the previous page's last party instead of skipping an OFFSET, so every page
+        is one range scan of an index (see the party and address table args), however deep it is.
+        :param after: The sort key of the previous page's last party, (updated_at, id) or (id,).
+        """
+        statement = select(Party.id, Party.updated_at)
+        if last_name is not None:
+            statement = statement.where(Party.last_name == last_name)
+        if email is not None:
+            statement = statement.where(Party.email == email)
+        if postal_code is not None or state is not None:
+            statement = statement.join(Party.address)
+            if postal_code is not None:
+                statement = statement.where(Address.postal_code == postal_code)
+            if state is not None:
+                statement = statement.where(Address.state == state)
+
+        keys: tuple[Any, ...] = (Party.id,)
+        if updated_since is not None:
+            statement = statement.where(Party.updated_at >= updated_since)
+            keys = (Party.updated_at, Party.id)
+        if after is not None:
+            statement = statement.where(tuple_(*keys) > tuple_(*after))
+        return [
+            (id, updated_at)
+            for id, updated_at in self._session.execute(
+                statement.order_by(*keys).limit(limit)
+            )
+        ]
+
+    def search(self, query: str, limit: int, timeout_ms: int) -> list[int]:
+        """
+        Get the IDs of the parties whose first name, last name or email contain every word of the query,
+        most relevant first. Relevance is the trigram similarity of the query to the closest of the fields
+        or the full name. Postgres only, as it needs the pg_trgm extension.
+
+        Substring matches are served by the trigram GIN indexes of the three fields (see the party table args).
+        The statement is cancelled after timeout_ms, so a search matching too many rows can't hold a connection
+        for long. The timeout is local to the transaction, which the caller must end. The timeout and the search
+        are run on the same connection, so a session that routes its statements can't send them to different databases.
+        :raises OperationalError: If the search was cancelled (SQLSTATE 57014).
+        """
+        connection = self._session.connection()
+        connection.execute(
+            select(func.set_config("statement_timeout", f"{timeout_ms}ms", True))
+        )
+        fields = (Party.first_name, Party.last_name, Party.email)
+        matches = (
+            or_(*(field.ilike(_contains(word), escape="\\") for field in fields))
+            for word in query.split()
+        )
+        rank = func.greatest(
+            *(func.similarity(field, query) for field in fields),
+            func.similarity(
+                func.concat_ws(" ", Party.first_name, Party.last_name), query
+            ),
+        ).label("rank")
+        statement = (
+            select(Party.id, rank)
+            .where(*matches)
+            .order_by(rank.desc(), Party.id)
+            .limit(limit)
+        )
+        return list(connection.scalars(statement))
+
+    def stream(
+        self,
+        min_id: int | None = None,
+        max_id: int | None = None,
+        updated_since: datetime | None = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Party]:
+        """
+        Iterate over parties in ID order with their address joined, optionally within an ID range (inclusive)
+        or updated since a point in time. Rows are fetched from a server-side cursor in batches,
+        so any number of parties can be iterated with bounded memory.
+        """
+        statement = select(Party).options(joinedload(Party.address)).order_by(Party.id)
+        if min_id is not None:
+            statement = statement.where(Party.id >= min_id)
+        if max_id is not None:
+            statement = statement.where(Party.id <= max_id)
+        if updated_since is not None:
+            statement = statement.where(Party.updated_at >= updated_since)
+        yield from self._session.scalars(
+            statement.execution_options(yield_per=batch_size)
+        )
+
+
+def _contains(word: str) -> str:
+    """A LIKE pattern matching strings that contain the word, with its LIKE wildcards escaped."""
+    escaped = word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
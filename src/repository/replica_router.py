@@ -0,0 +1,162 @@
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Sequence
+
+from sqlalchemy import Connection, Engine, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ClauseElement
+
+logger = logging.getLogger(__name__)
+
+# Keys of Session.info
+# Set while the session runs the reads of a read-only unit of work (see UnitOfWork.read_only).
+READ_ONLY = "read_only"
+# Set once the session wrote to the primary, so its later reads see the writes.
+WROTE = "wrote"
+# The replica the session reads from, so all of its reads see the same snapshot of one replica.
+REPLICA = "replica"
+
+# Seconds a replica's replayed WAL is behind the WAL it received, or 0 if it replayed everything it received.
+# A database that isn't in recovery (ex. a plain database standing in for a replica) has no lag.
+_REPLICATION_LAG = text(
+    """
+    SELECT CASE
+        WHEN pg_is_in_recovery() AND pg_last_wal_receive_lsn() IS DISTINCT FROM pg_last_wal_replay_lsn()
+        THEN coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0)
+        ELSE 0
+    END
+    """
+)
+
+
+class ReplicaRouter:
+    """Choose the engine each statement of a session is sent to: the primary, or one of the read replicas.
+
+    Only reads of read-only units of work go to a replica, everything else goes to the primary. A session picks
+    its replica round-robin on its first replica read, and keeps it until it is closed. Reads fall back to the primary:
+    - if the session already wrote, so a request reads its own writes (read-your-writes).
+    - if the replica is lagging more than max_lag seconds behind the primary, or its lag can't be measured.
+
+    The lag of a replica is measured at most every lag_check_interval seconds, on a connection of its own pool.
+    """
+
+    def __init__(
+        self,
+        primary: Engine,
+        replicas: Sequence[Engine] = (),
+        max_lag: float = 5.0,
+        lag_check_interval: float = 1.0,
+    ) -> None:
+        self.primary = primary
+        self.replicas = list(replicas)
+        self._max_lag = max_lag
+        self._lag_check_interval = lag_check_interval
+        self._next_replica = itertools.cycle(range(len(self.replicas)))
+        self._lock = threading.Lock()
+        # (lag in seconds, or None if it couldn't be measured, monotonic time it was measured) per replica
+        self._lags: dict[int, tuple[float | None, float]] = {}
+        self._counters = {
+            "primaryReads": 0,
+            "primaryWrites": 0,
+            "readYourWritesFallbacks": 0,
+            "lagFallbacks": 0,
+        }
+        self._replica_reads = [0] * len(self.replicas)
+
+    def engine_for(self, info: dict[str, Any], write: bool) -> Engine:
+        """
+        Get the engine of a statement, given the session's info.
+        :param info: The info of the session running the statement.
+        :param write: Whether the statement writes, ex. a flush or a DML statement.
+        """
+        if write:
+            info[WROTE] = True
+            self._count("primaryWrites")
+            return self.primary
+        if not self.replicas or not info.get(READ_ONLY):
+            self._count("primaryReads")
+            return self.primary
+        if info.get(WROTE):
+            self._count("primaryReads", "readYourWritesFallbacks")
+            return self.primary
+
+        if (index := info.get(REPLICA)) is None:
+            with self._lock:
+                index = info[REPLICA] = next(self._next_replica)
+        lag = self._lag(index)
+        if lag is None or lag > self._max_lag:
+            self._count("primaryReads", "lagFallbacks")
+            return self.primary
+        with self._lock:
+            self._replica_reads[index] += 1
+        return self.replicas[index]
+
+    def stats(self) -> dict[str, Any]:
+        """Counters of the statements routed to each pool, and the fallbacks to the primary."""
+        with self._lock:
+            return {
+                "primary": {
+                    "reads": self._counters["primaryReads"],
+                    "writes": self._counters["primaryWrites"],
+                    "pool": self.primary.pool.status(),
+                },
+                "replicas": [
+                    {
+                        "reads": self._replica_reads[index],
+                        "lag": self._lags.get(index, (None, 0.0))[0],
+                        "pool": replica.pool.status(),
+                    }
+                    for index, replica in enumerate(self.replicas)
+                ],
+                "readYourWritesFallbacks": self._counters["readYourWritesFallbacks"],
+                "lagFallbacks": self._counters["lagFallbacks"],
+            }
+
+    def _count(self, *counters: str) -> None:
+        with self._lock:
+            for counter in counters:
+                self._counters[counter] += 1
+
+    def _lag(self, index: int) -> float | None:
+        """The last measured lag of a replica, measured again if it is older than the check interval."""
+        with self._lock:
+            lag, measured_at = self._lags.get(index, (None, float("-inf")))
+            if time.monotonic() - measured_at < self._lag_check_interval:
+                return lag
+            # other threads keep using the previous measurement while this one is taken
+            self._lags[index] = (lag, time.monotonic())
+
+        try:
+            lag = self._measure_lag(self.replicas[index])
+        except SQLAlchemyError as e:
+            logger.warning(f"Could not measure the lag of replica {index}: {e}")
+            lag = None
+        with self._lock:
+            self._lags[index] = (lag, time.monotonic())
+        return lag
+
+    @staticmethod
+    def _measure_lag(engine: Engine) -> float:
+        with engine.connect() as connection:
+            return float(connection.scalar(_REPLICATION_LAG) or 0)
+
+
+class RoutingSession(Session):
+    """A session whose statements are sent to the primary or a read replica by a ReplicaRouter."""
+
+    def __init__(self, *args: Any, router: ReplicaRouter, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.router = router
+
+    def get_bind(
+        self,
+        mapper: Any = None,
+        *,
+        clause: ClauseElement | None = None,
+        **kwargs: Any,
+    ) -> Engine | Connection:
+        write = self._flushing or getattr(clause, "is_dml", False)
+        return self.router.engine_for(self.info, write)
@@ -1,11 +1,14 @@
 import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
 from types import TracebackType
 
-from sqlalchemy.orm import Session
 
 from src.repository.party_history_repository import PartyHistoryRepository
 from src.repository.address_repository import AddressRepository
 from src.repository.party_repository import PartyRepository
+from src.repository.replica_router import READ_ONLY
+from src.util.custom_types import DatabaseSession
 
 uow_logger = logging.getLogger(__name__)
 
@@ -14,11 +17,17 @@ class UnitOfWork:
     """The class will manage transactions across multiple repositories.
 
     This avoids the need to handle transactions using multiple repositories.
+
+    In the app, the session is the app's scoped session, so a transaction is started, committed or
+    rolled back on the session of the current request only (see init_db).
+
+    Reads that don't need to see the latest writes can be made in a read-only block (see read_only),
+    which sends them to a read replica if any are configured.
     """
 
     def __init__(
         self,
-        session: Session,
+        session: DatabaseSession,
         party_repository: PartyRepository,
         address_repository: AddressRepository,
         party_history_repository: PartyHistoryRepository,
@@ -65,3 +74,17 @@ class UnitOfWork:
         of how it will be persisted in the database, before we actually commit. Useful for getting the IDs of entities.
         """
         self.session.flush()
+
+    @contextmanager
+    def read_only(self) -> Iterator[None]:
+        """
+        Mark the reads of the block as read-only, so they are sent to a read replica if the session routes
+        its statements (see ReplicaRouter). They are still sent to the primary if the session already wrote,
+        or if the replica is lagging. Writes are always sent to the primary.
+        """
+        previous = self.session.info.get(READ_ONLY, False)
+        self.session.info[READ_ONLY] = True
+        try:
+            yield
+        finally:
+            self.session.info[READ_ONLY] = previous
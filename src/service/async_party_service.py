@@ -0,0 +1,190 @@
+import logging
+import time
+from typing import Any, Sequence
+from redis import RedisError
+from sqlalchemy.exc import NoResultFound
+from src.exception.custom_exceptions import EntityNotFound
+from src.dto.request_dtos import PartyCreate
+from src.util.enums import ServiceEntities
+from src.repository.async_cache_repository import AsyncCacheRepository
+from src.util import helpers, mappers
+from src.models.party import Party
+from src.repository.async_unit_of_work import AsyncUnitOfWork
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncPartyService:
+    """Orchestrate the business logic of the async stack for the Party entity.
+
+    Same as PartyService for getting a Party by ID, getting multiple Parties by ID, and creating a new Party.
+    The request DTOs, the mappers and the cache entries are shared with the sync stack,
+    so both stacks return the same responses.
+
+    Features of the sync stack that rely on threads aren't available: single-flight rebuilds and early refreshes
+    of cache entries, write-behind cache writes, and the address lookup cache. Cache writes are awaited instead.
+    """
+
+    def __init__(
+        self,
+        unit_of_work: AsyncUnitOfWork,
+        cache_repository: AsyncCacheRepository,
+    ):
+        self._uow = unit_of_work
+        self._cache_repository = cache_repository
+
+    async def get_party_json(self, party_id: int) -> bytes:
+        """
+        Get a Party by ID from the database, serialized to JSON once,
+        and write the same bytes to the cache that are returned as the response body.
+        """
+        started = time.perf_counter()
+        party = await self._get_party_by_id(party_id)
+        body = helpers.to_json_bytes(mappers.to_party_response(party).to_dict())
+        await self._write_to_cache(
+            party, body, compute_time=time.perf_counter() - started
+        )
+        return body
+
+    async def get_parties(self, party_ids: Sequence[int]) -> dict[str, Any]:
+        """
+        Get multiple Parties by ID (see PartyService.get_parties).
+        All IDs are resolved from the cache first, and only the misses are loaded from the database in one query.
+        """
+        unique_ids = list(dict.fromkeys(party_ids))
+        found = await self._read_many_from_cache(unique_ids)
+
+        if misses := [party_id for party_id in unique_ids if party_id not in found]:
+            logger.debug(f"Getting {len(misses)} Parties from database.")
+            loaded = {
+                party.id: mappers.to_party_response(party).to_dict()
+                for party in await self._uow.party_repository.get_by_ids(misses)
+            }
+            await self._write_many_to_cache(
+                loaded, [party_id for party_id in misses if party_id not in loaded]
+            )
+            found.update(loaded)
+
+        return {
+            "parties": [
+                party for party_id in unique_ids if (party := found.get(party_id))
+            ],
+            "errors": [
+                {
+                    "id": party_id,
+                    "status": 404,
+                    "detail": str(EntityNotFound(ServiceEntities.PARTY, party_id)),
+                }
+                for party_id in unique_ids
+                if found.get(party_id) is None
+            ],
+        }
+
+    async def add_party(self, party_request: PartyCreate) -> dict[str, Any]:
+        """Create a new Party, its Party History, and then write the Party to the cache (see PartyService.add_party).
+
+        The cache write occurs outside the transaction, so the Party is kept if the cache write fails.
+        """
+        async with self._uow:
+            address = mappers.to_address(party_request.address)
+            address.created_by = party_request.meta.created_by
+            address.updated_by = party_request.meta.created_by
+            logger.debug(
+                f"Getting or creating Address with hash: {address.hash} in database."
+            )
+            address = await self._uow.address_repository.get_or_create(address)
+
+            party = mappers.to_party(party_request)
+            party.address = address
+            logger.debug("Inserting new Party into database.")
+            self._uow.party_repository.add(party)
+            # the insert returns the generated ID and audit timestamps, which the Party History is created from
+            await self._uow.flush()
+            self._uow.party_history_repository.add(mappers.to_party_history(party))
+            party_response = mappers.to_party_response(party).to_dict()
+
+        # the ID may have been cached as not found, so overwrite it everywhere
+        await self._write_to_cache(party, party_response, invalidate=True)
+        logger.info(f"Party with ID {party.id} successfully created.")
+        return party_response
+
+    async def _get_party_by_id(self, party_id: int) -> Party:
+        """
+        Get a Party from the database via the provided ID.
+        If it doesn't exist, cache that fact so repeated lookups for the same ID don't reach the database.
+        """
+        logger.debug(f"Getting Party with ID: {party_id} from database.")
+        try:
+            return await self._uow.party_repository.get_by_id(party_id)
+        except NoResultFound:
+            await self._write_tombstone_to_cache(party_id)
+            raise EntityNotFound(ServiceEntities.PARTY, party_id)
+
+    async def _write_to_cache(
+        self,
+        party: Party,
+        res: dict[str, Any] | bytes,
+        invalidate: bool = False,
+        compute_time: float = 0.0,
+    ) -> None:
+        """
+        Write the party to the cache, after it was created or retrieved from the database after a cache miss.
+        When the party was created, every worker is told to drop its locally cached copy.
+        """
+        logger.debug(f"Writing Party with ID: {party.id} into cache.")
+        try:
+            await self._cache_repository.add(
+                party.id,
+                ServiceEntities.PARTY,
+                res,
+                invalidate=invalidate,
+                compute_time=compute_time,
+            )
+        except RedisError as e:
+            logger.warning(
+                f"Could not write Party with ID {party.id} to cache due to Redis Error: {e}."
+            )
+
+    async def _write_tombstone_to_cache(self, party_id: int) -> None:
+        """
+        Cache that the party doesn't exist.
+        """
+        logger.debug(f"Writing tombstone for Party with ID: {party_id} into cache.")
+        try:
+            await self._cache_repository.add_tombstone(party_id, ServiceEntities.PARTY)
+        except RedisError as e:
+            logger.warning(
+                f"Could not write tombstone for Party with ID {party_id} to cache due to Redis Error: {e}."
+            )
+
+    async def _read_many_from_cache(
+        self, party_ids: list[int]
+    ) -> dict[int, dict[str, Any] | None]:
+        """
+        Read multiple parties from the cache. Parties cached as not existing have a value of None.
+        If the cache is unavailable, treat every ID as a miss.
+        """
+        try:
+            return await self._cache_repository.get_many(
+                party_ids, ServiceEntities.PARTY
+            )
+        except RedisError as e:
+            logger.warning(f"Could not get Parties from cache due to Redis Error: {e}.")
+            return {}
+
+    async def _write_many_to_cache(
+        self, res: dict[int, dict[str, Any]], not_found: list[int]
+    ) -> None:
+        """
+        Write multiple parties to the cache after they were loaded from the database during a batch read,
+        and tombstones for the parties that don't exist.
+        """
+        if not res and not not_found:
+            return
+        logger.debug(f"Writing {len(res)} Parties into cache.")
+        try:
+            await self._cache_repository.add_many(ServiceEntities.PARTY, res, not_found)
+        except RedisError as e:
+            logger.warning(
+                f"Could not write {len(res)} Parties to cache due to Redis Error: {e}."
+            )
@@ -1,12 +1,30 @@
 import logging
-from typing import Any
+import time
+from collections.abc import Iterator
+from datetime import datetime
+from typing import Any, Sequence
+from pydantic import ValidationError
 from redis import RedisError
+from sqlalchemy.exc import NoResultFound, OperationalError
+from src.exception.custom_exceptions import (
+    EntityNotFound,
+    PreconditionFailed,
+    SearchTimeout,
+)
 from src.dto.request_dtos import MetaCreate, MetaUpdate
 from src.dto.request_dtos import AddressCreate, AddressUpdate
 from src.util.enums import ServiceEntities
+from src.repository.address_lookup_cache import AddressLookupCache
 from src.repository.cache_repository import CacheRepository
-from src.dto.request_dtos import PartyCreate, PartyUpdate
-from src.util import mappers
+from src.repository.cache_writer import CacheWriter
+from src.dto.request_dtos import (
+    PartyBatchCreate,
+    PartyCreate,
+    PartyList,
+    PartySearch,
+    PartyUpdate,
+)
+from src.util import helpers, mappers
 from src.models.address import Address
 from src.models.party import Party
 from src.models.party_history import PartyHistory
@@ -14,6 +32,9 @@ from src.repository.unit_of_work import UnitOfWork
 
 logger = logging.getLogger(__name__)
 
+# SQLSTATE of a statement cancelled by its statement timeout
+_QUERY_CANCELED = "57014"
+
 # TODO: fix unit tests!!
 
 
@@ -22,11 +43,26 @@ class PartyService:
 
     This business logic currently entails getting a Party by ID, updating a Party (PATCH),
     and creating a new Party (POST).
+
+    Reads that don't need to see the latest writes (the pages of IDs of listing and searching, and exporting Parties)
+    are made in read-only blocks of the unit of work, so they are served by a read replica if any are configured.
+    Parties that are written to the cache are always read from the primary: an entry filled from a lagging replica
+    could overwrite a newer one, and would be served until it expires.
     """
 
-    def __init__(self, unit_of_work: UnitOfWork, cache_repository: CacheRepository):
+    def __init__(
+        self,
+        unit_of_work: UnitOfWork,
+        cache_repository: CacheRepository,
+        cache_writer: CacheWriter | None = None,
+        address_lookup_cache: AddressLookupCache | None = None,
+        search_timeout_ms: int = 500,
+    ):
         self._uow = unit_of_work
         self._cache_repository = cache_repository
+        self._cache_writer = cache_writer
+        self._address_lookup_cache = address_lookup_cache
+        self._search_timeout_ms = search_timeout_ms
 
     def get_party(self, party_id: int) -> dict[str, Any]:
         """
@@ -34,11 +70,142 @@ class PartyService:
         The reason the cache write occurs is that if the code gets to this point, then
         the cache_read decorator resulted in a cache miss.
         """
+        started = time.perf_counter()
         party = self._get_party_by_id(party_id)
         party_response = mappers.to_party_response(party).to_dict()
-        self._write_to_cache(party.id, party_response)
+        self._write_to_cache(
+            party, party_response, compute_time=time.perf_counter() - started
+        )
         return party_response
 
+    def get_party_json(self, party_id: int) -> bytes:
+        """
+        Same as get_party, but the Party is serialized to JSON once,
+        and the same bytes are written to the cache and returned as the response body.
+        """
+        started = time.perf_counter()
+        party = self._get_party_by_id(party_id)
+        body = helpers.to_json_bytes(mappers.to_party_response(party).to_dict())
+        self._write_to_cache(party, body, compute_time=time.perf_counter() - started)
+        return body
+
+    def get_parties(self, party_ids: Sequence[int]) -> dict[str, Any]:
+        """
+        Get multiple Parties by ID.
+
+        All IDs are resolved from the cache first. Only the misses are loaded from the database in one query,
+        and then written back to the cache in one pipelined round-trip, along with tombstones for IDs that don't exist.
+        IDs that don't exist are reported individually instead of failing the whole request.
+        """
+        unique_ids = list(dict.fromkeys(party_ids))
+        found = self._get_parties_by_ids(unique_ids)
+        return {
+            "parties": [
+                party for party_id in unique_ids if (party := found.get(party_id))
+            ],
+            "errors": [
+                {
+                    "id": party_id,
+                    "status": 404,
+                    "detail": str(EntityNotFound(ServiceEntities.PARTY, party_id)),
+                }
+                for party_id in unique_ids
+                if found.get(party_id) is None
+            ],
+        }
+
+    def list_parties(self, list_request: PartyList) -> dict[str, Any]:
+        """
+        Get a page of the Parties matching the filters of the request, and the cursor of the next page.
+
+        Only the keys of the page are read from the database, from the filters' indexes (see PartyRepository.get_page).
+        The Parties themselves are resolved like a batch get: from the cache first, and then the misses from the
+        database in one query. One more key than the page size is read, to tell whether there is a next page.
+        """
+        after: tuple[Any, ...] | None = None
+        if cursor := list_request.cursor:
+            after = (
+                (cursor["updatedAt"], cursor["id"])
+                if list_request.updated_since is not None
+                else (cursor["id"],)
+            )
+
+        logger.debug(f"Getting a page of {list_request.limit} Party IDs from database.")
+        with self._uow, self._uow.read_only():
+            keys = self._uow.party_repository.get_page(
+                last_name=list_request.last_name,
+                email=list_request.email,
+                postal_code=list_request.postal_code,
+                state=list_request.state,
+                updated_since=list_request.updated_since,
+                after=after,
+                limit=list_request.limit + 1,
+            )
+        page = keys[: list_request.limit]
+        found = self._get_parties_by_ids([party_id for party_id, _ in page])
+
+        next_cursor = None
+        if len(keys) > list_request.limit:
+            last_id, last_updated_at = page[-1]
+            next_cursor = helpers.encode_cursor(
+                {"updatedAt": last_updated_at.isoformat(), "id": last_id}
+                if list_request.updated_since is not None
+                else {"id": last_id}
+            )
+        return {
+            # a Party deleted since its key was read is left out
+            "parties": [
+                party for party_id, _ in page if (party := found.get(party_id))
+            ],
+            "nextCursor": next_cursor,
+        }
+
+    def search_parties(self, search_request: PartySearch) -> dict[str, Any]:
+        """
+        Get the Parties whose names or email contain every word of the query, most relevant first.
+
+        Only the IDs are searched for in the database, and the Parties are resolved through the cache like a batch get.
+        The search is cancelled once it runs longer than the search timeout, so a query matching a large part of
+        the table fails fast instead of holding its connection.
+        """
+        logger.debug(f"Searching Parties matching '{search_request.q}' in database.")
+        try:
+            with self._uow, self._uow.read_only():
+                party_ids = self._uow.party_repository.search(
+                    search_request.q, search_request.limit, self._search_timeout_ms
+                )
+        except OperationalError as e:
+            if getattr(e.orig, "pgcode", None) != _QUERY_CANCELED:
+                raise
+            raise SearchTimeout(self._search_timeout_ms) from e
+
+        found = self._get_parties_by_ids(party_ids)
+        return {
+            "parties": [
+                party for party_id in party_ids if (party := found.get(party_id))
+            ]
+        }
+
+    def export_parties(
+        self, updated_since: datetime | None = None, batch_size: int = 1000
+    ) -> Iterator[bytes]:
+        """
+        Stream every Party, optionally only the ones updated since a point in time, as NDJSON lines in ID order.
+
+        Parties are read with their Address from a server-side cursor in batches, and serialized one at a time,
+        so memory use doesn't grow with the number of Parties. The cache is bypassed,
+        since every Party is read exactly once.
+        """
+        logger.debug(f"Exporting Parties updated since {updated_since} from database.")
+        with self._uow.read_only():
+            for party in self._uow.party_repository.stream(
+                updated_since=updated_since, batch_size=batch_size
+            ):
+                yield (
+                    helpers.to_json_bytes(mappers.to_party_response(party).to_dict())
+                    + b"\n"
+                )
+
     def add_party(self, party_request: PartyCreate) -> dict[str, Any]:
         """Create a new Party.
 
@@ -47,6 +214,9 @@ class PartyService:
 
         The cache write occurs outside the transaction, as we don't want the transaction to rollback
         if the cache write fails. At least retain the newly created Party in the database at that point.
+
+        The address is resolved in one statement, and the Party is flushed once. The Party History is inserted
+        when the transaction commits, so a new Party takes three statements.
         """
         with self._uow:
             address = self._get_address_or_create(
@@ -58,11 +228,81 @@ class PartyService:
             self._create_party_history(mappers.to_party_history(party))
             party_response = mappers.to_party_response(party).to_dict()
 
-        self._write_to_cache(party.id, party_response)
+        # the ID may have been cached as not found, so overwrite it everywhere
+        self._write_to_cache(party, party_response, invalidate=True)
         logger.info(f"Party with ID {party.id} successfully created.")
         return party_response
 
-    def update_party(self, party_id: int, party_request: PartyUpdate) -> dict[str, Any]:
+    def add_parties(self, batch_request: PartyBatchCreate) -> dict[str, Any]:
+        """
+        Create multiple Parties in one transaction.
+
+        Every Party is validated on its own, and its result is reported at the same index as in the request.
+        If the batch is atomic and any Party is invalid, nothing is created, and the valid Parties are reported
+        as failed because of the others (424).
+
+        Addresses are deduplicated within the batch by hash. The existing ones are resolved with one query,
+        and the new ones are created with one multi-row insert. The Parties and their Party History records are
+        inserted with multi-row inserts too, and all new Parties are written to the cache in one pipelined round-trip
+        after the transaction commits. A database error fails the whole batch, in either mode.
+        """
+        results: list[dict[str, Any]] = [{} for _ in batch_request.parties]
+        valid: dict[int, PartyCreate] = {}
+        for index, payload in enumerate(batch_request.parties):
+            try:
+                valid[index] = PartyCreate.model_validate(payload)
+            except ValidationError as e:
+                results[index] = {
+                    "status": 422,
+                    "detail": "Request validation failed",
+                    "validationErrors": helpers.to_validation_errors(e),
+                }
+
+        if batch_request.atomic and len(valid) < len(batch_request.parties):
+            for index in valid:
+                results[index] = {
+                    "status": 424,
+                    "detail": "Party was not created because other Parties in the batch are invalid.",
+                }
+            return {"results": results}
+        if not valid:
+            return {"results": results}
+
+        with self._uow:
+            addresses = self._get_addresses_or_create(list(valid.values()))
+            parties: dict[int, Party] = {}
+            for index, party_request in valid.items():
+                party = mappers.to_party(party_request)
+                party.address = addresses[party_request.address.get_hash()]
+                parties[index] = party
+            logger.debug(f"Inserting {len(parties)} new Parties into database.")
+            self._uow.party_repository.add_all(parties.values())
+            self._uow.flush()
+            self._uow.party_history_repository.add_all(
+                mappers.to_party_history(party) for party in parties.values()
+            )
+            party_responses = {
+                index: mappers.to_party_response(party).to_dict()
+                for index, party in parties.items()
+            }
+
+        # the IDs may have been cached as not found, so overwrite them everywhere
+        self._write_many_to_cache(
+            {parties[index].id: res for index, res in party_responses.items()},
+            [],
+            invalidate=True,
+        )
+        for index, res in party_responses.items():
+            results[index] = {"status": 201, "party": res}
+        logger.info(f"{len(parties)} Parties successfully created.")
+        return {"results": results}
+
+    def update_party(
+        self,
+        party_id: int,
+        party_request: PartyUpdate,
+        if_match: set[str] | None = None,
+    ) -> dict[str, Any]:
         """
         Update an existing Party.
 
@@ -80,13 +320,23 @@ class PartyService:
 
         To maintain idempotency, if nothing was updated, the party entity will not be updated,
         and it will be returned as is.
+
+        If the client sent the ETags it expects the party to have (If-Match), the party row is locked and
+        the update is rejected when the party's current ETag isn't one of them, so a client can't overwrite
+        changes it hasn't seen. "*" matches any existing party.
         """
         # use this flag to ensure we actually updated the entity
         # we will need this at the end.
         was_updated = False
 
         with self._uow:
-            party = self._get_party_by_id(party_id)
+            party = self._get_party_by_id(party_id, for_update=if_match is not None)
+            if if_match is not None and "*" not in if_match:
+                current = helpers.to_json_bytes(
+                    mappers.to_party_response(party).to_dict()
+                )
+                if helpers.etag(current) not in if_match:
+                    raise PreconditionFailed(ServiceEntities.PARTY, party_id)
 
             if address_request := party_request.address:
                 #### Address Update Flow #####
@@ -125,7 +375,7 @@ class PartyService:
                 self._uow.flush()
                 self._create_party_history(mappers.to_party_history(party))
                 party_response = mappers.to_party_response(party).to_dict()
-                self._write_to_cache(party.id, party_response)
+                self._write_to_cache(party, party_response, invalidate=True)
                 logger.info(f"Party with ID {party.id} successfully updated.")
                 return party_response
             else:
@@ -135,6 +385,28 @@ class PartyService:
                 party_response = mappers.to_party_response(party).to_dict()
                 return party_response
 
+    def _get_parties_by_ids(
+        self, party_ids: list[int]
+    ) -> dict[int, dict[str, Any] | None]:
+        """
+        Get multiple Parties by ID through the cache, as described in get_parties.
+        Parties that don't exist have a value of None, or are left out.
+        """
+        found = self._read_many_from_cache(party_ids)
+
+        if misses := [party_id for party_id in party_ids if party_id not in found]:
+            logger.debug(f"Getting {len(misses)} Parties from database.")
+            parties = self._uow.party_repository.get_by_ids(misses)
+            loaded = {
+                party.id: mappers.to_party_response(party).to_dict()
+                for party in parties
+            }
+            self._write_many_to_cache(
+                loaded, [party_id for party_id in misses if party_id not in loaded]
+            )
+            found.update(loaded)
+        return found
+
     def _get_address_or_create(
         self,
         address_request: AddressCreate | AddressUpdate,
@@ -142,82 +414,229 @@ class PartyService:
     ) -> Address:
         """
         Given the address portion of the request payload during a PATCH or POST,
-        determine if the address already exists in the database via the calculated hash.
+        get the address with the same calculated hash, creating it if it doesn't exist yet.
 
-        If the address exists, then return it.
-        If the address does not exist, create it and then return it.
+        Known hashes are resolved through the address lookup cache. Otherwise, the address is
+        inserted unless it exists, and the stored address is returned, in one statement.
         """
         addr_hash = address_request.get_hash()
-        address = self._get_address_by_hash(addr_hash)
-
-        if address is None:
-            logger.debug(
-                f"Address with hash: {addr_hash} does not exist so creating new Address."
-            )
-            address = mappers.to_address(address_request)
-            if isinstance(meta, MetaCreate):
-                address.created_by = meta.created_by
-                address.updated_by = meta.created_by
-            elif isinstance(meta, MetaUpdate):
-                address.created_by = meta.updated_by
-                address.updated_by = meta.updated_by
-            self._create_address(address)
-
+        if (address := self._get_cached_address(addr_hash)) is not None:
+            return address
+
+        address = mappers.to_address(address_request)
+        if isinstance(meta, MetaCreate):
+            address.created_by = meta.created_by
+            address.updated_by = meta.created_by
+        elif isinstance(meta, MetaUpdate):
+            address.created_by = meta.updated_by
+            address.updated_by = meta.updated_by
+
+        logger.debug(f"Getting or creating Address with hash: {addr_hash} in database.")
+        address = self._uow.address_repository.get_or_create(address)
+        # if the transaction rolls back, the ID is found to not exist on its next use and the hash is forgotten
+        self._write_address_id_to_cache(addr_hash, address.id)
         return address
 
+    def _get_addresses_or_create(
+        self, party_requests: list[PartyCreate]
+    ) -> dict[str, Address]:
+        """
+        Given the Parties of a batch create request, get the addresses with the same calculated hashes,
+        creating the ones that don't exist yet, keyed by hash. Parties sharing an address share one Address record.
+        """
+        addresses: dict[str, Address] = {}
+        for party_request in party_requests:
+            addr_hash = party_request.address.get_hash()
+            if addr_hash not in addresses:
+                address = mappers.to_address(party_request.address)
+                address.created_by = party_request.meta.created_by
+                address.updated_by = party_request.meta.created_by
+                addresses[addr_hash] = address
+
+        logger.debug(f"Getting or creating {len(addresses)} Addresses in database.")
+        return self._uow.address_repository.get_or_create_many(list(addresses.values()))
+
     def _create_party(self, party: Party) -> None:
         """
         Create a Party record, and flush afterward to have pending database changes
-        in the Party entity.
+        in the Party entity. The insert returns the generated ID and audit timestamps,
+        which the Party History record is created from.
         """
         logger.debug("Inserting new Party into database.")
         self._uow.party_repository.add(party)
         self._uow.flush()
 
-    def _create_address(self, address: Address) -> None:
-        """
-        Create an Address record, and flush afterward to have pending database changes
-        to the Address entity.
-        """
-        logger.debug("Inserting new Address into database.")
-        self._uow.address_repository.add(address)
-        self._uow.flush()
-
     def _create_party_history(self, party_history: PartyHistory) -> None:
         """
-        Create a Party History record, and flush afterward to have pending database changes
-        in the Party History entity.
+        Create a Party History record. It isn't flushed, since nothing reads it back,
+        so it is inserted when the transaction commits.
         """
         logger.debug(
             f"Inserting new Party History for Party {party_history.party_id} into database."
         )
         self._uow.party_history_repository.add(party_history)
-        self._uow.flush()
 
-    def _get_address_by_hash(self, address_hash: str) -> Address | None:
+    def _get_cached_address(self, address_hash: str) -> Address | None:
         """
-        Get an address by the provided SHA-256 hex-encoded hash string.
+        Get an address by the provided SHA-256 hex-encoded hash string, if its ID is in the address lookup cache.
+
+        The address is loaded by primary key, which is served from the session if the address is already loaded
+        (ex. the party's current address). If the cached ID no longer exists, the hash is forgotten.
         """
-        logger.debug(f"Getting Address with hash: {address_hash} from database.")
-        return self._uow.address_repository.get_by_hash(address_hash)
+        if (address_id := self._read_address_id_from_cache(address_hash)) is None:
+            return None
+        logger.debug(f"Getting Address with ID: {address_id} from database.")
+        try:
+            return self._uow.address_repository.get_by_id(address_id)
+        except NoResultFound:
+            logger.debug(
+                f"Cached Address with ID {address_id} no longer exists, forgetting hash: {address_hash}."
+            )
+            self._delete_address_id_from_cache(address_hash)
+            return None
 
-    def _get_party_by_id(self, party_id: int) -> Party:
+    def _get_party_by_id(self, party_id: int, for_update: bool = False) -> Party:
         """
-        Get a Party from the database via the provided ID.
+        Get a Party from the database via the provided ID, optionally locking its row for the rest of the transaction.
+        If it doesn't exist, cache that fact so repeated lookups for the same ID don't reach the database.
         """
         logger.debug(f"Getting Party with ID: {party_id} from database.")
-        return self._uow.party_repository.get_by_id(party_id)
-
-    def _write_to_cache(self, party_id: int, res: dict[str, Any]) -> None:
+        try:
+            if for_update:
+                return self._uow.party_repository.get_by_id_for_update(party_id)
+            return self._uow.party_repository.get_by_id(party_id)
+        except NoResultFound:
+            self._write_tombstone_to_cache(party_id)
+            raise EntityNotFound(ServiceEntities.PARTY, party_id)
+
+    def _write_to_cache(
+        self,
+        party: Party,
+        res: dict[str, Any] | bytes,
+        invalidate: bool = False,
+        compute_time: float = 0.0,
+    ) -> None:
         """
         Write the party to the cache.
         The party is written to the cache when the party is updated, newly created, or when the party
         was retrieved from the database after a cache miss.
+        When the party was updated, every worker is told to drop its locally cached copy.
+        The time it took to load the party is stored with it, to refresh the entry before it expires.
+
+        If write-behind is enabled, the write is handed off to the cache writer instead of waiting on Redis.
+        It is versioned by the party's updated_at, so a party read before an update can't overwrite the updated party.
+        """
+        if self._cache_writer:
+            logger.debug(f"Queueing Party with ID: {party.id} for cache write.")
+            version = party.updated_at.timestamp() if party.updated_at else 0.0
+            self._cache_writer.submit(
+                party.id,
+                ServiceEntities.PARTY,
+                res,
+                version,
+                invalidate=invalidate,
+                compute_time=compute_time,
+            )
+            return
+
+        logger.debug(f"Writing Party with ID: {party.id} into cache.")
+        try:
+            self._cache_repository.add(
+                party.id,
+                ServiceEntities.PARTY,
+                res,
+                invalidate=invalidate,
+                compute_time=compute_time,
+            )
+        except RedisError as e:
+            logger.warning(
+                f"Could not write Party with ID {party.id} to cache due to Redis Error: {e}."
+            )
+
+    def _write_tombstone_to_cache(self, party_id: int) -> None:
+        """
+        Cache that the party doesn't exist.
+        """
+        logger.debug(f"Writing tombstone for Party with ID: {party_id} into cache.")
+        try:
+            self._cache_repository.add_tombstone(party_id, ServiceEntities.PARTY)
+        except RedisError as e:
+            logger.warning(
+                f"Could not write tombstone for Party with ID {party_id} to cache due to Redis Error: {e}."
+            )
+
+    def _read_many_from_cache(
+        self, party_ids: list[int]
+    ) -> dict[int, dict[str, Any] | None]:
+        """
+        Read multiple parties from the cache. Parties cached as not existing have a value of None.
+        If the cache is unavailable, treat every ID as a miss.
+        """
+        try:
+            return self._cache_repository.get_many(party_ids, ServiceEntities.PARTY)
+        except RedisError as e:
+            logger.warning(f"Could not get Parties from cache due to Redis Error: {e}.")
+            return {}
+
+    def _write_many_to_cache(
+        self,
+        res: dict[int, dict[str, Any]],
+        not_found: list[int],
+        invalidate: bool = False,
+    ) -> None:
+        """
+        Write multiple parties to the cache after they were loaded from the database during a batch read,
+        or created during a batch create, and tombstones for the parties that don't exist.
+        """
+        if not res and not not_found:
+            return
+        logger.debug(f"Writing {len(res)} Parties into cache.")
+        try:
+            self._cache_repository.add_many(
+                ServiceEntities.PARTY, res, not_found, invalidate=invalidate
+            )
+        except RedisError as e:
+            logger.warning(
+                f"Could not write {len(res)} Parties to cache due to Redis Error: {e}."
+            )
+
+    def _read_address_id_from_cache(self, address_hash: str) -> int | None:
+        """
+        Get the ID of the address with the hash from the address lookup cache, if enabled.
+        If the cache is unavailable, treat it as a miss.
+        """
+        if self._address_lookup_cache is None:
+            return None
+        try:
+            return self._address_lookup_cache.get(address_hash)
+        except RedisError as e:
+            logger.warning(
+                f"Could not get Address with hash {address_hash} from cache due to Redis Error: {e}."
+            )
+            return None
+
+    def _write_address_id_to_cache(self, address_hash: str, address_id: int) -> None:
+        """
+        Remember the ID of the address with the hash in the address lookup cache, if enabled.
+        """
+        if self._address_lookup_cache is None:
+            return
+        try:
+            self._address_lookup_cache.add(address_hash, address_id)
+        except RedisError as e:
+            logger.warning(
+                f"Could not write Address with hash {address_hash} to cache due to Redis Error: {e}."
+            )
+
+    def _delete_address_id_from_cache(self, address_hash: str) -> None:
+        """
+        Forget the address with the hash in the address lookup cache.
         """
-        logger.debug(f"Writing Party with ID: {party_id} into cache.")
+        if self._address_lookup_cache is None:
+            return
         try:
-            self._cache_repository.add(party_id, ServiceEntities.PARTY, res)
+            self._address_lookup_cache.delete(address_hash)
         except RedisError as e:
             logger.warning(
-                f"Could not write Party with ID {party_id} to cache due to Redis Error: {e}."
+                f"Could not delete Address with hash {address_hash} from cache due to Redis Error: {e}."
             )
@@ -4,3 +4,11 @@ If too many constants, this can be broken out into separate modules."""
 
 class AppConstants:
     APP_NAME = "party-service"
+
+
+class CacheConstants:
+    # Entities are cached under a namespace versioned with the format of their cached values. The version is bumped
+    # on every change workers of the previous release can't read, so during a rolling deploy each release
+    # reads and writes its own entries instead of misreading the other's.
+    KEY_PREFIX = f"{AppConstants.APP_NAME}:v3"
+    INVALIDATION_CHANNEL = f"{AppConstants.APP_NAME}:invalidations"
@@ -1,3 +1,9 @@
 from typing import Any
 
+from flask import Response
+from sqlalchemy.orm import Session, scoped_session
+
 PartyResponseTuple = tuple[dict[str, Any], int]
+CachedViewResponse = PartyResponseTuple | Response
+# A session, or the app's scoped session, which proxies to the session of the current app context
+DatabaseSession = Session | scoped_session[Session]
@@ -61,3 +61,10 @@ class USState(Enum):
     WV = "WV"
     WI = "WI"
     WY = "WY"
+
+
+class PrePing(Enum):
+    """How pooled database connections are checked before they are used (see DatabasePoolProfile)."""
+
+    CHECKOUT = "checkout"
+    BACKGROUND = "background"
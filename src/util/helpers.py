@@ -1,7 +1,113 @@
 """Helper functions that are reused across multiple modules in the application."""
 
+import base64
+import hashlib
+import json
+import os
+import zlib
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from pydantic import ValidationError
+
 
 def to_camel_case(snake_str: str) -> str:
     """Convert snake_case string to camelCase."""
     components = snake_str.split("_")
     return components[0] + "".join(word.capitalize() for word in components[1:])
+
+
+def etag(body: bytes) -> str:
+    """Strong ETag of a response body, without the surrounding quotes."""
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def to_json_bytes(value: Any) -> bytes:
+    """Serialize a JSON-serializable value to compact UTF-8 encoded JSON bytes."""
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def encode_cursor(key: dict[str, Any]) -> str:
+    """Encode the sort key of the last item of a page as an opaque cursor, which the next page is requested with."""
+    return base64.urlsafe_b64encode(to_json_bytes(key)).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: Any) -> dict[str, Any]:
+    """
+    Decode a cursor created by encode_cursor back into the sort key it was created from.
+    :raises ValueError: If the cursor is malformed.
+    """
+    if not isinstance(cursor, str):
+        raise ValueError("cursor is not a valid page cursor")
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        raise ValueError("cursor is not a valid page cursor")
+    if not isinstance(key, dict) or not isinstance(key.get("id"), int):
+        raise ValueError("cursor is not a valid page cursor")
+    return key
+
+
+def buffer_chunks(chunks: Iterable[bytes], size: int = 65536) -> Iterator[bytes]:
+    """Join small chunks of a streamed body into chunks of at least `size` bytes, so they are written in fewer calls."""
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        if len(buffer) >= size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compress a streamed body into the gzip format chunk by chunk, without holding the whole body in memory."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        if compressed := compressor.compress(chunk):
+            yield compressed
+    yield compressor.flush()
+
+
+def to_validation_errors(e: ValidationError) -> list[dict[str, str]]:
+    """The field and message of every error of a failed pydantic validation, as reported in error responses."""
+    validation_errors = []
+    for error in e.errors():
+        field = ".".join(str(loc) for loc in error["loc"])
+
+        # Try to get custom error message from ctx, otherwise use default msg
+        if "ctx" in error and "error" in error["ctx"]:
+            # in the error[ctx][error] value, the field name is snake case
+            # ex. "first_name cannot be null when provided"
+            # I use camel case for this API, so it may be confusing to consumers having a snake case field
+            # in the error response message, so remove that snake cased field, and we already define the field
+            # in the field key using the field variables anyways (see .append() call).
+            delimiter = " "
+            str_list = str(error["ctx"]["error"]).split(delimiter)
+            del str_list[0]
+            message = delimiter.join(str_list).capitalize()
+        else:
+            message = error["msg"]
+
+        validation_errors.append({"field": field, "message": message})
+    return validation_errors
+
+
+def get_env_bool(name: str, default: bool) -> bool:
+    """Read a boolean environment variable. Accepts 1/true/yes/on (case-insensitive) as true."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def get_env_int(name: str, default: int) -> int:
+    """Read an integer environment variable."""
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def get_env_float(name: str, default: float) -> float:
+    """Read a float environment variable."""
+    value = os.getenv(name)
+    return float(value) if value else default
@@ -0,0 +1,83 @@
+from collections.abc import Iterator
+
+import pytest
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from src.models import Address, Party
+from src.models.base import Base
+from src.repository.address_repository import AddressRepository
+from src.repository.party_history_repository import PartyHistoryRepository
+from src.repository.party_repository import PartyRepository
+from src.repository.unit_of_work import UnitOfWork
+
+
+@pytest.fixture
+def engine() -> Iterator[Engine]:
+    """An in-memory SQLite database with the party_service schema attached, shared by every session."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+
+    @event.listens_for(engine, "connect")
+    def attach_schema(dbapi_connection, connection_record):
+        dbapi_connection.execute("ATTACH DATABASE ':memory:' AS party_service")
+
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def statements(engine) -> list[str]:
+    """Every SQL statement sent to the database after the fixture is requested."""
+    executed: list[str] = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    return executed
+
+
+@pytest.fixture
+def session(engine) -> Iterator[Session]:
+    """Configured like the app's sessions (see init_db)."""
+    with Session(engine, expire_on_commit=False) as session:
+        yield session
+
+
+@pytest.fixture
+def uow(session) -> UnitOfWork:
+    return UnitOfWork(
+        session,
+        PartyRepository(session),
+        AddressRepository(session),
+        PartyHistoryRepository(session),
+    )
+
+
+@pytest.fixture
+def stored_party(engine) -> int:
+    """Insert a party and its address, and return the party's ID."""
+    with Session(engine) as session:
+        party = Party(
+            first_name="John",
+            last_name="Doe",
+            email="john.doe@example.com",
+            phone_number="5551234567",
+            created_by="test.user",
+            updated_by="test.user",
+            address=Address(
+                street_one="123 Main St",
+                city="Springfield",
+                state="IL",
+                postal_code="62704",
+                country="USA",
+                hash="hash",
+                created_by="test.user",
+                updated_by="test.user",
+            ),
+        )
+        session.add(party)
+        session.commit()
+        return party.id
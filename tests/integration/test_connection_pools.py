@@ -0,0 +1,88 @@
+import time
+from collections.abc import Iterator
+
+import pytest
+from sqlalchemy import Engine, create_engine, event, text
+from sqlalchemy.exc import TimeoutError
+
+from src.repository.connection_pools import InstrumentedQueuePool, PoolValidator
+
+
+@pytest.fixture
+def pooled_engine(tmp_path) -> Iterator[Engine]:
+    """A SQLite file database behind a pool of one connection, like the app's engines (see init_db)."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool'}.db",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    yield engine
+    engine.dispose()
+
+
+def test_counts_checkouts_and_timeouts(pooled_engine):
+    with pooled_engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        assert pooled_engine.pool.stats()["inUse"] == 1
+
+        with pytest.raises(TimeoutError):
+            pooled_engine.connect()
+
+    stats = pooled_engine.pool.stats()
+    assert (stats["checkouts"], stats["timeouts"]) == (1, 1)
+    assert (stats["inUse"], stats["idle"]) == (0, 1)
+
+
+def test_validate_idle_invalidates_broken_connections(pooled_engine):
+    with pooled_engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    connects = []
+    event.listen(pooled_engine, "connect", lambda *args: connects.append(args))
+    # break the pooled connection behind the pool's back
+    pooled_engine.pool._pool.queue[0].dbapi_connection.close()
+
+    assert pooled_engine.pool.validate_idle(pooled_engine.dialect) == 1
+    assert pooled_engine.pool.stats()["checkouts"] == 1
+
+    with pooled_engine.connect() as connection:
+        assert connection.scalar(text("SELECT 1")) == 1
+    assert len(connects) == 1
+
+
+def test_validate_idle_keeps_healthy_connections(pooled_engine):
+    with pooled_engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+    assert pooled_engine.pool.validate_idle(pooled_engine.dialect) == 0
+    assert pooled_engine.pool.stats()["invalidations"] == 0
+
+
+def test_validator_can_be_started_again_after_it_was_closed(pooled_engine, mocker):
+    validate_idle = mocker.spy(InstrumentedQueuePool, "validate_idle")
+    validator = PoolValidator(pooled_engine, interval=0.01)
+    validator.close()  # closing a validator that never started is a no-op
+
+    validator.start()
+    validator.close()
+    validated = validate_idle.call_count
+    # ex. in a forked worker, whose pool was replaced (see init_forked_worker)
+    pooled_engine.dispose(close=False)
+    validator.start()
+    time.sleep(0.05)
+    validator.close()
+
+    assert validate_idle.call_count > validated
+
+
+def test_validate_idle_stops_once_no_connection_is_idle(pooled_engine, mocker):
+    with pooled_engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        # the connection was counted as idle, but a request checked it out before it was validated
+        mocker.patch.object(pooled_engine.pool, "checkedin", return_value=1)
+
+        assert pooled_engine.pool.validate_idle(pooled_engine.dialect) == 0
+
+    # it didn't wait for the connection to be returned
+    assert pooled_engine.pool.stats()["timeouts"] == 0
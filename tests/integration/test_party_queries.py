@@ -0,0 +1,210 @@
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.exc import NoResultFound
+from sqlalchemy.orm import Session
+
+from src.dto.request_dtos import PartyBatchCreate, PartyCreate, PartyList, PartyUpdate
+from src.models import Address, Party, PartyHistory
+from src.repository.party_repository import PartyRepository
+from src.service.party_service import PartyService
+
+
+def test_get_party_json_cache_miss_is_one_statement(
+    mocker, uow, stored_party, statements
+):
+    party_service = PartyService(uow, mocker.MagicMock())
+
+    body = json.loads(party_service.get_party_json(stored_party))
+
+    assert body["address"]["city"] == "Springfield"
+    assert len(statements) == 1
+
+
+def test_get_by_id_reuses_compiled_statement(engine, session, stored_party):
+    repository = PartyRepository(session)
+    repository.get_by_id(stored_party)
+    session.expunge_all()
+    cache_hits = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        cache_hits.append(context.cache_hit)
+
+    party = repository.get_by_id(stored_party)
+
+    assert party.address.city == "Springfield"
+    assert cache_hits == [CacheStats.CACHE_HIT]
+
+
+def test_get_by_id_for_update_joins_address(session, stored_party, statements):
+    party = PartyRepository(session).get_by_id_for_update(stored_party)
+
+    assert party.address.city == "Springfield"
+    assert len(statements) == 1
+
+
+def test_get_by_id_not_found(session):
+    with pytest.raises(NoResultFound):
+        PartyRepository(session).get_by_id(404)
+
+
+def test_add_party_inserts_without_reading_back(
+    mocker, session, uow, stored_party, statements
+):
+    # the address is resolved with a Postgres-only upsert, so it is served from the session here
+    address = session.get_one(Address, 1)
+    mocker.patch.object(uow.address_repository, "get_or_create", return_value=address)
+    party_service = PartyService(uow, mocker.MagicMock())
+    statements.clear()
+
+    response = party_service.add_party(
+        PartyCreate(
+            firstName="Jane",
+            lastName="Doe",
+            email="jane.doe@example.com",
+            phoneNumber="5551234567",
+            address={
+                "streetOne": "123 Main St",
+                "city": "Springfield",
+                "state": "IL",
+                "postalCode": "62704",
+                "country": "USA",
+                "meta": {"createdBy": "test.user", "createdAt": "2025-01-01T12:00:00"},
+            },
+            meta={"createdBy": "test.user", "createdAt": "2025-01-01T12:00:00"},
+        )
+    )
+
+    assert response["meta"]["createdAt"] is not None
+    assert [statement.split()[0] for statement in statements] == ["INSERT", "INSERT"]
+    assert session.get_one(PartyHistory, 1).party_created_at is not None
+
+
+def test_update_party_returns_updated_at_with_update(
+    mocker, uow, stored_party, statements
+):
+    party_service = PartyService(uow, mocker.MagicMock())
+
+    response = party_service.update_party(
+        stored_party,
+        PartyUpdate(
+            firstName="Jane",
+            meta={"updatedBy": "patch.user", "updatedAt": "2025-01-02T10:00:00"},
+        ),
+    )
+
+    assert response["firstName"] == "Jane"
+    assert [statement.split()[0] for statement in statements] == [
+        "SELECT",
+        "UPDATE",
+        "INSERT",
+    ]
+
+
+def test_add_parties_uses_multi_row_inserts(mocker, session, uow, statements):
+    party_service = PartyService(uow, mocker.MagicMock())
+    meta = {"createdBy": "test.user", "createdAt": "2025-01-01T12:00:00"}
+    payloads = [
+        {
+            "firstName": "John",
+            "lastName": "Doe",
+            "email": f"john.doe{i}@example.com",
+            "phoneNumber": "5551234567",
+            "address": {
+                "streetOne": f"{i % 3} Main St",
+                "city": "Springfield",
+                "state": "IL",
+                "postalCode": "62704",
+                "country": "USA",
+            },
+            "meta": meta,
+        }
+        for i in range(10)
+    ]
+
+    result = party_service.add_parties(PartyBatchCreate(parties=payloads))
+
+    assert [item["status"] for item in result["results"]] == [201] * 10
+    # the existing addresses are selected at once, and the new ones are inserted at once
+    assert statements[0].startswith("SELECT")
+    assert statements[1].startswith("INSERT INTO party_service.address")
+    assert "VALUES (?, ?, ?, ?, ?, ?, ?, ?), (" in statements[1]
+    # nothing is read back. Postgres batches the party and history rows into multi-row INSERTs (insertmanyvalues),
+    # SQLite can't return generated IDs of a multi-row INSERT in order, so it inserts them one at a time.
+    assert all(statement.startswith("INSERT") for statement in statements[1:])
+    assert session.scalar(select(func.count()).select_from(Address)) == 3
+    assert session.scalar(select(func.count()).select_from(PartyHistory)) == 10
+
+
+def test_export_parties_filters_by_updated_since(mocker, uow, stored_party):
+    party_service = PartyService(uow, mocker.MagicMock())
+
+    lines = list(party_service.export_parties(batch_size=1))
+    later = list(party_service.export_parties(datetime(2999, 1, 1)))
+
+    assert [json.loads(line)["id"] for line in lines] == [stored_party]
+    assert json.loads(lines[0])["address"]["city"] == "Springfield"
+    assert later == []
+
+
+def _add_parties(engine, count, **fields):
+    with Session(engine) as session:
+        address = session.scalars(select(Address)).one()
+        session.add_all(
+            Party(
+                first_name=f"Jane{i}",
+                last_name="Roe",
+                email=f"jane.{i}@example.com",
+                phone_number="5551234567",
+                address=address,
+                created_by="test.user",
+                updated_by="test.user",
+                **fields,
+            )
+            for i in range(count)
+        )
+        session.commit()
+
+
+@pytest.mark.parametrize("updated_since", [None, "2000-01-01T00:00:00"])
+def test_list_parties_pages_through_every_match(
+    mocker, engine, uow, stored_party, updated_since
+):
+    # SQLite stores server defaults in a different format than bound datetimes, so the time is set explicitly.
+    # It's the same for every party, so pages are split by ID.
+    _add_parties(engine, 5, updated_at=datetime(2025, 1, 1))
+    cache_repository = mocker.MagicMock()
+    cache_repository.get_many.return_value = {}
+    party_service = PartyService(uow, cache_repository)
+    query = {"lastName": "Roe", "state": "IL", "limit": 2}
+    if updated_since:
+        query["updatedSince"] = updated_since
+
+    pages = []
+    cursor = None
+    while True:
+        page = party_service.list_parties(
+            PartyList.model_validate({**query, "cursor": cursor} if cursor else query)
+        )
+        pages.append([party["firstName"] for party in page["parties"]])
+        if not (cursor := page["nextCursor"]):
+            break
+
+    assert pages == [["Jane0", "Jane1"], ["Jane2", "Jane3"], ["Jane4"]]
+
+
+def test_list_parties_filters_by_address(mocker, engine, uow, stored_party):
+    cache_repository = mocker.MagicMock()
+    cache_repository.get_many.return_value = {}
+    party_service = PartyService(uow, cache_repository)
+
+    found = party_service.list_parties(PartyList(postalCode="62704"))
+    missing = party_service.list_parties(PartyList(postalCode="10001", state="NY"))
+
+    assert [party["id"] for party in found["parties"]] == [stored_party]
+    assert found["nextCursor"] is None
+    assert missing["parties"] == []
@@ -0,0 +1,169 @@
+import json
+from collections.abc import Iterator
+
+import pytest
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.dto.request_dtos import PartyUpdate
+from src.models import Address, Party
+from src.models.base import Base
+from src.repository.address_repository import AddressRepository
+from src.repository.party_history_repository import PartyHistoryRepository
+from src.repository.party_repository import PartyRepository
+from src.repository.replica_router import READ_ONLY, ReplicaRouter, RoutingSession
+from src.repository.unit_of_work import UnitOfWork
+from src.service.party_service import PartyService
+
+
+def _database(tmp_path, name: str) -> Engine:
+    """A SQLite database in files, with a party whose first name is the name of the database."""
+    engine = create_engine(f"sqlite:///{tmp_path / name}.db")
+
+    @event.listens_for(engine, "connect")
+    def attach_schema(dbapi_connection, connection_record):
+        dbapi_connection.execute(
+            f"ATTACH DATABASE '{tmp_path / name}_party_service.db' AS party_service"
+        )
+
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(
+            Party(
+                first_name=name.capitalize(),
+                last_name="Doe",
+                email="john.doe@example.com",
+                phone_number="5551234567",
+                created_by="test.user",
+                updated_by="test.user",
+                address=Address(
+                    street_one="123 Main St",
+                    city="Springfield",
+                    state="IL",
+                    postal_code="62704",
+                    country="USA",
+                    hash="hash",
+                    created_by="test.user",
+                    updated_by="test.user",
+                ),
+            )
+        )
+        session.commit()
+    return engine
+
+
+@pytest.fixture
+def primary(tmp_path) -> Iterator[Engine]:
+    engine = _database(tmp_path, "primary")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def replica(tmp_path) -> Iterator[Engine]:
+    """A second database standing in for a read replica of the primary."""
+    engine = _database(tmp_path, "replica")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def router(primary, replica) -> ReplicaRouter:
+    return ReplicaRouter(primary, [replica], max_lag=5.0, lag_check_interval=60)
+
+
+@pytest.fixture
+def session(primary, router) -> Iterator[Session]:
+    """Configured like the app's sessions (see init_db)."""
+    factory = sessionmaker(
+        bind=primary, class_=RoutingSession, router=router, expire_on_commit=False
+    )
+    with factory() as session:
+        yield session
+
+
+@pytest.fixture
+def uow(session) -> UnitOfWork:
+    return UnitOfWork(
+        session,
+        PartyRepository(session),
+        AddressRepository(session),
+        PartyHistoryRepository(session),
+    )
+
+
+@pytest.fixture
+def party_service(mocker, uow) -> PartyService:
+    return PartyService(uow, mocker.MagicMock())
+
+
+@pytest.fixture
+def replica_lag(mocker):
+    """The lag the replica reports, since SQLite can't measure it."""
+    return mocker.patch.object(ReplicaRouter, "_measure_lag", return_value=0.0)
+
+
+def _read_first_name(uow: UnitOfWork) -> str:
+    with uow.read_only():
+        return uow.party_repository.get_by_id(1).first_name
+
+
+def test_read_only_reads_are_served_by_replica(uow, router, replica_lag):
+    assert _read_first_name(uow) == "Replica"
+    assert router.stats()["replicas"][0]["reads"] == 1
+    assert router.stats()["primary"]["reads"] == 0
+
+
+def test_cache_is_filled_from_primary(party_service, router, replica_lag):
+    body = json.loads(party_service.get_party_json(1))
+
+    assert body["firstName"] == "Primary"
+    assert router.stats()["replicas"][0]["reads"] == 0
+
+
+def test_reads_after_a_write_are_served_by_primary(
+    party_service, uow, session, router, replica, replica_lag
+):
+    replica_statements: list[str] = []
+    event.listen(
+        replica,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: replica_statements.append(statement),
+    )
+
+    party_service.update_party(
+        1,
+        PartyUpdate(
+            firstName="Jane",
+            meta={"updatedBy": "patch.user", "updatedAt": "2025-01-02T10:00:00"},
+        ),
+    )
+    session.expunge_all()
+
+    assert _read_first_name(uow) == "Jane"
+    assert replica_statements == []
+    assert router.stats()["readYourWritesFallbacks"] == 1
+    assert session.info[READ_ONLY] is False
+
+
+def test_lagging_replica_falls_back_to_primary(uow, router, replica_lag):
+    replica_lag.return_value = 10.0
+
+    assert _read_first_name(uow) == "Primary"
+    assert router.stats()["lagFallbacks"] == 1
+    assert router.stats()["replicas"][0]["lag"] == 10.0
+
+
+def test_replica_whose_lag_cant_be_measured_falls_back_to_primary(uow, router):
+    # SQLite has no replication functions, so measuring the lag fails
+    assert _read_first_name(uow) == "Primary"
+    assert router.stats()["lagFallbacks"] == 1
+    assert router.stats()["replicas"][0]["lag"] is None
+
+
+def test_lag_is_measured_once_per_interval(uow, session, replica_lag):
+    _read_first_name(uow)
+    session.expunge_all()
+    _read_first_name(uow)
+
+    replica_lag.assert_called_once()
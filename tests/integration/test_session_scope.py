@@ -0,0 +1,115 @@
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from flask import Flask
+from sqlalchemy import Engine, create_engine, event, select
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
+
+from src.config.config import _session_scope
+from src.config.container import Container
+from src.models import Address, Party
+from src.models.base import Base
+
+THREADS = 8
+
+
+@pytest.fixture
+def file_engine(tmp_path) -> Iterator[Engine]:
+    """A SQLite database in files, so every session borrows a connection of its own from the pool."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'main.db'}",
+        connect_args={"check_same_thread": False},
+    )
+
+    @event.listens_for(engine, "connect")
+    def attach_schema(dbapi_connection, connection_record):
+        dbapi_connection.execute(
+            f"ATTACH DATABASE '{tmp_path / 'party_service.db'}' AS party_service"
+        )
+
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def app(mocker, file_engine) -> Flask:
+    """An app with its scoped session configured like init_db, and removed on teardown like in the app."""
+    app = Flask(__name__)
+    app.session = scoped_session(
+        sessionmaker(bind=file_engine, expire_on_commit=False),
+        scopefunc=_session_scope,
+    )
+    app.container = Container(app.session, mocker.MagicMock())
+    app.teardown_appcontext(lambda exc: app.session.remove())
+    return app
+
+
+@pytest.fixture
+def party_ids(file_engine) -> list[int]:
+    with Session(file_engine) as session:
+        address = Address(
+            street_one="123 Main St",
+            city="Springfield",
+            state="IL",
+            postal_code="62704",
+            country="USA",
+            hash="hash",
+            created_by="test.user",
+            updated_by="test.user",
+        )
+        parties = [
+            Party(
+                first_name=f"John{i}",
+                last_name="Doe",
+                email=f"john.{i}@example.com",
+                phone_number="5551234567",
+                address=address,
+                created_by="test.user",
+                updated_by="test.user",
+            )
+            for i in range(THREADS)
+        ]
+        session.add_all(parties)
+        session.commit()
+        return [party.id for party in parties]
+
+
+def test_concurrent_app_contexts_use_their_own_sessions(app, party_ids):
+    barrier = threading.Barrier(THREADS)
+
+    def handle(party_id: int) -> tuple[Session, Party]:
+        with app.app_context():
+            party_repository = app.container.party_repository
+            party = party_repository.get_by_id(party_id)
+            # every context holds its session until all of them have loaded a party
+            barrier.wait(timeout=5)
+            return app.session(), party
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        results = list(pool.map(handle, party_ids))
+
+    sessions = [session for session, _ in results]
+    assert len(set(map(id, sessions))) == THREADS
+    for (session, party), party_id in zip(results, party_ids):
+        assert party.id == party_id
+        # the session was closed at teardown, so its entities were discarded
+        assert list(session.identity_map.values()) == []
+    assert app.session.registry.registry == {}
+
+
+def test_unit_of_work_commits_only_its_own_session(app, file_engine, party_ids):
+    def rename(party_id: int) -> None:
+        with app.app_context():
+            uow = app.container.unit_of_work
+            with uow:
+                uow.party_repository.get_by_id(party_id).first_name = f"Jane{party_id}"
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        list(pool.map(rename, party_ids))
+
+    with Session(file_engine) as session:
+        names = session.scalars(select(Party.first_name).order_by(Party.id)).all()
+    assert names == [f"Jane{party_id}" for party_id in party_ids]
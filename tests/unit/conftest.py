@@ -1,3 +1,4 @@
+import re
 from dataclasses import dataclass, asdict, field
 from datetime import datetime
 from src.dto.response_dtos import PartyResponse, AddressResponse, MetaResponse
@@ -5,6 +6,7 @@ import pytest
 from src.service.party_service import PartyService
 from src.models import Party, Address, PartyHistory
 from src.dto.request_dtos import PartyCreate, PartyUpdate
+from src.repository.cache_repository import _GET_WITH_REFERENCE, _SET_IF_NEWER
 
 
 @dataclass
@@ -179,3 +181,140 @@ def mock_cache_repository(mocker):
 @pytest.fixture
 def mock_mappers(mocker):
     return mocker.patch("src.service.party_service.mappers")
+
+
+class FakeRedisLock:
+    def __init__(self, redis, name):
+        self._redis = redis
+        self._name = name
+
+    def acquire(self):
+        return self._redis.set(self._name, b"1", nx=True)
+
+    def release(self):
+        self._redis.delete(self._name)
+
+
+class FakeRedisPipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self):
+        results = [
+            getattr(self._redis, name)(*args, **kwargs)
+            for name, args, kwargs in self._commands
+        ]
+        self._commands = []
+        return results
+
+
+class FakeRedis:
+    """In-memory stand-in for the subset of the Redis client used by CacheRepository."""
+
+    def __init__(self):
+        self.store = {}
+        self.published = []
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def mget(self, keys):
+        return [self.store.get(key) for key in keys]
+
+    def set(self, key, value, ex=None, px=None, nx=False):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    def delete(self, *keys):
+        return sum(self.store.pop(key, None) is not None for key in keys)
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+        return 0
+
+    def pipeline(self, transaction=True):
+        return FakeRedisPipeline(self)
+
+    def lock(self, name, timeout=None, blocking=True):
+        return FakeRedisLock(self, name)
+
+    def register_script(self, script):
+        """There is no Lua interpreter, so the app's scripts are run as their Python equivalent."""
+        assert script in (_GET_WITH_REFERENCE, _SET_IF_NEWER)
+
+        def get_with_reference(keys, args):
+            entry = self.store.get(keys[0])
+            if entry is None:
+                return []
+            match = re.match(rb"\x07(\d+):", entry)
+            if match is None:
+                return [entry]
+            return [entry, self.store.get(args[0] + match.group(1).decode()) or b""]
+
+        def set_if_newer(keys, args):
+            stored = self.store.get(keys[0])
+            if stored is not None and float(stored) > float(args[0]):
+                return 0
+            self.set(keys[0], str(args[0]).encode(), ex=args[1])
+            for i, key in enumerate(keys[1:]):
+                self.set(key, args[4 + 2 * i], ex=args[5 + 2 * i])
+            if args[2]:
+                self.publish(args[2], args[3])
+            return 1
+
+        if script == _GET_WITH_REFERENCE:
+            return get_with_reference
+        return set_if_newer
+
+
+@pytest.fixture
+def fake_redis():
+    return FakeRedis()
+
+
+class AsyncFakeRedisPipeline(FakeRedisPipeline):
+    async def execute(self):
+        return super().execute()
+
+
+class AsyncFakeRedis:
+    """Async stand-in for the subset of the redis.asyncio client used by AsyncCacheRepository, over a FakeRedis."""
+
+    def __init__(self, redis):
+        self._redis = redis
+
+    async def get(self, key):
+        return self._redis.get(key)
+
+    async def mget(self, keys):
+        return self._redis.mget(keys)
+
+    async def set(self, key, value, ex=None, px=None, nx=False):
+        return self._redis.set(key, value, ex=ex, px=px, nx=nx)
+
+    def pipeline(self, transaction=True):
+        return AsyncFakeRedisPipeline(self._redis)
+
+    def register_script(self, script):
+        run = self._redis.register_script(script)
+
+        async def run_async(keys, args):
+            return run(keys, args)
+
+        return run_async
+
+
+@pytest.fixture
+def async_fake_redis(fake_redis):
+    """Shares its store with fake_redis, so entries written by one cache repository can be read by the other."""
+    return AsyncFakeRedis(fake_redis)
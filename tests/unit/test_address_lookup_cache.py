@@ -0,0 +1,26 @@
+from src.repository.address_lookup_cache import AddressLookupCache
+from src.repository.local_cache import LocalCache
+
+
+def test_redis_hit_is_kept_in_local_cache(fake_redis, mocker):
+    fake_redis.set("party-service:address-hash:abc", b"7")
+    get = mocker.spy(fake_redis, "get")
+    lookup_cache = AddressLookupCache(
+        fake_redis, LocalCache(max_size=10, ttl=60), ttl=60
+    )
+
+    assert lookup_cache.get("abc") == 7
+    assert lookup_cache.get("abc") == 7
+    get.assert_called_once_with("party-service:address-hash:abc")
+
+
+def test_delete_forgets_hash_in_both_tiers(fake_redis):
+    lookup_cache = AddressLookupCache(
+        fake_redis, LocalCache(max_size=10, ttl=60), ttl=60
+    )
+    lookup_cache.add("abc", 7)
+
+    lookup_cache.delete("abc")
+
+    assert lookup_cache.get("abc") is None
+    assert fake_redis.store == {}
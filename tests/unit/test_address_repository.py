@@ -0,0 +1,78 @@
+from sqlalchemy.dialects import postgresql
+
+from src.models.address import Address
+from src.repository.address_repository import AddressRepository
+
+
+def test_get_or_create_resolves_address_in_one_statement(mocker, address_fixture):
+    session = mocker.MagicMock()
+    session.scalars.return_value.first.return_value = address_fixture
+    address = Address(
+        street_one="1 Main St",
+        city="Springfield",
+        state="IL",
+        postal_code="62704",
+        country="USA",
+        hash="abc",
+        created_by="user",
+        updated_by="user",
+    )
+
+    result = AddressRepository(session).get_or_create(address)
+
+    assert result is address_fixture
+    session.scalars.assert_called_once()
+    sql = str(session.scalars.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (hash) DO NOTHING RETURNING" in sql
+    assert "UNION ALL" in sql
+
+
+def test_get_or_create_selects_address_inserted_concurrently(mocker, address_fixture):
+    session = mocker.MagicMock()
+    session.scalars.return_value.first.return_value = None
+    session.scalars.return_value.one.return_value = address_fixture
+
+    result = AddressRepository(session).get_or_create(Address(hash="abc"))
+
+    assert result is address_fixture
+    assert session.scalars.call_count == 2
+
+
+def test_get_or_create_many_inserts_only_missing_addresses(mocker):
+    existing, inserted = Address(hash="a"), Address(hash="b")
+    session = mocker.MagicMock()
+    session.scalars.side_effect = [[existing], [inserted]]
+    addresses = [
+        Address(hash="a", street_one="1 Main St"),
+        Address(hash="b", street_one="2 Main St", street_two="Apt 1"),
+    ]
+
+    result = AddressRepository(session).get_or_create_many(addresses)
+
+    assert result == {"a": existing, "b": inserted}
+    sql = str(session.scalars.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (hash) DO NOTHING RETURNING" in sql
+    assert "street_two" in sql
+
+
+def test_get_or_create_many_selects_addresses_inserted_concurrently(mocker):
+    concurrent = Address(hash="a")
+    session = mocker.MagicMock()
+    session.scalars.side_effect = [[], [], [concurrent]]
+
+    result = AddressRepository(session).get_or_create_many([Address(hash="a")])
+
+    assert result == {"a": concurrent}
+    assert session.scalars.call_count == 3
+
+
+def test_get_or_create_many_inserts_addresses_in_hash_order(mocker):
+    session = mocker.MagicMock()
+    session.scalars.side_effect = [[], [], []]
+    addresses = [Address(hash=hash, street_one=hash) for hash in ["c", "a", "b"]]
+
+    AddressRepository(session).get_or_create_many(addresses)
+
+    statement = session.scalars.call_args_list[1].args[0]
+    params = statement.compile(dialect=postgresql.dialect()).params
+    assert [params[f"hash_m{i}"] for i in range(3)] == ["a", "b", "c"]
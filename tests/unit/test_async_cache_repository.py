@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from src.config.cache_policy import CachePolicy
+from src.exception.custom_exceptions import EntityNotFound
+from src.repository.async_cache_repository import AsyncCacheRepository
+from src.repository.cache_repository import CacheRepository
+from src.util import helpers
+from src.util.constants import CacheConstants
+from src.util.enums import ServiceEntities
+
+
+def test_entries_are_shared_with_sync_repository(
+    fake_redis, async_fake_redis, party_response
+):
+    body = helpers.to_json_bytes(party_response.to_dict())
+    asyncio.run(
+        AsyncCacheRepository(async_fake_redis).add(1, ServiceEntities.PARTY, body)
+    )
+
+    assert set(fake_redis.store) == {
+        "party-service:v3:party:1",
+        "party-service:v3:address:1",
+    }
+    assert CacheRepository(fake_redis).get_raw(1, ServiceEntities.PARTY) == body
+
+
+def test_get_raw_splices_address_written_by_sync_repository(
+    fake_redis, async_fake_redis, party_response
+):
+    body = helpers.to_json_bytes(party_response.to_dict())
+    CacheRepository(fake_redis).add(1, ServiceEntities.PARTY, body)
+    cache_repository = AsyncCacheRepository(async_fake_redis)
+
+    assert asyncio.run(cache_repository.get_raw(1, ServiceEntities.PARTY)) == body
+
+    del fake_redis.store["party-service:v3:address:1"]
+    assert asyncio.run(cache_repository.get_raw(1, ServiceEntities.PARTY)) is None
+
+
+def test_tombstone_raises_not_found(async_fake_redis):
+    policies = {ServiceEntities.PARTY: CachePolicy(negative_ttl=30)}
+    cache_repository = AsyncCacheRepository(async_fake_redis, policies)
+
+    asyncio.run(cache_repository.add_tombstone(404, ServiceEntities.PARTY))
+
+    with pytest.raises(EntityNotFound):
+        asyncio.run(cache_repository.get_raw(404, ServiceEntities.PARTY))
+
+
+def test_add_many_and_get_many(fake_redis, async_fake_redis, party_response):
+    policies = {ServiceEntities.PARTY: CachePolicy(negative_ttl=30)}
+    cache_repository = AsyncCacheRepository(async_fake_redis, policies)
+
+    asyncio.run(
+        cache_repository.add_many(
+            ServiceEntities.PARTY,
+            {1: party_response.to_dict()},
+            not_found=[404],
+            invalidate=True,
+        )
+    )
+    found = asyncio.run(cache_repository.get_many([1, 2, 404], ServiceEntities.PARTY))
+
+    assert found == {1: party_response.to_dict(), 404: None}
+    assert fake_redis.published == [
+        (CacheConstants.INVALIDATION_CHANNEL, "party-service:v3:party:1")
+    ]
@@ -0,0 +1,139 @@
+import asyncio
+import json
+
+import pytest
+from redis.exceptions import RedisError
+from sqlalchemy.exc import NoResultFound
+
+# the async stack needs the "async" extra, which installs greenlet for SQLAlchemy asyncio
+pytest.importorskip("greenlet")
+
+from src.exception.custom_exceptions import EntityNotFound  # noqa: E402
+from src.service.async_party_service import AsyncPartyService  # noqa: E402
+from src.util.enums import ServiceEntities  # noqa: E402
+
+
+@pytest.fixture
+def mock_async_uow(mocker):
+    uow = mocker.MagicMock()
+    uow.party_repository.get_by_id = mocker.AsyncMock()
+    uow.party_repository.get_by_ids = mocker.AsyncMock()
+    uow.address_repository.get_or_create = mocker.AsyncMock()
+    uow.flush = mocker.AsyncMock()
+    uow.__aenter__ = mocker.AsyncMock(return_value=None)
+    uow.__aexit__ = mocker.AsyncMock(return_value=False)
+    return uow
+
+
+@pytest.fixture
+def mock_async_cache_repository(mocker):
+    return mocker.AsyncMock()
+
+
+@pytest.fixture
+def async_party_service(mock_async_uow, mock_async_cache_repository):
+    return AsyncPartyService(mock_async_uow, mock_async_cache_repository)
+
+
+@pytest.fixture
+def mock_async_mappers(mocker):
+    return mocker.patch("src.service.async_party_service.mappers")
+
+
+def test_get_party_json_caches_and_returns_the_same_bytes(
+    async_party_service,
+    mock_async_uow,
+    mock_async_cache_repository,
+    party_fixture,
+    party_response,
+    mock_async_mappers,
+):
+    mock_async_uow.party_repository.get_by_id.return_value = party_fixture
+    mock_async_mappers.to_party_response.return_value = party_response
+
+    body = asyncio.run(async_party_service.get_party_json(1))
+
+    assert json.loads(body) == party_response.to_dict()
+    mock_async_cache_repository.add.assert_awaited_once_with(
+        party_fixture.id,
+        ServiceEntities.PARTY,
+        body,
+        invalidate=False,
+        compute_time=pytest.approx(0.0, abs=1),
+    )
+
+
+def test_get_party_json_not_found_writes_tombstone(
+    async_party_service, mock_async_uow, mock_async_cache_repository
+):
+    mock_async_uow.party_repository.get_by_id.side_effect = NoResultFound()
+
+    with pytest.raises(EntityNotFound):
+        asyncio.run(async_party_service.get_party_json(404))
+
+    mock_async_cache_repository.add_tombstone.assert_awaited_once_with(
+        404, ServiceEntities.PARTY
+    )
+
+
+def test_get_parties_loads_only_cache_misses(
+    async_party_service,
+    mock_async_uow,
+    mock_async_cache_repository,
+    party_fixture,
+    party_response,
+    mock_async_mappers,
+):
+    cached = {"id": 2, "firstName": "Cached"}
+    mock_async_cache_repository.get_many.return_value = {2: cached}
+    mock_async_uow.party_repository.get_by_ids.return_value = [party_fixture]
+    mock_async_mappers.to_party_response.return_value = party_response
+
+    result = asyncio.run(async_party_service.get_parties([1, 2, 3, 2]))
+
+    mock_async_uow.party_repository.get_by_ids.assert_awaited_once_with([1, 3])
+    mock_async_cache_repository.add_many.assert_awaited_once_with(
+        ServiceEntities.PARTY, {1: party_response.to_dict()}, [3]
+    )
+    assert result["parties"] == [party_response.to_dict(), cached]
+    assert result["errors"] == [
+        {"id": 3, "status": 404, "detail": "Party with ID 3 was not found."}
+    ]
+
+
+def test_add_party_commits_before_writing_to_cache(
+    async_party_service,
+    mock_async_uow,
+    mock_async_cache_repository,
+    party_create_dto,
+    party_response,
+    address_fixture,
+    party_fixture,
+    party_history_fixture,
+    mock_async_mappers,
+):
+    mock_async_uow.address_repository.get_or_create.return_value = address_fixture
+    mock_async_mappers.to_address.return_value = address_fixture
+    mock_async_mappers.to_party.return_value = party_fixture
+    mock_async_mappers.to_party_history.return_value = party_history_fixture
+    mock_async_mappers.to_party_response.return_value = party_response
+    mock_async_cache_repository.add.side_effect = RedisError("Cache connection failed")
+
+    result = asyncio.run(async_party_service.add_party(party_create_dto))
+
+    assert result == party_response.to_dict()
+    assert party_fixture.address is address_fixture
+    assert address_fixture.created_by == party_create_dto.meta.created_by
+    mock_async_uow.__aexit__.assert_awaited_once_with(None, None, None)
+    mock_async_uow.flush.assert_awaited_once()
+    mock_async_uow.party_repository.add.assert_called_once_with(party_fixture)
+    mock_async_uow.party_history_repository.add.assert_called_once_with(
+        party_history_fixture
+    )
+    mock_async_cache_repository.add.assert_awaited_once_with(
+        party_fixture.id,
+        ServiceEntities.PARTY,
+        party_response.to_dict(),
+        invalidate=True,
+        compute_time=0.0,
+    )
@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from src.repository.cache_codecs import (
+    CacheCodec,
+    CacheDecodeError,
+    CacheFormat,
+    CacheMetadata,
+)
+
+
+@pytest.fixture
+def party_body(party_response):
+    return json.dumps(party_response.to_dict(), separators=(",", ":")).encode("utf-8")
+
+
+@pytest.mark.parametrize(
+    "serializer, compress_threshold, expected_format",
+    [
+        ("json", 0, CacheFormat.JSON),
+        ("json", 100, CacheFormat.JSON_ZLIB),
+        ("msgpack", 0, CacheFormat.MSGPACK),
+        ("msgpack", 100, CacheFormat.MSGPACK_ZLIB),
+    ],
+)
+def test_round_trip(party_body, serializer, compress_threshold, expected_format):
+    encoded = CacheCodec(serializer, compress_threshold).encode_json(party_body)
+
+    assert encoded[0] == expected_format
+    assert json.loads(CacheCodec.decode_json(encoded)) == json.loads(party_body)
+    assert CacheCodec.decode(encoded) == json.loads(party_body)
+
+
+def test_json_payload_is_passed_through_unchanged(party_body):
+    encoded = CacheCodec("json", compress_threshold=0).encode_json(party_body)
+
+    assert CacheCodec.decode_json(encoded) == party_body
+
+
+def test_legacy_entry_without_header_is_readable():
+    legacy = json.dumps({"id": 1}).encode("utf-8")
+
+    assert CacheCodec.decode_json(legacy) == legacy
+    assert CacheCodec.decode(legacy) == {"id": 1}
+
+
+def test_unknown_format_raises_decode_error():
+    with pytest.raises(CacheDecodeError):
+        CacheCodec.decode_json(b"\x7f{}")
+
+
+def test_unknown_serializer_is_rejected():
+    with pytest.raises(ValueError):
+        CacheCodec("pickle")
+
+
+def test_envelope_round_trip(party_body):
+    encoded = CacheCodec("json", compress_threshold=1).encode_json(party_body)
+    wrapped = CacheCodec.wrap(encoded, CacheMetadata(1700000000.5, 0.012))
+
+    assert CacheCodec.unwrap(wrapped) == (encoded, CacheMetadata(1700000000.5, 0.012))
+    assert CacheCodec.decode_json(wrapped) == party_body
+
+
+def test_truncated_envelope_raises_decode_error():
+    with pytest.raises(CacheDecodeError):
+        CacheCodec.decode_json(bytes((CacheFormat.ENVELOPE,)) + b"\x00" * 4)
+
+
+def test_reference_is_dropped_when_decoding(party_body):
+    encoded = CacheCodec("json", compress_threshold=1).encode_json(party_body)
+    wrapped = CacheCodec.wrap(encoded, CacheMetadata(1700000000.5, 0.012))
+    referenced = CacheCodec.with_reference(wrapped, 42)
+
+    assert referenced.startswith(b"\x0742:")
+    assert CacheCodec.unwrap(referenced) == (
+        encoded,
+        CacheMetadata(1700000000.5, 0.012),
+    )
+    assert CacheCodec.decode_json(referenced) == party_body
@@ -0,0 +1,54 @@
+import pytest
+from flask import Flask
+from redis import RedisError
+
+from src.cli.cache_commands import cache_cli, warm_parties
+from src.models.party import Party
+from src.repository.cache_repository import CacheRepository
+from src.util.enums import ServiceEntities
+
+
+@pytest.fixture
+def parties(address_fixture):
+    return [Party(id=id, address=address_fixture) for id in range(1, 6)]
+
+
+def test_warm_parties_writes_missing_parties_in_batches(mocker, fake_redis, parties):
+    party_repository = mocker.MagicMock()
+    party_repository.stream.return_value = iter(parties)
+    cache_repository = CacheRepository(fake_redis)
+    cache_repository.add(1, ServiceEntities.PARTY, {"id": 1, "cached": True})
+
+    report = warm_parties(party_repository, cache_repository, batch_size=2)
+
+    assert (report.parties, report.batches, report.failed_batches) == (5, 3, 0)
+    assert cache_repository.get(1, ServiceEntities.PARTY) == {"id": 1, "cached": True}
+    assert cache_repository.get(5, ServiceEntities.PARTY)["id"] == 5
+    party_repository.stream.assert_called_once_with(None, None, None, 2)
+
+
+def test_warm_parties_counts_failed_batches(mocker, parties):
+    party_repository = mocker.MagicMock()
+    party_repository.stream.return_value = iter(parties)
+    cache_repository = mocker.MagicMock()
+    cache_repository.add_many.side_effect = RedisError("down")
+
+    report = warm_parties(party_repository, cache_repository, batch_size=2)
+
+    assert (report.parties, report.failed_batches) == (0, 3)
+
+
+def test_warm_command_passes_options(mocker, fake_redis, parties):
+    app = Flask(__name__)
+    app.container = mocker.MagicMock()
+    app.container.party_repository.stream.return_value = iter(parties)
+    app.container.cache_repository = CacheRepository(fake_redis)
+    app.cli.add_command(cache_cli)
+
+    result = app.test_cli_runner().invoke(
+        args=["cache", "warm", "--min-id", "1", "--max-id", "5", "--batch-size", "10"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Warmed 5 parties" in result.output
+    app.container.party_repository.stream.assert_called_once_with(1, 5, None, 10)
@@ -0,0 +1,229 @@
+import json
+
+import pytest
+
+from src.config.cache_policy import CachePolicy
+from src.exception.custom_exceptions import EntityNotFound
+from src.repository.cache_codecs import CacheCodec
+from src.repository.cache_repository import CacheRepository
+from src.repository.local_cache import LocalCache
+from src.util.constants import CacheConstants
+from src.util import helpers
+from src.util.enums import ServiceEntities
+
+
+@pytest.fixture
+def mock_redis(mocker):
+    return mocker.MagicMock()
+
+
+@pytest.fixture
+def local_cache():
+    return LocalCache(max_size=10, ttl=60)
+
+
+def test_get_is_served_from_local_cache_after_first_read(mock_redis, local_cache):
+    get_with_reference = mock_redis.register_script.return_value
+    get_with_reference.return_value = [json.dumps({"id": 1}).encode("utf-8")]
+    cache_repository = CacheRepository(mock_redis, local_cache)
+
+    first = cache_repository.get(1, ServiceEntities.PARTY)
+    second = cache_repository.get(1, ServiceEntities.PARTY)
+
+    assert first == second == {"id": 1}
+    get_with_reference.assert_called_once_with(
+        keys=["party-service:v3:party:1"], args=["party-service:v3:address:"]
+    )
+
+
+def test_get_without_local_cache_reads_redis(mock_redis):
+    get_with_reference = mock_redis.register_script.return_value
+    get_with_reference.return_value = []
+    cache_repository = CacheRepository(mock_redis)
+
+    assert cache_repository.get(1, ServiceEntities.PARTY) is None
+    get_with_reference.assert_called_once()
+
+
+def test_party_and_address_are_read_in_one_round_trip(fake_redis, mocker):
+    cache_repository = CacheRepository(fake_redis)
+    party = {"id": 1, "address": {"id": 7, "city": "Springfield"}}
+    cache_repository.add(1, ServiceEntities.PARTY, party)
+    get = mocker.spy(fake_redis, "get")
+
+    assert cache_repository.get(1, ServiceEntities.PARTY) == party
+    assert get.call_count == 0
+
+
+def test_add_with_invalidate_publishes_in_same_pipeline(mock_redis, local_cache):
+    pipe = mock_redis.pipeline.return_value
+    cache_repository = CacheRepository(mock_redis, local_cache)
+
+    cache_repository.add(1, ServiceEntities.PARTY, {"id": 1}, invalidate=True)
+
+    pipe.set.assert_called_once()
+    pipe.publish.assert_called_once_with(
+        CacheConstants.INVALIDATION_CHANNEL, "party-service:v3:party:1"
+    )
+    pipe.execute.assert_called_once()
+    mock_redis.set.assert_not_called()
+
+
+def test_versioned_add_is_skipped_if_another_worker_wrote_a_newer_version(
+    fake_redis,
+):
+    worker, other_worker = CacheRepository(fake_redis), CacheRepository(fake_redis)
+    party = {"id": 1, "address": {"id": 7, "city": "Springfield"}}
+
+    assert other_worker.add(
+        1, ServiceEntities.PARTY, {**party, "v": 2}, invalidate=True, version=2.0
+    )
+    assert not worker.add(1, ServiceEntities.PARTY, {**party, "v": 1}, version=1.0)
+
+    assert worker.get(1, ServiceEntities.PARTY)["v"] == 2
+    assert fake_redis.published == [
+        (CacheConstants.INVALIDATION_CHANNEL, "party-service:v3:party:1")
+    ]
+
+
+def test_versioned_add_of_same_or_newer_version_is_written(fake_redis, local_cache):
+    cache_repository = CacheRepository(fake_redis, local_cache)
+
+    assert cache_repository.add(1, ServiceEntities.PARTY, {"v": 1}, version=1.0)
+    assert cache_repository.add(1, ServiceEntities.PARTY, {"v": 2}, version=1.0)
+    assert cache_repository.add(1, ServiceEntities.PARTY, {"v": 3}, version=3.0)
+
+    assert cache_repository.get(1, ServiceEntities.PARTY) == {"v": 3}
+    assert fake_redis.published == []
+
+
+def test_undecodable_value_is_a_miss(mock_redis):
+    mock_redis.get.return_value = b"\x7f{}"
+    cache_repository = CacheRepository(mock_redis)
+
+    assert cache_repository.get(1, ServiceEntities.PARTY) is None
+
+
+def test_tombstone_raises_not_found_until_entity_is_added(fake_redis, local_cache):
+    policies = {ServiceEntities.PARTY: CachePolicy(negative_ttl=30)}
+    cache_repository = CacheRepository(fake_redis, local_cache, policies)
+
+    cache_repository.add_tombstone(1, ServiceEntities.PARTY)
+    with pytest.raises(EntityNotFound):
+        cache_repository.get_raw(1, ServiceEntities.PARTY)
+
+    cache_repository.add(1, ServiceEntities.PARTY, {"id": 1}, invalidate=True)
+    assert cache_repository.get(1, ServiceEntities.PARTY) == {"id": 1}
+
+
+def test_tombstone_does_not_replace_existing_entry(fake_redis):
+    policies = {ServiceEntities.PARTY: CachePolicy(negative_ttl=30)}
+    cache_repository = CacheRepository(fake_redis, policies=policies)
+
+    cache_repository.add(1, ServiceEntities.PARTY, {"id": 1})
+    cache_repository.add_tombstone(1, ServiceEntities.PARTY)
+
+    assert cache_repository.get(1, ServiceEntities.PARTY) == {"id": 1}
+
+
+def test_get_many_reports_tombstones_as_none(fake_redis):
+    policies = {ServiceEntities.PARTY: CachePolicy(negative_ttl=30)}
+    cache_repository = CacheRepository(fake_redis, policies=policies)
+    cache_repository.add_many(ServiceEntities.PARTY, {1: {"id": 1}}, not_found=[2])
+
+    assert cache_repository.get_many([1, 2, 3], ServiceEntities.PARTY) == {
+        1: {"id": 1},
+        2: None,
+    }
+
+
+def test_add_many_with_invalidate_overwrites_tombstones(fake_redis):
+    policies = {ServiceEntities.PARTY: CachePolicy(negative_ttl=30)}
+    cache_repository = CacheRepository(fake_redis, policies=policies)
+    cache_repository.add_tombstone(1, ServiceEntities.PARTY)
+
+    cache_repository.add_many(
+        ServiceEntities.PARTY, {1: {"id": 1}, 2: {"id": 2}}, invalidate=True
+    )
+
+    assert cache_repository.get(1, ServiceEntities.PARTY) == {"id": 1}
+    assert fake_redis.published == [
+        (CacheConstants.INVALIDATION_CHANNEL, "party-service:v3:party:1"),
+        (CacheConstants.INVALIDATION_CHANNEL, "party-service:v3:party:2"),
+    ]
+
+
+def test_party_references_address_stored_once(fake_redis, party_response):
+    cache_repository = CacheRepository(fake_redis)
+    party = party_response.to_dict()
+    other_party = {**party, "id": 2}
+
+    cache_repository.add_many(ServiceEntities.PARTY, {1: party, 2: other_party})
+
+    assert set(fake_redis.store) == {
+        "party-service:v3:party:1",
+        "party-service:v3:party:2",
+        "party-service:v3:address:1",
+    }
+    stored = CacheCodec.decode_json(fake_redis.store["party-service:v3:party:1"])
+    assert b'"address":1,' in stored
+    assert cache_repository.get_many([1, 2], ServiceEntities.PARTY) == {
+        1: party,
+        2: other_party,
+    }
+
+
+def test_get_raw_splices_address_into_party_bytes(
+    fake_redis, local_cache, party_response
+):
+    body = helpers.to_json_bytes(party_response.to_dict())
+    cache_repository = CacheRepository(fake_redis, local_cache)
+
+    cache_repository.add(1, ServiceEntities.PARTY, body)
+    local_cache.clear()
+
+    assert cache_repository.get_raw(1, ServiceEntities.PARTY) == body
+
+
+def test_deleting_address_makes_party_a_miss(fake_redis, local_cache, party_response):
+    cache_repository = CacheRepository(fake_redis, local_cache)
+    cache_repository.add(1, ServiceEntities.PARTY, party_response.to_dict())
+
+    cache_repository.delete(1, ServiceEntities.ADDRESS)
+
+    assert cache_repository.get_raw(1, ServiceEntities.PARTY) is None
+    assert cache_repository.get_many([1], ServiceEntities.PARTY) == {}
+    assert fake_redis.published == [
+        (CacheConstants.INVALIDATION_CHANNEL, "party-service:v3:address:1")
+    ]
+
+
+def test_ttl_is_jittered_per_entity(mock_redis):
+    policies = {ServiceEntities.PARTY: CachePolicy(ttl=1000, ttl_jitter=0.1)}
+    cache_repository = CacheRepository(mock_redis, policies=policies)
+
+    for id in range(50):
+        cache_repository.add(id, ServiceEntities.PARTY, {"id": id})
+
+    ttls = {call.kwargs["ex"] for call in mock_redis.set.call_args_list}
+    assert all(900 <= ttl <= 1100 for ttl in ttls)
+    assert len(ttls) > 1
+
+
+def test_lookup_refreshes_entry_about_to_expire(fake_redis, mocker):
+    policies = {
+        ServiceEntities.PARTY: CachePolicy(
+            ttl=100, ttl_jitter=0, early_expiration_beta=1
+        )
+    }
+    cache_repository = CacheRepository(fake_redis, policies=policies)
+    mock_time = mocker.patch("src.repository.cache_repository.time")
+    mock_time.time.return_value = 1000.0
+    cache_repository.add(1, ServiceEntities.PARTY, {"id": 1}, compute_time=0.5)
+
+    assert cache_repository.lookup(1, ServiceEntities.PARTY).refresh is False
+
+    mock_time.time.return_value = 1100.0
+    lookup = cache_repository.lookup(1, ServiceEntities.PARTY)
+    assert lookup.refresh is True
+    assert json.loads(lookup.body) == {"id": 1}
@@ -0,0 +1,175 @@
+import threading
+import time
+
+from redis import RedisError
+
+from src.repository.cache_writer import CacheWriter, CacheWriterOptions
+from src.util.enums import ServiceEntities
+
+
+def test_pending_writes_are_coalesced_by_key(mocker):
+    cache_repository = mocker.MagicMock()
+    writer = CacheWriter(cache_repository, CacheWriterOptions())
+    writer.submit(1, ServiceEntities.PARTY, {"v": 1}, version=1.0)
+    writer.submit(1, ServiceEntities.PARTY, {"v": 2}, version=2.0, invalidate=True)
+
+    writer.start()
+    writer.close()
+
+    cache_repository.add.assert_called_once_with(
+        1,
+        ServiceEntities.PARTY,
+        {"v": 2},
+        invalidate=True,
+        compute_time=0.0,
+        version=2.0,
+    )
+    assert writer.stats()["coalesced"] == 1
+    assert writer.stats()["written"] == 1
+
+
+def test_older_write_is_discarded(mocker):
+    cache_repository = mocker.MagicMock()
+    writer = CacheWriter(cache_repository, CacheWriterOptions())
+    writer.submit(1, ServiceEntities.PARTY, {"v": 2}, version=2.0, invalidate=True)
+    writer.submit(1, ServiceEntities.PARTY, {"v": 1}, version=1.0)
+
+    writer.start()
+    writer.close()
+
+    cache_repository.add.assert_called_once_with(
+        1,
+        ServiceEntities.PARTY,
+        {"v": 2},
+        invalidate=True,
+        compute_time=0.0,
+        version=2.0,
+    )
+    assert writer.stats()["stale"] == 1
+
+
+def test_older_write_is_discarded_after_newer_write_was_sent(mocker):
+    cache_repository = mocker.MagicMock()
+    writer = CacheWriter(cache_repository, CacheWriterOptions())
+    writer.start()
+    writer.submit(1, ServiceEntities.PARTY, {"v": 2}, version=2.0)
+    writer.close()
+
+    writer.submit(1, ServiceEntities.PARTY, {"v": 1}, version=1.0, invalidate=True)
+
+    cache_repository.add.assert_called_once()
+    assert writer.stats()["stale"] == 1
+
+
+def test_read_write_is_dropped_when_queue_is_full(mocker):
+    cache_repository = mocker.MagicMock()
+    writer = CacheWriter(
+        cache_repository, CacheWriterOptions(max_size=1, block_timeout=0)
+    )
+    writer.submit(1, ServiceEntities.PARTY, {"v": 1}, version=1.0)
+    writer.submit(2, ServiceEntities.PARTY, {"v": 1}, version=1.0)
+
+    assert writer.stats()["dropped"] == 1
+    cache_repository.add.assert_not_called()
+
+
+def test_changed_entity_is_written_synchronously_when_queue_is_full(mocker):
+    cache_repository = mocker.MagicMock()
+    writer = CacheWriter(
+        cache_repository, CacheWriterOptions(max_size=1, block_timeout=0)
+    )
+    writer.submit(1, ServiceEntities.PARTY, {"v": 1}, version=1.0)
+    writer.submit(2, ServiceEntities.PARTY, {"v": 1}, version=1.0, invalidate=True)
+
+    cache_repository.add.assert_called_once_with(
+        2,
+        ServiceEntities.PARTY,
+        {"v": 1},
+        invalidate=True,
+        compute_time=0.0,
+        version=1.0,
+    )
+    assert writer.stats()["synchronous"] == 1
+
+
+def test_full_queue_waits_for_room(mocker):
+    cache_repository = mocker.MagicMock()
+    writer = CacheWriter(
+        cache_repository, CacheWriterOptions(max_size=1, block_timeout=5)
+    )
+    writer.submit(1, ServiceEntities.PARTY, {"v": 1}, version=1.0)
+
+    writer.start()
+    writer.submit(2, ServiceEntities.PARTY, {"v": 1}, version=1.0)
+    writer.close()
+
+    assert cache_repository.add.call_count == 2
+    assert writer.stats()["dropped"] == 0
+
+
+def test_redis_error_is_counted(mocker):
+    cache_repository = mocker.MagicMock()
+    cache_repository.add.side_effect = RedisError("down")
+    writer = CacheWriter(cache_repository, CacheWriterOptions())
+    writer.submit(1, ServiceEntities.PARTY, {"v": 1}, version=1.0)
+
+    writer.start()
+    writer.close()
+
+    assert writer.stats()["failed"] == 1
+
+
+class BlockingCacheRepository:
+    """Stores the latest write of every key. The first write blocks until it is released, like a slow Redis write."""
+
+    def __init__(self):
+        self.store = {}
+        self.in_flight = threading.Event()
+        self.release = threading.Event()
+
+    def add(self, id, entity, value, invalidate=False, compute_time=0.0, version=None):
+        if not self.in_flight.is_set():
+            self.in_flight.set()
+            self.release.wait(timeout=5)
+        self.store[(entity, id)] = value
+        return True
+
+
+def test_synchronous_write_lands_after_in_flight_write_of_same_key():
+    cache_repository = BlockingCacheRepository()
+    writer = CacheWriter(
+        cache_repository, CacheWriterOptions(max_size=1, block_timeout=0)
+    )
+    writer.start()
+    # a read is being written when the entity is updated
+    writer.submit(1, ServiceEntities.PARTY, "old", version=1.0)
+    assert cache_repository.in_flight.wait(timeout=5)
+    writer.submit(2, ServiceEntities.PARTY, "other", version=1.0)
+    update = threading.Thread(
+        target=writer.submit,
+        args=(1, ServiceEntities.PARTY, "new"),
+        kwargs={"version": 2.0, "invalidate": True},
+    )
+    update.start()
+    time.sleep(0.05)
+    # the queue is full, so the update is written synchronously, once the read was written
+    assert (ServiceEntities.PARTY, 1) not in cache_repository.store
+
+    cache_repository.release.set()
+    update.join(timeout=5)
+    writer.close()
+
+    assert cache_repository.store[(ServiceEntities.PARTY, 1)] == "new"
+    assert writer.stats()["synchronous"] == 1
+
+
+def test_write_rejected_as_stale_by_redis_is_counted(mocker):
+    cache_repository = mocker.MagicMock()
+    cache_repository.add.return_value = False
+    writer = CacheWriter(cache_repository, CacheWriterOptions())
+    writer.submit(1, ServiceEntities.PARTY, {"v": 1}, version=1.0)
+
+    writer.start()
+    writer.close()
+
+    assert (writer.stats()["stale"], writer.stats()["written"]) == (1, 0)
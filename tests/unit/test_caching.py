@@ -0,0 +1,153 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+
+from src.config.cache_policy import CachePolicy
+from src.middleware.caching import cache_read
+from src.repository.cache_codecs import CacheCodec, CacheMetadata
+from src.repository.cache_repository import CacheRepository
+from src.util import helpers
+from src.util.enums import ServiceEntities
+
+
+@pytest.fixture
+def cache_repository(fake_redis):
+    policies = {ServiceEntities.PARTY: CachePolicy(single_flight=True, lock_wait=2)}
+    return CacheRepository(fake_redis, policies=policies)
+
+
+@pytest.fixture
+def app(cache_repository):
+    app = Flask(__name__)
+    app.container = SimpleNamespace(cache_repository=cache_repository)
+    return app
+
+
+class FakeView:
+    """Stands in for PartyDetailView. Each load sleeps to widen the window for concurrent misses."""
+
+    def __init__(self, cache_repository):
+        self._cache_repository = cache_repository
+        self.loads = 0
+        self._lock = threading.Lock()
+
+    @cache_read(ServiceEntities.PARTY)
+    def get(self, id):
+        with self._lock:
+            self.loads += 1
+        time.sleep(0.1)
+        party = {"id": id, "firstName": "John"}
+        self._cache_repository.add(id, ServiceEntities.PARTY, party)
+        return party, 200
+
+
+def test_concurrent_misses_load_once(app, cache_repository):
+    view = FakeView(cache_repository)
+    results = []
+
+    def request():
+        with app.app_context():
+            results.append(view.get(1))
+
+    threads = [threading.Thread(target=request) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert view.loads == 1
+    assert results == [({"id": 1, "firstName": "John"}, 200)] * 20
+
+
+def test_waits_for_rebuild_by_another_worker(app, cache_repository, fake_redis):
+    view = FakeView(cache_repository)
+    # another worker holds the rebuild lock and fills the cache shortly after
+    fake_redis.set("party-service:v3:party:1:lock", b"1")
+    threading.Timer(
+        0.2,
+        cache_repository.add,
+        args=(1, ServiceEntities.PARTY, {"id": 1, "firstName": "Rebuilt"}),
+    ).start()
+
+    with app.app_context():
+        result = view.get(1)
+
+    assert view.loads == 0
+    assert result == ({"id": 1, "firstName": "Rebuilt"}, 200)
+
+
+def test_loads_when_rebuild_lock_is_not_released_in_time(app, fake_redis):
+    app.container.cache_repository = CacheRepository(
+        fake_redis,
+        policies={
+            ServiceEntities.PARTY: CachePolicy(single_flight=True, lock_wait=0.1)
+        },
+    )
+    view = FakeView(app.container.cache_repository)
+    fake_redis.set("party-service:v3:party:1:lock", b"1")
+
+    with app.app_context():
+        result = view.get(1)
+
+    assert view.loads == 1
+    assert result == ({"id": 1, "firstName": "John"}, 200)
+
+
+def test_raw_mode_returns_cached_bytes_as_response_body(app, cache_repository):
+    body = b'{"id": 1, "firstName": "John"}'
+    cache_repository.add(1, ServiceEntities.PARTY, body)
+
+    class RawView:
+        @cache_read(ServiceEntities.PARTY, raw=True)
+        def get(self, id):
+            raise AssertionError("Cache hit should not load the party")
+
+    with app.app_context():
+        response = RawView().get(1)
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/json"
+    assert response.get_data() == body
+
+
+def test_entry_about_to_expire_is_served_and_refreshed_in_background(app, fake_redis):
+    policies = {ServiceEntities.PARTY: CachePolicy(early_expiration_beta=1)}
+    cache_repository = CacheRepository(fake_redis, policies=policies)
+    app.container.cache_repository = cache_repository
+    cache_repository.add(1, ServiceEntities.PARTY, {"id": 1, "firstName": "Jane"})
+    key = "party-service:v3:party:1"
+    fake_redis.store[key] = CacheCodec.wrap(
+        CacheCodec.unwrap(fake_redis.store[key])[0], CacheMetadata(time.time(), 1)
+    )
+    view = FakeView(cache_repository)
+
+    with app.app_context():
+        result = view.get(1)
+
+    assert result == ({"id": 1, "firstName": "Jane"}, 200)
+    deadline = time.monotonic() + 2
+    while cache_repository.get(1, ServiceEntities.PARTY)["firstName"] != "John":
+        assert time.monotonic() < deadline, "entry was not refreshed"
+        time.sleep(0.05)
+    assert view.loads == 1
+
+
+def test_matching_if_none_match_is_answered_with_304(app, cache_repository):
+    body = b'{"id": 1, "firstName": "John"}'
+    cache_repository.add(1, ServiceEntities.PARTY, body)
+
+    class RawView:
+        @cache_read(ServiceEntities.PARTY, raw=True)
+        def get(self, id):
+            raise AssertionError("Cache hit should not load the party")
+
+    with app.test_request_context():
+        etag = RawView().get(1).get_etag()[0]
+    with app.test_request_context(headers={"If-None-Match": f'"{etag}"'}):
+        response = RawView().get(1)
+
+    assert etag == helpers.etag(body)
+    assert response.status_code == 304
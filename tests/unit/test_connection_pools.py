@@ -0,0 +1,41 @@
+import os
+
+import pytest
+from redis import ConnectionError
+
+from src.repository.connection_pools import InstrumentedBlockingConnectionPool
+
+
+@pytest.fixture
+def pool(mocker) -> InstrumentedBlockingConnectionPool:
+    """A pool of one connection, whose connections don't connect to a server."""
+
+    def connection(**kwargs):
+        return mocker.MagicMock(pid=os.getpid(), **{"can_read.return_value": False})
+
+    return InstrumentedBlockingConnectionPool(
+        connection_class=connection, max_connections=1, timeout=0.05
+    )
+
+
+def test_counts_checkouts_and_connections_in_use(pool):
+    connection = pool.get_connection()
+
+    stats = pool.stats()
+    assert (stats["connections"], stats["inUse"], stats["idle"]) == (1, 1, 0)
+    assert stats["checkouts"] == 1
+
+    pool.release(connection)
+
+    stats = pool.stats()
+    assert (stats["connections"], stats["inUse"], stats["idle"]) == (1, 0, 1)
+
+
+def test_counts_checkouts_that_time_out(pool):
+    pool.get_connection()
+
+    with pytest.raises(ConnectionError):
+        pool.get_connection()
+
+    stats = pool.stats()
+    assert (stats["checkouts"], stats["timeouts"]) == (1, 1)
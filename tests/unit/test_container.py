@@ -0,0 +1,33 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config.container import Container
+from src.repository.cache_writer import CacheWriterOptions
+
+THREADS = 8
+
+
+def test_concurrent_requests_share_one_party_service(mocker):
+    started = mocker.patch("src.repository.cache_writer.CacheWriter.start")
+    # slow to create, so every thread asks for the party service while it is being created
+    mocker.patch(
+        "src.config.container.CacheRepository",
+        side_effect=lambda *args: time.sleep(0.05) or mocker.MagicMock(),
+    )
+    container = Container(
+        mocker.MagicMock(),
+        mocker.MagicMock(),
+        cache_writer_options=CacheWriterOptions(),
+    )
+    barrier = threading.Barrier(THREADS)
+
+    def get_party_service(_):
+        barrier.wait(timeout=5)
+        return container.party_service
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        services = list(pool.map(get_party_service, range(THREADS)))
+
+    assert len(set(map(id, services))) == 1
+    started.assert_called_once()
@@ -0,0 +1,59 @@
+from src.repository.local_cache import LocalCache
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LocalCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entry_is_a_miss(mocker):
+    mock_time = mocker.patch("src.repository.local_cache.time")
+    mock_time.monotonic.return_value = 100.0
+    cache = LocalCache(max_size=10, ttl=5)
+    cache.set("a", 1)
+
+    mock_time.monotonic.return_value = 106.0
+
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_stats_report_hit_rate():
+    cache = LocalCache(max_size=10, ttl=60)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["hitRate"] == 2 / 3
+
+
+def test_invalidation_message_drops_key():
+    cache = LocalCache(max_size=10, ttl=60)
+    cache.set("party-service:party:1", {"id": 1})
+
+    cache.handle_invalidation({"data": b"party-service:party:1"})
+
+    assert cache.get("party-service:party:1") is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_value_read_before_invalidation_is_not_stored():
+    cache = LocalCache(max_size=10, ttl=60)
+    generation = cache.generation
+
+    cache.delete("party-service:party:1")
+    cache.set("party-service:party:1", {"id": 1, "firstName": "stale"}, generation)
+
+    assert cache.get("party-service:party:1") is None
@@ -0,0 +1,58 @@
+import gzip
+from datetime import datetime
+
+import pytest
+from flask import Flask
+
+from src.blueprints.party_blueprint import party_blp
+
+
+@pytest.fixture
+def party_service(mocker):
+    party_service = mocker.MagicMock()
+    party_service.export_parties.side_effect = lambda updated_since: iter(
+        [b'{"id":1}\n', b'{"id":2}\n']
+    )
+    return party_service
+
+
+@pytest.fixture
+def client(mocker, party_service):
+    app = Flask(__name__)
+    app.container = mocker.MagicMock(party_service=party_service)
+    app.register_blueprint(party_blp)
+    return app.test_client()
+
+
+def test_export_streams_ndjson(client, party_service):
+    response = client.get("/api/v1/parties:export?updatedSince=2025-01-01T00:00:00")
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    assert response.is_streamed
+    assert response.data == b'{"id":1}\n{"id":2}\n'
+    party_service.export_parties.assert_called_once_with(datetime(2025, 1, 1))
+
+
+def test_export_is_gzipped_when_accepted(client):
+    response = client.get(
+        "/api/v1/parties:export", headers={"Accept-Encoding": "gzip, br"}
+    )
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.data) == b'{"id":1}\n{"id":2}\n'
+
+
+def test_list_passes_query_filters_to_service(client, party_service):
+    party_service.list_parties.return_value = {"parties": [], "nextCursor": None}
+
+    response = client.get("/api/v1/parties?lastName=Doe&state=va&limit=10")
+
+    assert response.status_code == 200
+    assert response.json == {"parties": [], "nextCursor": None}
+    list_request = party_service.list_parties.call_args.args[0]
+    assert (list_request.last_name, list_request.state, list_request.limit) == (
+        "Doe",
+        "VA",
+        10,
+    )
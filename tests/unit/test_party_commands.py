@@ -0,0 +1,128 @@
+import gzip
+import json
+from datetime import datetime
+
+import pytest
+from flask import Flask
+
+from src.cli.party_commands import (
+    import_parties,
+    party_cli,
+    read_records,
+    validate_records,
+)
+
+
+@pytest.fixture
+def ndjson_file(tmp_path, post_payload):
+    records = [
+        post_payload,
+        {**post_payload, "email": "not-an-email"},
+        {**post_payload, "email": f"{'a' * 50}@example.com"},
+        post_payload,
+    ]
+    path = tmp_path / "parties.ndjson"
+    lines = [json.dumps(record, default=str) for record in records]
+    path.write_text("\n".join([*lines[:2], "{not json", "", *lines[2:]]) + "\n")
+    return path
+
+
+def test_validate_records_rejects_invalid_records(ndjson_file):
+    rows, rejects = validate_records(list(read_records(str(ndjson_file), "ndjson")))
+
+    assert [row[0] for row in rows] == [1, 6]
+    assert rows[0][4] == "john.doe@example.com"
+    assert len(rows[0][12]) == 64  # the address hash
+    assert [(reject["line"], reject["errors"][0]["field"]) for reject in rejects] == [
+        (2, "email"),
+        (3, ""),
+        (5, "email"),
+    ]
+
+
+def test_read_records_nests_csv_columns(tmp_path):
+    path = tmp_path / "parties.csv"
+    path.write_text(
+        "firstName,lastName,email,phoneNumber,streetOne,streetTwo,city,state,postalCode,country,createdBy,createdAt\n"
+        "John,Doe,john@example.com,5551234567,1 Main St,,Springfield,IL,62704,USA,migration,2025-01-01T00:00:00\n"
+        "Jane,Doe,jane@example.com,5551234567,1 Main St,,Springfield,IL,62704,USA,migration,2025-01-01T00:00:00\n"
+    )
+
+    records = list(read_records(str(path), "csv", after_line=2))
+    rows, rejects = validate_records(records)
+
+    assert [line for line, _ in records] == [3]
+    assert rejects == []
+    assert rows[0][1:3] == ("Jane", None)
+    assert rows[0][7] is None  # street two
+
+
+def test_import_parties_resumes_after_checkpoint(mocker, tmp_path, ndjson_file):
+    import_repository = mocker.MagicMock()
+    import_repository.get_checkpoint.return_value = 1
+    import_repository.merge_staging.side_effect = lambda: 1
+    unit_of_work = mocker.MagicMock()
+    rejects = tmp_path / "rejects.ndjson"
+
+    with open(rejects, "w") as reject_file:
+        report = import_parties(
+            import_repository,
+            unit_of_work,
+            str(ndjson_file),
+            "ndjson",
+            "parties",
+            reject_file,
+            user="import",
+            batch_size=2,
+            workers=1,
+        )
+
+    assert (report.resumed_from, report.rows, report.imported, report.rejected) == (
+        1,
+        4,
+        1,
+        3,
+    )
+    assert report.batches == 2
+    assert [call.args for call in import_repository.save_checkpoint.call_args_list] == [
+        ("parties", 3, "import"),
+        ("parties", 6, "import"),
+    ]
+    import_repository.copy_to_staging.assert_called_once()
+    assert unit_of_work.__enter__.call_count == 2
+    assert [json.loads(line)["line"] for line in rejects.read_text().splitlines()] == [
+        2,
+        3,
+        5,
+    ]
+
+
+def test_import_command_requires_known_format(mocker, tmp_path):
+    path = tmp_path / "parties.txt"
+    path.write_text("")
+    app = Flask(__name__)
+    app.container = mocker.MagicMock()
+    app.cli.add_command(party_cli)
+
+    result = app.test_cli_runner().invoke(args=["party", "import", str(path)])
+
+    assert result.exit_code != 0
+    assert "pass --format" in result.output
+
+
+def test_export_command_writes_gzipped_ndjson(mocker, tmp_path):
+    app = Flask(__name__)
+    app.container = mocker.MagicMock()
+    app.container.party_service.export_parties.return_value = iter([b'{"id":1}\n'])
+    app.cli.add_command(party_cli)
+    output = tmp_path / "parties.ndjson.gz"
+
+    result = app.test_cli_runner().invoke(
+        args=["party", "export", "--updated-since", "2025-01-01", "-o", str(output)]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert gzip.decompress(output.read_bytes()) == b'{"id":1}\n'
+    app.container.party_service.export_parties.assert_called_once_with(
+        datetime(2025, 1, 1), 1000
+    )
@@ -0,0 +1,33 @@
+from sqlalchemy.dialects import postgresql
+
+from src.repository.party_import_repository import PartyImportRepository
+
+
+def test_merge_staging_deduplicates_addresses_and_creates_history(mocker):
+    session = mocker.MagicMock()
+    session.execute.return_value.rowcount = 3
+
+    inserted = PartyImportRepository(session).merge_staging()
+
+    assert inserted == 3
+    address_sql, party_sql = (
+        str(call.args[0].compile(dialect=postgresql.dialect()))
+        for call in session.execute.call_args_list
+    )
+    assert "SELECT DISTINCT ON (party_import.hash)" in address_sql
+    assert "ON CONFLICT (hash) DO NOTHING" in address_sql
+    assert party_sql.startswith("WITH inserted AS \n(INSERT INTO party_service.party")
+    assert "INSERT INTO party_service.party_history" in party_sql
+
+
+def test_copy_to_staging_streams_rows_as_csv(mocker):
+    session = mocker.MagicMock()
+    cursor = session.connection.return_value.connection.cursor.return_value
+    mocker.patch("src.repository.party_import_repository._staging.create")
+
+    PartyImportRepository(session).copy_to_staging([(1, "John", None, 'O"Brien')])
+
+    sql, buffer = cursor.copy_expert.call_args.args
+    assert sql.startswith("COPY party_import (line, first_name,")
+    assert buffer.read() == '1,John,,"O""Brien"\r\n'
+    cursor.close.assert_called_once()
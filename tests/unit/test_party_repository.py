@@ -0,0 +1,23 @@
+from sqlalchemy.dialects import postgresql
+
+from src.repository.party_repository import PartyRepository
+
+
+def test_search_sets_statement_timeout_and_matches_every_word(mocker):
+    session = mocker.MagicMock()
+    connection = session.connection.return_value
+    connection.scalars.return_value = [2, 1]
+
+    party_ids = PartyRepository(session).search("jo_hn doe", 20, 500)
+
+    assert party_ids == [2, 1]
+    # both on the connection of the session, so they are run on the same database
+    session.connection.assert_called_once_with()
+    timeout = connection.execute.call_args.args[0].compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    assert "set_config('statement_timeout', '500ms', true)" in str(timeout)
+    search = connection.scalars.call_args.args[0].compile(dialect=postgresql.dialect())
+    assert str(search).count("party_service.party.first_name ILIKE") == 2
+    assert "ORDER BY rank DESC, party_service.party.id" in str(search)
+    assert {"%jo\\_hn%", "%doe%"} <= set(search.params.values())
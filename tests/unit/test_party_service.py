@@ -1,5 +1,18 @@
+import json
+from datetime import datetime, timezone
+
 import pytest
 from redis.exceptions import RedisError
+from sqlalchemy.exc import NoResultFound, OperationalError
+
+from src.dto.request_dtos import PartyBatchCreate, PartyList, PartySearch
+from src.exception.custom_exceptions import (
+    EntityNotFound,
+    PreconditionFailed,
+    SearchTimeout,
+)
+from src.service.party_service import PartyService
+from src.util import helpers
 from src.util.enums import ServiceEntities
 
 
@@ -14,7 +27,7 @@ def test_add_party_with_new_address(
     party_history_fixture,
     mock_mappers,
 ):
-    mock_uow.address_repository.get_by_hash.return_value = None
+    mock_uow.address_repository.get_or_create.return_value = address_fixture
     mock_mappers.to_address.return_value = address_fixture
     mock_mappers.to_party.return_value = party_fixture
     mock_mappers.to_party_history.return_value = party_history_fixture
@@ -25,15 +38,20 @@ def test_add_party_with_new_address(
     assert result == party_response.to_dict()
     assert party_fixture.address_id == address_fixture.id
     assert party_history_fixture.party_id == party_fixture.id
-    assert mock_uow.flush.call_count == 3
+    assert mock_uow.flush.call_count == 1
+    assert address_fixture.created_by == party_create_dto.meta.created_by
 
     mock_uow.__enter__.assert_called_once()
     mock_uow.__exit__.assert_called_once()
-    mock_uow.address_repository.add.assert_called_once_with(address_fixture)
+    mock_uow.address_repository.get_or_create.assert_called_once_with(address_fixture)
     mock_uow.party_repository.add.assert_called_once_with(party_fixture)
     mock_uow.party_history_repository.add.assert_called_once_with(party_history_fixture)
     mock_cache_repository.add.assert_called_once_with(
-        party_fixture.id, ServiceEntities.PARTY, party_response.to_dict()
+        party_fixture.id,
+        ServiceEntities.PARTY,
+        party_response.to_dict(),
+        invalidate=True,
+        compute_time=0.0,
     )
 
 
@@ -48,18 +66,17 @@ def test_add_party_with_existing_address(
     party_history_fixture,
     mock_mappers,
 ):
-    mock_uow.address_repository.get_by_hash.return_value = address_fixture
+    mock_uow.address_repository.get_or_create.return_value = address_fixture
     mock_mappers.to_party.return_value = party_fixture
     mock_mappers.to_party_history.return_value = party_history_fixture
     mock_mappers.to_party_response.return_value = party_response
 
     result = party_service.add_party(party_create_dto)
     assert result == party_response.to_dict()
-    assert party_fixture.address_id == address_fixture.id
-    assert mock_uow.flush.call_count == 2
+    assert party_fixture.address is address_fixture
+    assert mock_uow.flush.call_count == 1
 
     mock_uow.address_repository.add.assert_not_called()
-    mock_mappers.to_address.assert_not_called()
     mock_uow.party_repository.add.assert_called_once_with(party_fixture)
 
 
@@ -76,7 +93,7 @@ def test_add_party_cache_failure(
     mock_mappers,
 ):
     mock_logger = mocker.patch("src.service.party_service.logger")
-    mock_uow.address_repository.get_by_hash.return_value = address_fixture
+    mock_uow.address_repository.get_or_create.return_value = address_fixture
     mock_mappers.to_party.return_value = party_fixture
     mock_mappers.to_party_history.return_value = party_history_fixture
     mock_mappers.to_party_response.return_value = party_response
@@ -103,7 +120,7 @@ def test_add_party_transaction_rollback_on_error(
     mock_mappers,
 ):
     mock_uow.__exit__ = mocker.MagicMock(return_value=False)
-    mock_uow.address_repository.get_by_hash.return_value = address_fixture
+    mock_uow.address_repository.get_or_create.return_value = address_fixture
     mock_mappers.to_party.return_value = party_fixture
     mock_uow.party_repository.add.side_effect = Exception("Database error")
 
@@ -112,3 +129,404 @@ def test_add_party_transaction_rollback_on_error(
 
     mock_uow.__enter__.assert_called_once()
     mock_uow.__exit__.assert_called_once()
+
+
+def test_get_parties_loads_only_cache_misses(
+    party_service,
+    mock_uow,
+    mock_cache_repository,
+    party_fixture,
+    party_response,
+    mock_mappers,
+):
+    cached = {"id": 2, "firstName": "Cached"}
+    mock_cache_repository.get_many.return_value = {2: cached}
+    mock_uow.party_repository.get_by_ids.return_value = [party_fixture]
+    mock_mappers.to_party_response.return_value = party_response
+
+    result = party_service.get_parties([1, 2, 3, 2])
+
+    mock_uow.party_repository.get_by_ids.assert_called_once_with([1, 3])
+    mock_cache_repository.add_many.assert_called_once_with(
+        ServiceEntities.PARTY, {1: party_response.to_dict()}, [3], invalidate=False
+    )
+    assert result["parties"] == [party_response.to_dict(), cached]
+    assert result["errors"] == [
+        {"id": 3, "status": 404, "detail": "Party with ID 3 was not found."}
+    ]
+
+
+def test_get_parties_falls_back_to_database_when_cache_unavailable(
+    party_service,
+    mock_uow,
+    mock_cache_repository,
+    party_fixture,
+    party_response,
+    mock_mappers,
+):
+    mock_cache_repository.get_many.side_effect = RedisError("Cache connection failed")
+    mock_uow.party_repository.get_by_ids.return_value = [party_fixture]
+    mock_mappers.to_party_response.return_value = party_response
+
+    result = party_service.get_parties([1])
+
+    mock_uow.party_repository.get_by_ids.assert_called_once_with([1])
+    assert result["parties"] == [party_response.to_dict()]
+    assert result["errors"] == []
+
+
+def test_get_party_json_caches_and_returns_the_same_bytes(
+    party_service,
+    mock_uow,
+    mock_cache_repository,
+    party_fixture,
+    party_response,
+    mock_mappers,
+):
+    mock_uow.party_repository.get_by_id.return_value = party_fixture
+    mock_mappers.to_party_response.return_value = party_response
+
+    body = party_service.get_party_json(1)
+
+    assert json.loads(body) == party_response.to_dict()
+    mock_cache_repository.add.assert_called_once_with(
+        party_fixture.id,
+        ServiceEntities.PARTY,
+        body,
+        invalidate=False,
+        compute_time=pytest.approx(0.0, abs=1),
+    )
+
+
+def test_get_parties_skips_database_for_cached_not_found(
+    party_service, mock_uow, mock_cache_repository
+):
+    mock_cache_repository.get_many.return_value = {1: None}
+
+    result = party_service.get_parties([1])
+
+    mock_uow.party_repository.get_by_ids.assert_not_called()
+    assert result["parties"] == []
+    assert result["errors"] == [
+        {"id": 1, "status": 404, "detail": "Party with ID 1 was not found."}
+    ]
+
+
+def test_get_party_not_found_writes_tombstone(
+    party_service, mock_uow, mock_cache_repository
+):
+    mock_uow.party_repository.get_by_id.side_effect = NoResultFound()
+
+    with pytest.raises(EntityNotFound):
+        party_service.get_party_json(1)
+
+    mock_cache_repository.add_tombstone.assert_called_once_with(
+        1, ServiceEntities.PARTY
+    )
+    mock_cache_repository.add.assert_not_called()
+
+
+def test_get_party_json_hands_cache_write_to_writer(
+    mocker,
+    mock_uow,
+    mock_cache_repository,
+    party_fixture,
+    party_response,
+    mock_mappers,
+):
+    cache_writer = mocker.MagicMock()
+    party_service = PartyService(mock_uow, mock_cache_repository, cache_writer)
+    party_fixture.updated_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    mock_uow.party_repository.get_by_id.return_value = party_fixture
+    mock_mappers.to_party_response.return_value = party_response
+
+    body = party_service.get_party_json(1)
+
+    cache_writer.submit.assert_called_once_with(
+        party_fixture.id,
+        ServiceEntities.PARTY,
+        body,
+        party_fixture.updated_at.timestamp(),
+        invalidate=False,
+        compute_time=pytest.approx(0.0, abs=1),
+    )
+    mock_cache_repository.add.assert_not_called()
+
+
+def test_update_party_rejects_stale_if_match(
+    party_service,
+    mock_uow,
+    mock_cache_repository,
+    party_fixture,
+    party_update_dto,
+    party_response,
+    mock_mappers,
+):
+    mock_uow.party_repository.get_by_id_for_update.return_value = party_fixture
+    mock_mappers.to_party_response.return_value = party_response
+    mock_uow.__exit__.return_value = False
+
+    with pytest.raises(PreconditionFailed):
+        party_service.update_party(1, party_update_dto, if_match={"stale"})
+
+    mock_uow.flush.assert_not_called()
+    mock_cache_repository.add.assert_not_called()
+
+
+def test_update_party_with_current_if_match(
+    party_service,
+    mock_uow,
+    party_fixture,
+    party_update_dto,
+    party_response,
+    mock_mappers,
+):
+    mock_uow.party_repository.get_by_id_for_update.return_value = party_fixture
+    mock_mappers.to_party_response.return_value = party_response
+    current = helpers.etag(helpers.to_json_bytes(party_response.to_dict()))
+
+    result = party_service.update_party(1, party_update_dto, if_match={current})
+
+    assert result == party_response.to_dict()
+    mock_uow.party_repository.get_by_id.assert_not_called()
+    mock_uow.flush.assert_called()
+
+
+@pytest.fixture
+def address_lookup_cache(mocker):
+    return mocker.MagicMock()
+
+
+@pytest.fixture
+def party_service_with_lookup(mock_uow, mock_cache_repository, address_lookup_cache):
+    return PartyService(
+        mock_uow, mock_cache_repository, address_lookup_cache=address_lookup_cache
+    )
+
+
+def test_add_party_with_cached_address_hash_skips_hash_query(
+    party_service_with_lookup,
+    mock_uow,
+    address_lookup_cache,
+    party_create_dto,
+    party_response,
+    address_fixture,
+    party_fixture,
+    mock_mappers,
+):
+    address_lookup_cache.get.return_value = address_fixture.id
+    mock_uow.address_repository.get_by_id.return_value = address_fixture
+    mock_mappers.to_party.return_value = party_fixture
+    mock_mappers.to_party_response.return_value = party_response
+
+    party_service_with_lookup.add_party(party_create_dto)
+
+    mock_uow.address_repository.get_by_id.assert_called_once_with(address_fixture.id)
+    mock_uow.address_repository.get_or_create.assert_not_called()
+    assert party_fixture.address is address_fixture
+
+
+def test_stale_address_hash_falls_back_to_upsert(
+    party_service_with_lookup,
+    mock_uow,
+    address_lookup_cache,
+    party_create_dto,
+    party_response,
+    address_fixture,
+    party_fixture,
+    mock_mappers,
+):
+    address_hash = party_create_dto.address.get_hash()
+    address_lookup_cache.get.return_value = 99
+    mock_uow.address_repository.get_by_id.side_effect = NoResultFound()
+    mock_uow.address_repository.get_or_create.return_value = address_fixture
+    mock_mappers.to_party.return_value = party_fixture
+    mock_mappers.to_party_response.return_value = party_response
+
+    party_service_with_lookup.add_party(party_create_dto)
+
+    address_lookup_cache.delete.assert_called_once_with(address_hash)
+    address_lookup_cache.add.assert_called_once_with(address_hash, address_fixture.id)
+    assert party_fixture.address is address_fixture
+
+
+def test_new_address_is_added_to_lookup_cache(
+    party_service_with_lookup,
+    mock_uow,
+    address_lookup_cache,
+    party_create_dto,
+    party_response,
+    address_fixture,
+    party_fixture,
+    mock_mappers,
+):
+    address_lookup_cache.get.side_effect = RedisError("down")
+    mock_uow.address_repository.get_or_create.return_value = address_fixture
+    mock_mappers.to_party.return_value = party_fixture
+    mock_mappers.to_party_response.return_value = party_response
+
+    party_service_with_lookup.add_party(party_create_dto)
+
+    address_lookup_cache.add.assert_called_once_with(
+        party_create_dto.address.get_hash(), address_fixture.id
+    )
+
+
+def test_add_parties_atomic_creates_nothing_when_any_party_is_invalid(
+    party_service, mock_uow, mock_cache_repository, post_payload
+):
+    invalid = {**post_payload, "email": "not-an-email"}
+
+    result = party_service.add_parties(
+        PartyBatchCreate(parties=[post_payload, invalid])
+    )
+
+    assert [item["status"] for item in result["results"]] == [424, 422]
+    assert result["results"][1]["validationErrors"][0]["field"] == "email"
+    mock_uow.__enter__.assert_not_called()
+    mock_cache_repository.add_many.assert_not_called()
+
+
+def test_add_parties_partial_success_shares_addresses_within_batch(
+    party_service, mock_uow, mock_cache_repository, post_payload
+):
+    created_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    parties = []
+
+    def get_or_create_many(addresses):
+        for id, address in enumerate(addresses, start=1):
+            address.id, address.created_at, address.updated_at = (
+                id,
+                created_at,
+                created_at,
+            )
+        return {address.hash: address for address in addresses}
+
+    def flush():
+        for id, party in enumerate(parties, start=1):
+            party.id, party.created_at, party.updated_at = id, created_at, created_at
+
+    mock_uow.address_repository.get_or_create_many.side_effect = get_or_create_many
+    mock_uow.party_repository.add_all.side_effect = parties.extend
+    mock_uow.flush.side_effect = flush
+
+    result = party_service.add_parties(
+        PartyBatchCreate(
+            parties=[post_payload, {"firstName": "Jane"}, post_payload],
+            atomic=False,
+        )
+    )
+
+    assert [item["status"] for item in result["results"]] == [201, 422, 201]
+    assert [item["party"]["id"] for item in result["results"][::2]] == [1, 2]
+    assert len(mock_uow.address_repository.get_or_create_many.call_args.args[0]) == 1
+    assert parties[0].address is parties[1].address
+    mock_uow.flush.assert_called_once()
+    mock_cache_repository.add_many.assert_called_once_with(
+        ServiceEntities.PARTY,
+        {1: result["results"][0]["party"], 2: result["results"][2]["party"]},
+        [],
+        invalidate=True,
+    )
+
+
+def test_export_parties_streams_ndjson_lines(
+    party_service, mock_uow, party_fixture, party_response, mock_mappers
+):
+    updated_since = datetime(2025, 1, 1)
+    mock_uow.party_repository.stream.return_value = iter([party_fixture, party_fixture])
+    mock_mappers.to_party_response.return_value = party_response
+
+    lines = list(party_service.export_parties(updated_since))
+
+    assert lines == [helpers.to_json_bytes(party_response.to_dict()) + b"\n"] * 2
+    mock_uow.party_repository.stream.assert_called_once_with(
+        updated_since=updated_since, batch_size=1000
+    )
+
+
+def test_list_parties_reads_page_through_cache_and_returns_next_cursor(
+    party_service, mock_uow, mock_cache_repository
+):
+    updated_at = datetime(2025, 1, 2, 10, 0)
+    mock_uow.party_repository.get_page.return_value = [
+        (1, updated_at),
+        (2, updated_at),
+        (3, updated_at),
+    ]
+    mock_cache_repository.get_many.return_value = {1: {"id": 1}, 2: {"id": 2}}
+    cursor = helpers.encode_cursor({"updatedAt": "2025-01-01T00:00:00", "id": 7})
+    list_request = PartyList(
+        lastName="Doe", updatedSince="2025-01-01T00:00:00", cursor=cursor, limit=2
+    )
+
+    result = party_service.list_parties(list_request)
+
+    mock_uow.party_repository.get_page.assert_called_once_with(
+        last_name="Doe",
+        email=None,
+        postal_code=None,
+        state=None,
+        updated_since=datetime(2025, 1, 1),
+        after=(datetime(2025, 1, 1), 7),
+        limit=3,
+    )
+    mock_cache_repository.get_many.assert_called_once_with(
+        [1, 2], ServiceEntities.PARTY
+    )
+    mock_uow.party_repository.get_by_ids.assert_not_called()
+    assert result["parties"] == [{"id": 1}, {"id": 2}]
+    assert helpers.decode_cursor(result["nextCursor"]) == {
+        "updatedAt": updated_at.isoformat(),
+        "id": 2,
+    }
+
+
+def test_list_parties_last_page_has_no_cursor(
+    party_service, mock_uow, mock_cache_repository
+):
+    mock_uow.party_repository.get_page.return_value = [(1, datetime(2025, 1, 1))]
+    mock_cache_repository.get_many.return_value = {1: {"id": 1}}
+
+    result = party_service.list_parties(PartyList())
+
+    assert result == {"parties": [{"id": 1}], "nextCursor": None}
+
+
+def test_list_parties_ends_transaction_before_resolving_parties(
+    party_service, mock_uow, mock_cache_repository
+):
+    mock_uow.party_repository.get_page.return_value = [(1, datetime(2025, 1, 1))]
+    mock_cache_repository.get_many.side_effect = lambda ids, entity: (
+        mock_uow.__exit__.assert_called_once() or {1: {"id": 1}}
+    )
+
+    result = party_service.list_parties(PartyList())
+
+    mock_uow.__enter__.assert_called_once()
+    assert result["parties"] == [{"id": 1}]
+
+
+def test_search_parties_keeps_relevance_order(
+    party_service, mock_uow, mock_cache_repository
+):
+    mock_uow.party_repository.search.return_value = [3, 1]
+    mock_cache_repository.get_many.return_value = {1: {"id": 1}, 3: {"id": 3}}
+
+    result = party_service.search_parties(PartySearch(q="  john   doe "))
+
+    mock_uow.party_repository.search.assert_called_once_with("john doe", 20, 500)
+    assert result == {"parties": [{"id": 3}, {"id": 1}]}
+
+
+def test_search_parties_cancelled_by_statement_timeout(
+    mocker, party_service, mock_uow, mock_cache_repository
+):
+    mock_uow.__exit__.return_value = False
+    mock_uow.party_repository.search.side_effect = OperationalError(
+        "SELECT", {}, mocker.MagicMock(pgcode="57014")
+    )
+
+    with pytest.raises(SearchTimeout):
+        party_service.search_parties(PartySearch(q="john"))
+    mock_cache_repository.get_many.assert_not_called()
@@ -0,0 +1,37 @@
+import pytest
+
+from src.config.pool_profile import POOL_PROFILES, load_pool_profile
+from src.util.enums import PrePing
+
+
+def test_defaults_to_development_profile(monkeypatch):
+    monkeypatch.delenv("POOL_PROFILE", raising=False)
+
+    assert load_pool_profile() == POOL_PROFILES["development"]
+
+
+def test_environment_variables_override_profile(monkeypatch):
+    monkeypatch.setenv("POOL_PROFILE", "production")
+    monkeypatch.setenv("DATABASE_POOL_SIZE", "20")
+    monkeypatch.setenv("DATABASE_PRE_PING", "checkout")
+    monkeypatch.setenv("CACHE_MAX_CONNECTIONS", "8")
+
+    profile = load_pool_profile()
+
+    assert profile.database.pool_size == 20
+    assert profile.database.pre_ping == PrePing.CHECKOUT
+    assert (
+        profile.database.max_overflow
+        == POOL_PROFILES["production"].database.max_overflow
+    )
+    assert profile.cache.max_connections == 8
+    assert (
+        profile.cache.socket_timeout == POOL_PROFILES["production"].cache.socket_timeout
+    )
+
+
+def test_unknown_profile_fails(monkeypatch):
+    monkeypatch.setenv("POOL_PROFILE", "staging")
+
+    with pytest.raises(Exception, match="POOL_PROFILE"):
+        load_pool_profile()
@@ -1,6 +1,16 @@
+from datetime import datetime
+
 import pytest
+from pydantic import ValidationError
 
-from src.dto.request_dtos import PartyCreate, AddressCreate, PartyUpdate
+from src.dto.request_dtos import (
+    PartyCreate,
+    AddressCreate,
+    PartyList,
+    PartySearch,
+    PartyUpdate,
+)
+from src.util import helpers
 
 
 def test_party_create_dto_created_successfully(post_payload: dict, default_party_data):
@@ -67,3 +77,48 @@ def test_party_update_dto_created_successfully(patch_payload: dict):
 
     assert party["meta"]["updated_by"] == "patch.user"
     assert str(party["meta"]["updated_at"]) == "2025-01-02 10:00:00"
+
+
+def test_party_list_decodes_cursor():
+    cursor = helpers.encode_cursor({"id": 5})
+    assert PartyList(cursor=cursor, state="il").cursor == {"id": 5}
+
+
+def test_party_list_parses_update_time_of_cursor():
+    cursor = helpers.encode_cursor({"updatedAt": "2025-01-01T12:00:00", "id": 5})
+    party_list = PartyList(cursor=cursor, updatedSince="2025-01-01")
+    assert party_list.cursor == {"updatedAt": datetime(2025, 1, 1, 12), "id": 5}
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        {"cursor": "not-a-cursor"},
+        {"cursor": helpers.encode_cursor({"id": "5"})},
+        # a cursor of a page ordered by ID can't continue a page ordered by update time
+        {"cursor": helpers.encode_cursor({"id": 5}), "updatedSince": "2025-01-01"},
+        # the update time of a cursor of a page ordered by update time must be a timestamp
+        {
+            "cursor": helpers.encode_cursor({"id": 1, "updatedAt": 5}),
+            "updatedSince": "2025-01-01",
+        },
+        {
+            "cursor": helpers.encode_cursor({"id": 1, "updatedAt": "yesterday"}),
+            "updatedSince": "2025-01-01",
+        },
+    ],
+)
+def test_party_list_rejects_invalid_cursor(query):
+    with pytest.raises(ValidationError) as err:
+        PartyList.model_validate(query)
+    assert helpers.to_validation_errors(err.value)[0]["field"] == "cursor"
+
+
+@pytest.mark.parametrize("q", ["jo", "   jo   ", "a b c d", "john do"])
+def test_party_search_rejects_words_shorter_than_a_trigram(q):
+    with pytest.raises(ValidationError):
+        PartySearch(q=q)
+
+
+def test_party_search_collapses_whitespace_between_words():
+    assert PartySearch(q="  john   doe ").q == "john doe"
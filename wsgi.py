@@ -0,0 +1,4 @@
+from src.config.config import create_app
+
+# Served by a WSGI server, ex. gunicorn, configured by gunicorn.conf.py
+app = create_app()